@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pipeline import compile_regex, CONSTRUCTIONS
+
+# Klasa za rezultat kompajliranja jednog zapisa
+# index - redni broj zapisa u ulazu (za fajl: broj linije)
+# dka - minimalni DKA u obliku recnika, ili None ako je doslo do greske
+# error - poruka greske, ili None ako je kompajliranje uspjelo
+class BatchResult:
+    def __init__(self, index, regex, alphabet, dka=None, error=None):
+        self.index = index
+        self.regex = regex
+        self.alphabet = alphabet
+        self.dka = dka
+        self.error = error
+
+    def ok(self):
+        return self.error is None
+
+    def to_json(self):
+        record = {'line': self.index, 'regex': self.regex}
+        if self.ok():
+            record['states'] = len(self.dka) - 1
+            record['dka'] = self.dka
+        else:
+            record['error'] = self.error
+        return record
+
+
+# Kompajlira jedan paket zapisa u radnom procesu. Greske se hvataju po zapisu i
+# vracaju kao tekst, pa jedan los regex ne prekida ostatak paketa.
+# O(k * c), gdje je k broj zapisa u paketu, a c cijena jednog kompajliranja
+def compile_chunk(chunk, construction='thompson'):
+    results = []
+    for index, regex, alphabet in chunk:
+        try:
+            if alphabet is None:
+                raise Exception('Zapis nema alfabet (regex i alfabet se odvajaju tabom)')
+            results.append(BatchResult(index, regex, alphabet, dka=compile_regex(regex, alphabet, construction)))
+        except Exception as e:
+            results.append(BatchResult(index, regex, alphabet, error=str(e)))
+    return results
+
+# Dijeli zapise na pakete od po chunk_size zapisa
+# O(n)
+def chunked(records, chunk_size):
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        yield chunk
+
+# Kompajlira niz zapisa (index, regex, alphabet) i vraca BatchResult redom kojim su
+# zapisi dati. Paketi se salju u ProcessPoolExecutor, ali najvise 2 * workers paketa
+# je poslato unaprijed: sledeci paket se cita iz ulaza tek kada je najstariji gotov i
+# njegovi rezultati vraceni, pa se ulaz cita postepeno i memorija ne raste sa velicinom fajla.
+# Sa workers=1 sve se radi u tekucem procesu.
+# O(n * c / p), gdje je n broj zapisa, c cijena jednog kompajliranja, a p broj procesa
+def compile_batch(records, workers=None, chunk_size=64, construction='thompson'):
+    if construction not in CONSTRUCTIONS:
+        raise Exception(f'Nepoznata konstrukcija: {construction}')
+    if chunk_size < 1:
+        raise Exception('Velicina paketa mora biti bar 1')
+    chunks = chunked(records, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from compile_chunk(chunk, construction)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(compile_chunk, chunk, construction))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+# Cita zapise iz linija teksta: regex, tab, pa simboli alfabeta odvojeni razmakom
+# (kao u user_input.py). Prazne linije i linije koje pocinju sa # se preskacu.
+# Zapis bez alfabeta se vraca sa alfabetom None, pa greska stize kao rezultat.
+# O(n), gdje je n ukupna duzina teksta
+def read_records(lines):
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\n')
+        if not line.strip() or line.startswith('#'):
+            continue
+        regex, tab, alphabet = line.partition('\t')
+        yield number, regex, set(alphabet.split()) if tab else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Paketno kompajliranje regularnih izraza u minimalne DKA')
+    parser.add_argument('input', help='fajl sa zapisima "regex<TAB>simboli alfabeta", ili - za standardni ulaz')
+    parser.add_argument('-o', '--output', help='izlazni fajl (JSON linije), podrazumevano standardni izlaz')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='broj procesa (podrazumevano broj jezgara)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='broj zapisa po paketu')
+    parser.add_argument('--construction', choices=CONSTRUCTIONS, default='thompson')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    target = sys.stdout if args.output is None else open(args.output, 'w', encoding='utf-8')
+    failures = 0
+    try:
+        for result in compile_batch(read_records(source), args.workers, args.chunk_size, args.construction):
+            failures += not result.ok()
+            target.write(json.dumps(result.to_json(), ensure_ascii=False) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
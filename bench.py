@@ -0,0 +1,163 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from compiled_dka import *
+
+# Familije obrazaca za mjerenje: svaka prima parametar velicine n i vraca (regex, alfabet)
+
+# (a+b)*a(a+b){n}: minimalni DKA ima 2^(n+1) stanja
+def sigma_star_suffix(n):
+    return f'(a+b)*a(a+b){{{n}}}', {'a', 'b'}
+
+# n ugnijezdenih zvijezda: (((a*b)*b)*b)*...
+def nested_stars(n):
+    regex = 'a'
+    for _ in range(n):
+        regex = f'({regex}*b)'
+    return regex + '*', {'a', 'b'}
+
+# Unija n razlicitih literala duzine 8 nad {a, b, c, d}
+def literal_union(n):
+    rng = random.Random(n)
+    words = set()
+    while len(words) < n:
+        words.add(''.join(rng.choice('abcd') for _ in range(8)))
+    return '+'.join(sorted(words)), {'a', 'b', 'c', 'd'}
+
+# Sirok ogranicen ponavljac (ab+b){n,3n}
+def bounded_repeat(n):
+    return f'(ab+b){{{n},{3 * n}}}', {'a', 'b'}
+
+# Alfabet od n visekarakternih simbola koji su medjusobno prefiksi (T1, T10, T100, ...)
+def multichar_alphabet(n):
+    symbols = [f'T{i}' for i in range(n)]
+    regex = '(' + '+'.join(symbols) + f')*{symbols[0]}({symbols[-1]}+{symbols[1 % n]}){{2}}'
+    return regex, set(symbols)
+
+FAMILIES = {
+    'sigma_star_suffix': (sigma_star_suffix, [2, 4, 6, 8, 10]),
+    'nested_stars': (nested_stars, [4, 16, 64, 256]),
+    'literal_union': (literal_union, [16, 64, 256, 1024]),
+    'bounded_repeat': (bounded_repeat, [4, 16, 64]),
+    'multichar_alphabet': (multichar_alphabet, [8, 32, 128, 512]),
+}
+
+# Faze pipeline-a redom; svaka prima rezultat prethodne
+PHASES = ['lex', 'parse', 'nfa', 'dfa', 'minimize', 'compile', 'match']
+
+
+# Ulazi za fazu prepoznavanja: slucajne rijeci nad alfabetom (ponovljivo, fiksan seed)
+# O(k * l), gdje je k broj ulaza, a l duzina ulaza
+def sample_inputs(alphabet, count=200, length=64, seed=0):
+    rng = random.Random(seed)
+    symbols = sorted(set(alphabet) - {'ε'})
+    return [''.join(rng.choice(symbols) for _ in range(length)) for _ in range(count)]
+
+# Prolazi kroz sve faze jednom; vraca vrijeme (wall) i vrsnu memoriju po fazi i brojeve.
+# Vrsna memorija se mjeri samo ako je tracemalloc ukljucen.
+def run_phases(regex, alphabet, inputs):
+    times = {}
+    memory = {}
+    counts = {}
+    value = None
+
+    def phase(name, function):
+        nonlocal value
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = function(value)
+        times[name] = time.perf_counter() - start
+        if tracemalloc.is_tracing():
+            memory[name] = tracemalloc.get_traced_memory()[1] - base
+        return value
+
+    tokens = phase('lex', lambda _: Lexer(regex, alphabet).lexer())
+    counts['tokens'] = len(tokens)
+    phase('parse', lambda tokens: Parser(tokens).parse())
+    nka = phase('nfa', lambda AST: ASTtoNFA(AST).construct())
+    counts['nfa_states'] = nka.num_states
+    dka = phase('dfa', lambda nka: NKAtoDKAKonvertor(nka).convert())
+    counts['dfa_states'] = len(dka.states)
+    min_dka = phase('minimize', lambda dka: DKAMinimizer(dka.to_dict()).to_dict())
+    counts['min_dfa_states'] = len(min_dka) - 1
+    compiled = phase('compile', lambda min_dka: CompiledDFA(min_dka, alphabet))
+    accepted = phase('match', lambda compiled: sum(compiled.match(text) for text in inputs))
+    counts['inputs'] = len(inputs)
+    counts['accepted'] = accepted
+    return times, memory, counts
+
+# Mjeri jedan slucaj: vremena su minimum od repeat ponavljanja (bez tracemalloc-a,
+# koji usporava), a vrsna memorija se mjeri u jos jednom, zasebnom prolazu
+def bench_case(family, n, repeat=3):
+    regex, alphabet = FAMILIES[family][0](n)
+    inputs = sample_inputs(alphabet)
+    best = {}
+    for _ in range(repeat):
+        times, _, counts = run_phases(regex, alphabet, inputs)
+        for name, seconds in times.items():
+            best[name] = min(seconds, best.get(name, seconds))
+    tracemalloc.start()
+    try:
+        _, memory, _ = run_phases(regex, alphabet, inputs)
+    finally:
+        tracemalloc.stop()
+    return {
+        'family': family,
+        'n': n,
+        'regex_length': len(regex),
+        'alphabet_size': len(alphabet),
+        'seconds': {name: best[name] for name in PHASES},
+        'peak_bytes': {name: memory[name] for name in PHASES},
+        'total_seconds': sum(best.values()),
+        **counts,
+    }
+
+# Trenutni git commit (ako postoji), da se rezultati mogu porediti izmedju commit-ova
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Pokrece izabrane familije; sizes zamjenjuje podrazumevane velicine svih familija
+def run_benchmarks(families=None, sizes=None, repeat=3):
+    results = []
+    for family in families or FAMILIES:
+        if family not in FAMILIES:
+            raise Exception(f'Nepoznata familija obrazaca: {family}')
+        for n in sizes or FAMILIES[family][1]:
+            results.append(bench_case(family, n, repeat))
+    return {
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mjerenje brzine i memorije svih faza pipeline-a')
+    parser.add_argument('-f', '--family', action='append', choices=list(FAMILIES), help='familija obrazaca (moze vise puta)')
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', help='velicine umjesto podrazumevanih')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='broj ponavljanja za vremena')
+    parser.add_argument('-o', '--output', help='izlazni JSON fajl, podrazumevano standardni izlaz')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.family, args.sizes, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import mmap
+import struct
+import sys
+from array import array
+from compiled_dka import *
+
+# Binarni format minimalnog DKA (svi brojevi su little-endian):
+#   zaglavlje    HEADER (magic, verzija, rezervisano, broj stanja, broj simbola, pocetno stanje,
+#                mrtvo stanje, duzina tabele simbola u bajtovima)
+#   simboli      za svaki simbol: u16 duzina + UTF-8 bajtovi, redom po id-u simbola
+#   prihvatanje  bitmapa, bit i bajta j oznacava stanje 8 * j + i
+#   prelazi      gusta tabela int32, red po stanju, kolona po simbolu; vrijednost je
+#                pomjeraj reda ciljnog stanja (stanje * broj simbola), kao u CompiledDFA
+# Sekcije su poravnate na 4 bajta, pa se tabela prelaza cita kao niz int32 pravo iz
+# mapiranog fajla.
+MAGIC = b'DKAB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIIIII')
+
+def align(offset):
+    return (offset + 3) & ~3
+
+
+# Simboli i tabela prelaza za upis; DKA nad klasama simbola se razvija u kolonu
+# po simbolu, pa fajl ne zavisi od klasa
+# O(n * m), gdje je n broj stanja, a m broj simbola
+def symbol_table(compiled):
+    if compiled.symbol_classes is None:
+        return compiled.symbols, array('i', compiled.table)
+    symbols = sorted(compiled.symbol_ids)
+    stride = max(len(symbols), 1)
+    table = array('i')
+    for state in range(compiled.state_count):
+        row = state * compiled.stride
+        table.extend(compiled.table[row + compiled.symbol_ids[symbol]] // compiled.stride * stride for symbol in symbols)
+        if not symbols:
+            table.append(compiled.dead_state * stride)
+    return symbols, table
+
+# Pretvara minimalni DKA u bajtove binarnog formata
+# dka - CompiledDFA ili recnik koji vraca DKAMinimizer.to_dict()
+# O(n * m), gdje je n broj stanja, a m broj simbola
+def to_bytes(dka, alphabet=None):
+    compiled = dka if isinstance(dka, CompiledDFA) else CompiledDFA(dka, alphabet)
+    symbol_names, table = symbol_table(compiled)
+    symbols = bytearray()
+    for symbol in symbol_names:
+        encoded = symbol.encode('utf-8')
+        symbols += struct.pack('<H', len(encoded)) + encoded
+    bitmap = bytearray((compiled.state_count + 7) // 8)
+    for state in range(compiled.state_count):
+        if compiled.is_accepting(state):
+            bitmap[state >> 3] |= 1 << (state & 7)
+    if sys.byteorder != 'little':
+        table.byteswap()
+
+    data = bytearray(HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        compiled.state_count, len(symbol_names),
+        compiled.start_row // compiled.stride, compiled.dead_state, len(symbols),
+    ))
+    for section in (symbols, bitmap, table.tobytes()):
+        data += section
+        data += bytes(align(len(data)) - len(data))
+    return bytes(data)
+
+# Upisuje DKA u fajl binarnog formata
+# O(n * m)
+def write_dfa(dka, path, alphabet=None):
+    with open(path, 'wb') as file:
+        file.write(to_bytes(dka, alphabet))
+
+
+# Klasa za DKA ucitan iz binarnog formata
+# Fajl se otvara pomocu mmap, a tabela prelaza i bitmapa prihvatanja su memoryview-i
+# nad mapiranim bajtovima, pa se nista ne kopira: ucitavanje cita samo zaglavlje i
+# tabelu simbola, a procesi koji otvore isti fajl dijele iste stranice memorije.
+# Prepoznavanje je isto kao u CompiledDFA.
+# source - putanja do fajla, ili objekat koji podrzava buffer protokol (npr. bytes)
+class MappedDFA(CompiledDFA):
+    def __init__(self, source):
+        if sys.byteorder != 'little':
+            raise Exception('Mapirani DKA je podrzan samo na little-endian arhitekturama')
+        self.mmap = None
+        if isinstance(source, str) or hasattr(source, '__fspath__'):
+            with open(source, 'rb') as file:
+                self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffer = memoryview(self.mmap)
+        else:
+            self.buffer = memoryview(source).cast('B')
+        self.load()
+
+    # Cita zaglavlje i tabelu simbola, a za ostale sekcije pravi poglede u buffer
+    # O(m * l + n / 8), gdje je m broj simbola, l duzina simbola, a n broj stanja
+    def load(self):
+        buffer = self.buffer
+        if len(buffer) < HEADER.size:
+            raise Exception('Fajl je prekratak za zaglavlje DKA')
+        magic, version, _, state_count, symbol_count, start_state, dead_state, symbols_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise Exception('Fajl nije u binarnom formatu DKA')
+        if version != FORMAT_VERSION:
+            raise Exception(f'Nepodrzana verzija binarnog formata DKA: {version}')
+
+        symbols = []
+        offset = HEADER.size
+        for _ in range(symbol_count):
+            (length,) = struct.unpack_from('<H', buffer, offset)
+            symbols.append(bytes(buffer[offset + 2:offset + 2 + length]).decode('utf-8'))
+            offset += 2 + length
+        if offset != HEADER.size + symbols_size:
+            raise Exception('Neispravna tabela simbola')
+        self.symbols = symbols
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        self.stride = max(symbol_count, 1)
+        self.state_count = state_count
+        self.dead_state = dead_state
+        self.start_row = start_state * self.stride
+
+        bitmap_start = align(offset)
+        table_start = align(bitmap_start + (state_count + 7) // 8)
+        table_end = table_start + 4 * state_count * self.stride
+        if len(buffer) < table_end:
+            raise Exception('Fajl je prekratak za tabelu prelaza')
+        self.accepting = buffer[bitmap_start:table_start]
+        self.table = buffer[table_start:table_end].cast('i')
+        self.trie = compile_alphabet(frozenset(symbols))
+        self.single_char = all(len(symbol) == 1 for symbol in symbols)
+        self.symbol_classes = None
+        self.padded_table = None
+
+    # O(1)
+    def is_accepting(self, state):
+        return bool(self.accepting[state >> 3] >> (state & 7) & 1)
+
+    # O(n)
+    def accept_vector(self):
+        bits = np.unpackbits(np.frombuffer(self.accepting, dtype=np.uint8), bitorder='little')
+        return bits[:self.state_count].astype(bool)
+
+    # Oslobadja poglede i zatvara mapirani fajl
+    def close(self):
+        self.padded_table = None
+        self.table.release()
+        self.accepting.release()
+        self.buffer.release()
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Test primjer
+def main():
+    alphabet = {'START', 'AB', 'STOP'}
+    regex = 'START(AB)*STOP'
+    rl = Lexer(regex, alphabet)
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct()
+    dka = NKAtoDKAKonvertor(nka).convert().to_dict()
+    data = to_bytes(DKAMinimizer(dka).to_dict(), alphabet)
+    print(f'binarni DKA za {regex}: {len(data)} bajtova')
+    mapped = MappedDFA(data)
+    for word in ['STARTSTOP', 'STARTABABSTOP', 'STARTAB']:
+        print(word, mapped.match(word))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+
+# Procjena memorije po elementu automata u bajtovima (CPython, 64 bita).
+# Nije tacno mjerenje, vec gruba granica dovoljna da se konstrukcija zaustavi
+# prije nego sto potrosi svu memoriju.
+NFA_STATE_BYTES = 4          # jedan pomjeraj u CSR nizu offsets
+NFA_TRANSITION_BYTES = 12    # izvor, oznaka i cilj u nizovima array('i')
+DFA_STATE_BYTES = 200        # stavka u recniku podskupova, lista stanja, recnik prelaza
+DFA_TRANSITION_BYTES = 100   # stavka u recniku prelaza jednog stanja
+TERM_BYTES = 150             # izraz u tabeli izraza (torka, id, nullable) ili izracunat izvod
+
+
+# Izuzetak koji se baca kada konstrukcija prekoraci budzet
+# resource - koja granica je prekoracena ('max_nfa_states', 'max_dfa_states',
+#            'max_bytes' ili 'time_limit')
+# phase - faza u kojoj je prekoracenje otkriveno ('nfa' ili 'dfa')
+# progress - recnik sa stanjem konstrukcije u trenutku prekida
+class BudgetExceeded(Exception):
+    def __init__(self, resource, limit, phase, progress):
+        self.resource = resource
+        self.limit = limit
+        self.phase = phase
+        self.progress = progress
+        reached = ', '.join(f'{name}={value}' for name, value in progress.items())
+        super().__init__(f'Prekoracen budzet {resource}={limit} u fazi {phase} ({reached})')
+
+
+# Klasa za budzet konstrukcije automata
+# Sve granice su opcione (None znaci bez ogranicenja).
+# max_nfa_states, max_dfa_states - najveci broj stanja NKA, odnosno DKA
+# max_bytes - najveca procijenjena memorija automata koji se gradi
+# time_limit - vrijeme u sekundama od pravljenja budzeta; isti budzet se moze dati
+#              i konstrukciji NKA i konstrukciji DKA, pa rok vazi za obje zajedno
+class Budget:
+    def __init__(self, max_nfa_states=None, max_dfa_states=None, max_bytes=None, time_limit=None):
+        self.max_nfa_states = max_nfa_states
+        self.max_dfa_states = max_dfa_states
+        self.max_bytes = max_bytes
+        self.started = time.monotonic()
+        self.deadline = None if time_limit is None else self.started + time_limit
+        self.time_limit = time_limit
+
+    # Provjera tokom konstrukcije NKA
+    # O(1)
+    def check_nfa(self, states, transitions):
+        estimated_bytes = states * NFA_STATE_BYTES + transitions * NFA_TRANSITION_BYTES
+        if self.max_nfa_states is not None and states > self.max_nfa_states:
+            self.exceeded('max_nfa_states', 'nfa', nfa_states=states, nfa_transitions=transitions, bytes=estimated_bytes)
+        self.check_common('nfa', estimated_bytes, nfa_states=states, nfa_transitions=transitions)
+
+    # Provjera tokom podskupovne konstrukcije
+    # unexplored - broj stanja DKA koja su pronadjena, a jos nisu obradjena
+    # O(1)
+    def check_dfa(self, states, unexplored, estimated_bytes):
+        if self.max_dfa_states is not None and states > self.max_dfa_states:
+            self.exceeded('max_dfa_states', 'dfa', dfa_states=states, unexplored=unexplored, bytes=estimated_bytes)
+        self.check_common('dfa', estimated_bytes, dfa_states=states, unexplored=unexplored)
+
+    # O(1)
+    def check_common(self, phase, estimated_bytes, **progress):
+        if self.max_bytes is not None and estimated_bytes > self.max_bytes:
+            self.exceeded('max_bytes', phase, bytes=estimated_bytes, **progress)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.exceeded('time_limit', phase, bytes=estimated_bytes, **progress)
+
+    def exceeded(self, resource, phase, **progress):
+        progress['seconds'] = round(time.monotonic() - self.started, 6)
+        raise BudgetExceeded(resource, getattr(self, resource), phase, progress)
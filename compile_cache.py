@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pipeline import CompilePipeline
+
+# Verzija formata kesa. Povecava se kada se promijeni neki algoritam u pipeline-u,
+# oblik recnika DKA ili oblik kljuca; artefakti sa drugom verzijom se ignorisu.
+CACHE_VERSION = 10
+
+# Kljuc kesa: SHA-256 normalizovanog zapisa (verzija, regex, sortiran alfabet, opcije).
+# ε se izbacuje iz alfabeta jer ga Lexer ionako uvijek dodaje, pa {'a'} i {'a', 'ε'}
+# daju isti kljuc. U kljuc ulazi svaka opcija pipeline-a koja mijenja rezultat;
+# classes oznacava rezultat compile_classes (DKA nad klasama i mapa simbol -> klasa).
+# Budget ne ulazi u kljuc: samo prekida konstrukciju, a ne mijenja njen rezultat.
+# O(r + m log m), gdje je r duzina regexa, a m velicina alfabeta
+def cache_key(regex, alphabet, construction='thompson', simplify=False, reduce_nfa=False, classes=False):
+    options = {'construction': construction, 'simplify': simplify, 'reduce_nfa': reduce_nfa, 'classes': classes}
+    record = [CACHE_VERSION, regex, sorted(set(alphabet) - {'ε'}), options]
+    return hashlib.sha256(json.dumps(record, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+# Klasa za kes kompajliranih (minimalnih) DKA
+# max_entries, max_bytes - granice LRU kesa u memoriji (broj zapisa i ukupna velicina
+# serijalizovanih DKA u bajtovima); najstariji zapisi se izbacuju prvi
+# directory - opcioni direktorijum za kes na disku; None znaci samo memorija
+# DKA se cuvaju serijalizovani u JSON, pa svaki pogodak vraca novu kopiju recnika
+# koju pozivalac moze slobodno mijenjati.
+class CompileCache:
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024, directory=None):
+        if max_entries < 1 or max_bytes < 1:
+            raise Exception('Kes mora imati bar jedan zapis i bar jedan bajt')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    # Vraca DKA za kljuc ili None; pogodak u memoriji pomjera zapis na kraj LRU reda,
+    # a pogodak na disku se prepisuje u memoriju
+    # O(d), gdje je d velicina serijalizovanog DKA
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return json.loads(entry[0])
+        data = self.read_disk(key)
+        if data is not None:
+            self.disk_hits += 1
+            self.remember(key, data)
+            return json.loads(data)
+        self.misses += 1
+        return None
+
+    # O(d)
+    def put(self, key, dka):
+        data = json.dumps(dka, ensure_ascii=False)
+        self.remember(key, data)
+        self.write_disk(key, data)
+
+    # Dodaje zapis u memoriju i izbacuje najstarije dok se ne ispune obje granice.
+    # Zapis veci od max_bytes se ne cuva u memoriji.
+    # O(k), gdje je k broj izbacenih zapisa
+    def remember(self, key, data):
+        size = len(data.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+        self.entries[key] = (data, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    # Cita artefakt sa diska; nepostojeci, osteceni ili artefakt druge verzije se ignorise
+    # O(d)
+    def read_disk(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), encoding='utf-8') as file:
+                artifact = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(artifact, dict) or artifact.get('version') != CACHE_VERSION or artifact.get('key') != key:
+            return None
+        return json.dumps(artifact['dka'], ensure_ascii=False)
+
+    # Atomicno upisivanje: artefakt se pise u privremeni fajl u istom direktorijumu
+    # pa se os.replace-om preimenuje, tako da citaoci nikad ne vide poluupisan fajl
+    # O(d)
+    def write_disk(self, key, data):
+        if self.directory is None:
+            return
+        artifact = f'{{"version": {CACHE_VERSION}, "key": "{key}", "dka": {data}}}'
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix='.' + key, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                file.write(artifact)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    # Kompajlira regex kroz kes: pri promasaju pokrece cijeli pipeline i pamti rezultat.
+    # Opcije su iste kao kod compile_regex i sve se prosljedjuju pipeline-u.
+    # Greske se ne pamte, pa nevalidan regex baca izuzetak svaki put.
+    # O(d) pri pogotku, cijena compile_regex pri promasaju
+    def compile(self, regex, alphabet, construction='thompson', budget=None, simplify=False, reduce_nfa=False):
+        pipeline = CompilePipeline(construction, budget=budget, simplify=simplify, reduce_nfa=reduce_nfa)
+        key = cache_key(regex, alphabet, construction, simplify, reduce_nfa)
+        dka = self.get(key)
+        if dka is None:
+            dka = pipeline.compile(regex, alphabet)
+            self.put(key, dka)
+        return dka
+
+    # Kao compile, ali za CompilePipeline.compile_classes;
+    # vraca (minimalni DKA nad predstavnicima klasa, recnik simbol -> predstavnik)
+    # O(d) pri pogotku, cijena compile_classes pri promasaju
+    def compile_classes(self, regex, alphabet, construction='thompson', budget=None, simplify=False, reduce_nfa=False):
+        pipeline = CompilePipeline(construction, budget=budget, simplify=simplify, reduce_nfa=reduce_nfa)
+        key = cache_key(regex, alphabet, construction, simplify, reduce_nfa, classes=True)
+        result = self.get(key)
+        if result is None:
+            result = pipeline.compile_classes(regex, alphabet)
+            self.put(key, result)
+        minDKA, class_of = result
+        return minDKA, class_of
+
+
+# Podrazumevani kes u memoriji koji dijele main.py i user_input.py
+default_cache = CompileCache()
+
+# compile_regex kroz podrazumevani kes
+def cached_compile_regex(regex, alphabet, construction='thompson', budget=None, simplify=False, reduce_nfa=False):
+    return default_cache.compile(regex, alphabet, construction, budget, simplify, reduce_nfa)
+
+
+# Test primjer
+def main():
+    cache = CompileCache(max_entries=2)
+    for regex in ['(a+b)*abb', 'a*b', '(a+b)*abb', 'ab*', 'a*b']:
+        cache.compile(regex, {'a', 'b'})
+    print(f'pogoci: {cache.hits}, promasaji: {cache.misses}, zapisa: {len(cache)}, bajtova: {cache.size}')
+
+
+if __name__ == "__main__":
+    main()
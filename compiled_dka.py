@@ -0,0 +1,199 @@
+from min_dka import *
+from lexer import compile_alphabet
+from array import array
+
+# NumPy je opciona zavisnost, koristi se samo za paketno prepoznavanje
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Vrijednost kojom se dopunjavaju kraci ulazi u paketu; ne mijenja stanje
+PAD = -1
+
+# Klasa za kompajlirani DKA
+# Gradi se iz recnika koji vraca DKAMinimizer.to_dict() (ili DKA.to_dict()).
+# Stanja su cijeli brojevi, simboli su internovani u male cijele brojeve, a prelazi
+# su u ravnom nizu array('i'). Mrtvo stanje je eksplicitno (poslednji red tabele),
+# pa nedefinisan prelaz odbija ulaz umjesto da baci KeyError.
+# Vrijednosti u tabeli su pomjeraji redova (stanje * broj simbola), pa prelaz
+# zahtijeva samo jedno sabiranje i jedno indeksiranje.
+# alphabet - cijeli alfabet; simboli kojih nema u DKA vode u mrtvo stanje
+# symbol_classes - opcioni recnik simbol -> predstavnik klase (vidi symbol_classes.py)
+# kada je DKA napravljen nad klasama simbola; kolone tabele su tada klase, a simbol se
+# preslikava u kolonu svoje klase tek pri prepoznavanju (alphabet se tada ne koristi)
+class CompiledDFA:
+    def __init__(self, dka_dict, alphabet=None, symbol_classes=None):
+        names = [state for state in dka_dict if state != 'startingState']
+        state_ids = {name: i for i, name in enumerate(names)}
+        if symbol_classes is not None:
+            symbols = set(symbol_classes.values())
+        else:
+            symbols = set(alphabet) - {'ε'} if alphabet is not None else set()
+        for name in names:
+            symbols.update(symbol for symbol in dka_dict[name] if symbol != 'isTerminatingState')
+        self.symbols = sorted(symbols)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.stride = max(len(self.symbols), 1)
+        self.state_count = len(names) + 1
+        self.dead_state = len(names)
+
+        dead_row = self.dead_state * self.stride
+        self.table = array('i', [dead_row]) * (self.state_count * self.stride)
+        self.accepting = bytearray(self.state_count)
+        for name in names:
+            row = state_ids[name] * self.stride
+            self.accepting[state_ids[name]] = dka_dict[name]['isTerminatingState']
+            for symbol, next_state in dka_dict[name].items():
+                if symbol != 'isTerminatingState':
+                    self.table[row + self.symbol_ids[symbol]] = state_ids[next_state] * self.stride
+        self.start_row = state_ids[dka_dict['startingState']] * self.stride
+        self.symbol_classes = symbol_classes
+        if symbol_classes is not None:
+            self.symbol_ids = {symbol: self.symbol_ids[symbol_class] for symbol, symbol_class in symbol_classes.items()}
+        self.trie = compile_alphabet(frozenset(self.symbol_ids))
+        self.single_char = all(len(symbol) == 1 for symbol in self.symbol_ids)
+        self.padded_table = None
+
+    # Prelaz iz stanja po id-u simbola
+    # O(1)
+    def next_state(self, state, symbol_id):
+        return self.table[state * self.stride + symbol_id] // self.stride
+
+    def is_accepting(self, state):
+        return bool(self.accepting[state])
+
+    # Pretvara string u niz id-ova simbola najduzim poklapanjem u trie-u alfabeta
+    # Vraca None ako neki dio stringa nije simbol alfabeta
+    # O(m * l), gdje je m duzina stringa, a l duzina najduzeg simbola
+    def tokenize(self, text):
+        symbol_ids = array('i')
+        i = 0
+        while i < len(text):
+            j = self.trie.longest_match(text, i)
+            symbol_id = self.symbol_ids.get(text[i:j]) if j > i else None
+            if symbol_id is None:
+                return None
+            symbol_ids.append(symbol_id)
+            i = j
+        return symbol_ids
+
+    # Prepoznavanje vec tokenizovanog ulaza (niz id-ova simbola)
+    # O(m), gdje je m duzina ulaza
+    def match_symbols(self, symbol_ids):
+        table = self.table
+        dead_row = self.dead_state * self.stride
+        row = self.start_row
+        for symbol_id in symbol_ids:
+            row = table[row + symbol_id]
+            if row == dead_row:
+                return False
+        return self.is_accepting(row // self.stride)
+
+    # Prepoznavanje sirovog stringa. Ako su svi simboli jedan karakter, karakteri se
+    # direktno preslikavaju u id-ove; inace se string tokenizuje preko trie-a.
+    # O(m * l), gdje je m duzina stringa, a l duzina najduzeg simbola
+    def match(self, text):
+        if not self.single_char:
+            symbol_ids = self.tokenize(text)
+            return symbol_ids is not None and self.match_symbols(symbol_ids)
+        table = self.table
+        ids = self.symbol_ids
+        dead_row = self.dead_state * self.stride
+        row = self.start_row
+        for char in text:
+            symbol_id = ids.get(char)
+            if symbol_id is None:
+                return False
+            row = table[row + symbol_id]
+            if row == dead_row:
+                return False
+        return self.is_accepting(row // self.stride)
+
+    # Stanje DKA nakon cijelog ulaza, ili mrtvo stanje ako ulaz nije rijec nad alfabetom
+    # O(m * l), gdje je m duzina stringa, a l duzina najduzeg simbola
+    def final_state(self, text):
+        symbol_ids = self.tokenize(text)
+        if symbol_ids is None:
+            return self.dead_state
+        table = self.table
+        dead_row = self.dead_state * self.stride
+        row = self.start_row
+        for symbol_id in symbol_ids:
+            row = table[row + symbol_id]
+            if row == dead_row:
+                break
+        return row // self.stride
+
+    # Tabela prelaza kao NumPy matrica stanja (ne pomjeraja) sa dodatnom kolonom
+    # za PAD u kojoj svako stanje prelazi u sebe. Pravi se jednom, pri prvom pozivu.
+    # O(n * m), gdje je n broj stanja, a m broj simbola
+    def numpy_table(self):
+        if self.padded_table is None:
+            states = np.frombuffer(self.table, dtype=np.int32).astype(np.int64).reshape(self.state_count, self.stride) // self.stride
+            self_loops = np.arange(self.state_count, dtype=np.int64).reshape(-1, 1)
+            self.padded_table = np.hstack([states, self_loops])
+        return self.padded_table
+
+    # Paketno prepoznavanje: symbols je 2-D niz id-ova simbola (jedan red po ulazu),
+    # kraci ulazi su dopunjeni vrijednoscu PAD. Sa NumPy-jem se svi ulazi pomjeraju
+    # za jednu kolonu jednim indeksiranjem tabele; bez NumPy-ja (ili sa use_numpy=False)
+    # isti rezultat daje petlja u cistom Pythonu.
+    # Vraca niz bool vrijednosti (NumPy niz ili listu); prazan paket daje prazan niz
+    # O(r * c), gdje je r broj ulaza, a c duzina najduzeg ulaza
+    def match_batch(self, symbols, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if not use_numpy:
+            return [self.match_symbols([symbol_id for symbol_id in row if symbol_id != PAD]) for row in symbols]
+        symbols = np.asarray(symbols, dtype=np.int64)
+        if symbols.size == 0:
+            return np.zeros(len(symbols), dtype=bool)
+        if symbols.ndim != 2:
+            raise Exception('Paket ulaza mora biti dvodimenzionalni niz')
+        table = self.numpy_table()
+        columns = np.where(symbols == PAD, self.stride, symbols)
+        states = np.full(symbols.shape[0], self.start_row // self.stride, dtype=np.int64)
+        for column in range(columns.shape[1]):
+            states = table[states, columns[:, column]]
+        return self.accept_vector()[states]
+
+    # Prihvatajuca stanja kao NumPy niz bool vrijednosti indeksiran stanjem
+    # O(n)
+    def accept_vector(self):
+        return np.frombuffer(self.accepting, dtype=np.uint8).astype(bool)
+
+    # Paketno prepoznavanje nazubljenog niza: svi ulazi su nadovezani u symbols,
+    # a ulaz i zauzima symbols[offsets[i]:offsets[i+1]]
+    # O(r * c), gdje je r broj ulaza, a c duzina najduzeg ulaza
+    def match_ragged(self, symbols, offsets, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if not use_numpy:
+            return [self.match_symbols(symbols[offsets[i]:offsets[i + 1]]) for i in range(len(offsets) - 1)]
+        symbols = np.asarray(symbols, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if len(offsets) < 2:
+            return np.zeros(0, dtype=bool)
+        lengths = np.diff(offsets)
+        width = int(lengths.max()) if len(lengths) else 0
+        padded = np.full((len(lengths), width), PAD, dtype=np.int64)
+        padded[np.arange(width) < lengths[:, None]] = symbols[offsets[0]:offsets[-1]]
+        return self.match_batch(padded, use_numpy=True)
+
+
+# Test primjer
+def main():
+    alphabet = {'START', 'AB', 'STOP'}
+    regex = 'START(AB)*STOP'
+    rl = Lexer(regex, alphabet)
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct()
+    dka = NKAtoDKAKonvertor(nka).convert().to_dict()
+    compiled = CompiledDFA(DKAMinimizer(dka).to_dict(), alphabet)
+    for word in ['STARTSTOP', 'STARTABABSTOP', 'STARTAB', 'STARTXSTOP']:
+        print(word, compiled.match(word))
+
+
+if __name__ == "__main__":
+    main()
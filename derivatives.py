@@ -0,0 +1,292 @@
+from dka import *
+
+# Vrste izraza u tabeli izraza
+EMPTY = 0
+EPS = 1
+
+# Klasa za direktnu konstrukciju DKA pomocu Brzozowskijevih izvoda
+# prima AST
+# vraca DKA bez pravljenja NKA
+# Svaki izraz je cijeli broj (id) u tabeli izraza. Strukturno isti izrazi dobijaju
+# isti id (hash-consing), pa je izraz odmah i kljuc stanja DKA. Pametni konstruktori
+# normalizuju uniju (asocijativnost, komutativnost, idempotentnost) i pravila za ε i ∅,
+# pa skup razlicitih izvoda ostaje mali. Ponavljanja {n,m} ostaju jedan izraz, pa
+# izvod x{n,m} ne razvija n kopija.
+# budget - opcioni Budget, provjerava se pri svakom novom stanju DKA i pri svakom
+# novom izracunatom izvodu, pa i jedan veliki izvod prekida konstrukciju na vrijeme
+class ASTtoDerivativeDKA:
+    def __init__(self, ast, alphabet=None, budget=None):
+        self.ast = ast
+        self.budget = budget
+        self.terms = [('empty',), ('eps',)]
+        self.ids = {('empty',): EMPTY, ('eps',): EPS}
+        self.nullable_cache = [False, True]
+        self.derivative_cache = {}
+        self.alphabet = set()
+        self.root = self.term_of(ast)
+        if alphabet is not None:
+            self.alphabet = set(alphabet) - {'ε'}
+
+    # Vraca id izraza, dodajuci ga u tabelu ako ne postoji
+    # O(1) za kljuc fiksne duzine, O(k) za uniju od k clanova
+    def intern(self, key):
+        term = self.ids.get(key)
+        if term is None:
+            term = len(self.terms)
+            self.ids[key] = term
+            self.terms.append(key)
+            self.nullable_cache.append(self.compute_nullable(key))
+        return term
+
+    # Pametni konstruktori
+    # O(1)
+    def symbol(self, char):
+        self.alphabet.add(char)
+        return self.intern(('sym', char))
+
+    # Nadovezivanje je desno asocijativno: (r s) t = r (s t)
+    # Lijevi clan nadovezivanja u tabeli nikad nije nadovezivanje, pa se lijevi lanac
+    # rastavlja petljom na clanove i ponovo slaze s desna, bez rekurzije
+    # O(d), gdje je d broj clanova lijevog nadovezivanja
+    def cat(self, left, right):
+        if left == EMPTY or right == EMPTY:
+            return EMPTY
+        if left == EPS:
+            return right
+        if right == EPS:
+            return left
+        factors = []
+        while self.terms[left][0] == 'cat':
+            factors.append(self.terms[left][1])
+            left = self.terms[left][2]
+        result = self.intern(('cat', left, right))
+        for factor in reversed(factors):
+            result = self.intern(('cat', factor, result))
+        return result
+
+    # Unija se spljostava i sortira, ∅ se izbacuje, duplikati se spajaju
+    # O(k log k), gdje je k broj clanova unije
+    def alt(self, members):
+        flat = set()
+        for member in members:
+            key = self.terms[member]
+            if key[0] == 'alt':
+                flat.update(key[1])
+            elif member != EMPTY:
+                flat.add(member)
+        if not flat:
+            return EMPTY
+        if len(flat) == 1:
+            return flat.pop()
+        return self.intern(('alt', tuple(sorted(flat))))
+
+    # O(1)
+    def star(self, inner):
+        if inner == EMPTY or inner == EPS:
+            return EPS
+        if self.terms[inner][0] == 'star':
+            return inner
+        return self.intern(('star', inner))
+
+    # high je None za neograniceno ponavljanje
+    # O(1)
+    def repeat(self, inner, low, high):
+        if high == 0 or inner == EPS:
+            return EPS
+        if inner == EMPTY:
+            return EPS if low == 0 else EMPTY
+        if low == 0 and high is None:
+            return self.star(inner)
+        if low == 1 and high == 1:
+            return inner
+        return self.intern(('repeat', inner, low, high))
+
+    # O(k), gdje je k broj clanova izraza
+    def compute_nullable(self, key):
+        match key[0]:
+            case 'empty' | 'sym':
+                return False
+            case 'eps' | 'star':
+                return True
+            case 'cat':
+                return self.nullable_cache[key[1]] and self.nullable_cache[key[2]]
+            case 'alt':
+                return any(self.nullable_cache[member] for member in key[1])
+            case 'repeat':
+                return key[2] == 0 or self.nullable_cache[key[1]]
+
+    def nullable(self, term):
+        return self.nullable_cache[term]
+
+    # Izvod izraza po simbolu, rezultat se pamti.
+    # Izrazi cine aciklican graf (clanovi su u tabeli prije izraza koji ih sadrzi), pa se
+    # izvodi racunaju u postorderu sa eksplicitnim stekom: izvod izraza se pravi tek kada
+    # su izvodi svih clanova koje koristi vec u kesu. Dubina izraza nije ogranicena
+    # dubinom rekurzije (npr. hiljade nadovezanih clanova koji prihvataju ε).
+    # O(velicina izraza) prvi put, O(1) nakon toga
+    def derivative(self, term, symbol):
+        cache = self.derivative_cache
+        result = cache.get((term, symbol))
+        if result is not None:
+            return result
+        stack = [term]
+        while stack:
+            current = stack[-1]
+            if (current, symbol) in cache:
+                stack.pop()
+                continue
+            pending = [member for member in self.derivative_members(current) if (member, symbol) not in cache]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            cache[(current, symbol)] = self.combine_derivative(current, symbol)
+            if self.budget is not None:
+                self.budget.check_common('dfa', self.estimated_bytes(), terms=len(self.terms))
+        return cache[(term, symbol)]
+
+    # Procjena memorije: tabela izraza i kes izvoda, plus stanja i prelazi DKA
+    # O(1)
+    def estimated_bytes(self, states=0, symbol_count=0):
+        terms_bytes = (len(self.terms) + len(self.derivative_cache)) * TERM_BYTES
+        return terms_bytes + states * (DFA_STATE_BYTES + symbol_count * DFA_TRANSITION_BYTES)
+
+    # Clanovi ciji su izvodi potrebni za izvod izraza
+    # O(k), gdje je k broj clanova izraza
+    def derivative_members(self, term):
+        key = self.terms[term]
+        match key[0]:
+            case 'cat':
+                return [key[1], key[2]] if self.nullable(key[1]) else [key[1]]
+            case 'alt':
+                return key[1]
+            case 'star' | 'repeat':
+                return [key[1]]
+        return []
+
+    # Izvod izraza od vec izracunatih izvoda njegovih clanova
+    # O(k log k), gdje je k broj clanova izraza
+    def combine_derivative(self, term, symbol):
+        cache = self.derivative_cache
+        key = self.terms[term]
+        match key[0]:
+            case 'empty' | 'eps':
+                return EMPTY
+            case 'sym':
+                return EPS if key[1] == symbol else EMPTY
+            case 'cat':
+                result = self.cat(cache[(key[1], symbol)], key[2])
+                if self.nullable(key[1]):
+                    result = self.alt([result, cache[(key[2], symbol)]])
+                return result
+            case 'alt':
+                return self.alt([cache[(member, symbol)] for member in key[1]])
+            case 'star':
+                return self.cat(cache[(key[1], symbol)], term)
+            case 'repeat':
+                inner, low, high = key[1], key[2], key[3]
+                rest = self.repeat(inner, max(low - 1, 0), None if high is None else high - 1)
+                return self.cat(cache[(inner, symbol)], rest)
+
+    # Pretvara AST u izraz obilaskom u postorderu sa eksplicitnim stekom
+    # Izraz se pamti po (internovanom) cvoru, pa se ponovljeno podstablo obradjuje jednom
+    # O(n), gdje je n broj razlicitih čvorova u AST-u
+    def term_of(self, node):
+        results = []
+        memo = {}
+        stack = [(node, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done and node in memo:
+                results.append(memo[node])
+                continue
+            children = children_of(node)
+            if children and not children_done:
+                stack.append((node, True))
+                for child in reversed(children):
+                    stack.append((child, False))
+                continue
+            child_terms = results[len(results) - len(children):]
+            del results[len(results) - len(children):]
+            memo[node] = self.combine(node, child_terms)
+            results.append(memo[node])
+        return results[0]
+
+    # Pravi izraz cvora od izraza njegovih podstabala
+    # O(k), gdje je k broj podstabala
+    def combine(self, node, child_terms):
+        node_type = type(node).__name__
+        if node_type == 'LiteralNode':
+            return EPS if node.char == 'ε' else self.symbol(node.char)
+        if node_type == 'SeqNode':
+            term = EPS
+            for child in reversed(child_terms):
+                term = self.cat(child, term)
+            return term
+        if node_type == 'OrNode':
+            return self.alt(child_terms)
+        if node_type == 'StarNode':
+            return self.star(child_terms[0])
+        if node_type == 'RepeatExactlyNode':
+            return self.repeat(child_terms[0], int(node.num), int(node.num))
+        if node_type == 'RepeatBetweenNode':
+            return self.repeat(child_terms[0], int(node.low), int(node.high))
+        if node_type == 'RepeatMinNode':
+            return self.repeat(child_terms[0], int(node.min), None)
+        raise Exception("Neocekivan tip AST cvora")
+
+    # Gradi cijeli DKA: stanja su izrazi dostizni izvodima iz korijena
+    # Izraz ∅ je mrtvo stanje.
+    # O(s * m), gdje je s broj razlicitih izvoda, a m velicina alfabeta
+    def construct(self):
+        symbols = sorted(self.alphabet)
+        state_ids = {self.root: 0}
+        terms = [self.root]
+        transition_function = {}
+        accept_states = set()
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            term = terms[state]
+            if self.nullable(term):
+                accept_states.add(state)
+            transitions = {}
+            for symbol in symbols:
+                next_term = self.derivative(term, symbol)
+                next_state = state_ids.get(next_term)
+                if next_state is None:
+                    next_state = len(terms)
+                    state_ids[next_term] = next_state
+                    terms.append(next_term)
+                    queue.append(next_state)
+                    if self.budget is not None:
+                        self.budget.check_dfa(len(terms), len(queue), self.estimated_bytes(len(terms), len(symbols)))
+                transitions[symbol] = next_state
+            transition_function[state] = transitions
+        self.state_terms = terms
+        return DKA(set(self.alphabet), list(range(len(terms))), 0, accept_states, transition_function, state_ids.get(EMPTY))
+
+    # Lijeno prepoznavanje bez pravljenja DKA: izvodi se racunaju samo za posjecene
+    # izraze i pamte se, pa se ponovljeni prelazi ne racunaju ponovo
+    # O(m) kada su izvodi vec izracunati, gdje je m duzina ulaza
+    def execute(self, input_string):
+        term = self.root
+        for symbol in input_string:
+            term = self.derivative(term, symbol)
+            if term == EMPTY:
+                return False
+        return self.nullable(term)
+
+
+# Test za konstrukciju DKA pomocu izvoda
+def main():
+    regex = '(a+b)*a(a+b){3}'
+    print('DKA pomocu izvoda za regex: ', regex + '\n')
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    dka = ASTtoDerivativeDKA(AST).construct().to_dict()
+    ilustrate_dka(dka)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,29 @@ from nka import *
 # Klasa za DKA 
 # Predstavlja deterministički konačni automat (DFA) s alfabetom, 
 #stanjima, početnim stanjem, prihvaćajućim stanjima i prijelaznom funkcijom.
+# dead_state - mrtvo stanje koje se ne ispisuje u to_dict (ako postoji)
 class DKA: 
-    def __init__(self, alphabet, states, starting_state, accept_states, transition_function):
+    def __init__(self, alphabet, states, starting_state, accept_states, transition_function, dead_state=None):
         self.alphabet = alphabet
         self.states = states
         self.starting_state = starting_state
         self.accept_states = accept_states
         self.transition_function = transition_function
+        self.dead_state = dead_state
         self.states_map = {}
         self.state_counter = 0
     
     # Funkcija za provjeravanje da li je trenutni niz susednih karaktera u alfabetu
+    # Nedefinisan prelaz odbija ulaz
     # O(m), gdje je m duzina ulaznog stringa
     def execute(self, input_string):
         current_state = self.starting_state
         index = 0
         while index < len(input_string):
             symbol = input_string[index]
-            current_state = self.transition_function[current_state][symbol]
+            current_state = self.transition_function.get(current_state, {}).get(symbol)
+            if current_state is None:
+                return False
             index += 1
         return current_state in self.accept_states
     
@@ -42,125 +47,320 @@ class DKA:
         dfa_dictionary['startingState'] = self.get_mapped_state_number(self.starting_state)
     
         for state in self.states:
-            match state:
-                case 'frozenset()':
-                    continue
-                case _:
-                    dfa_dictionary[self.get_mapped_state_number(state)] = {
-                        "isTerminatingState": state in self.accept_states
-                    }
+            if state == self.dead_state:
+                continue
+            dfa_dictionary[self.get_mapped_state_number(state)] = {
+                "isTerminatingState": state in self.accept_states
+            }
 
             for symbol in self.alphabet:
                 match symbol:
                     case 'isTerminatingState':
                         continue
                     case _:
-                        if self.transition_function[state][symbol] != "frozenset()":
-                            dfa_dictionary[self.get_mapped_state_number(state)][symbol] = self.get_mapped_state_number(self.transition_function[state][symbol]) 
+                        next_state = self.transition_function.get(state, {}).get(symbol, self.dead_state)
+                        if next_state != self.dead_state:
+                            dfa_dictionary[self.get_mapped_state_number(state)][symbol] = self.get_mapped_state_number(next_state) 
         return dfa_dictionary
-    
+
+
+# Vraca indekse postavljenih bitova u bitsetu, od najnizeg ka najvisem
+# O(k), gdje je k broj postavljenih bitova
+def bits_of(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Klasa za gusto numerisan NKA
+# Svako stanje NKA dobija indeks 0..n-1, a skup stanja se predstavlja
+# kao Python int kod kojeg je bit i postavljen ako je stanje i u skupu.
+# Prima NKA objekat (kompaktni oblik iz ASTtoNFA) ili NKA u obliku recnika.
+class BitsetNKA:
+    def __init__(self, nka):
+        self.alphabet = set()
+        self.accept_mask = 0
+        if isinstance(nka, NKA):
+            self.index_compact(nka)
+        else:
+            self.names = [state for state in nka if state != 'startingState']
+            self.index = {name: i for i, name in enumerate(self.names)}
+            for state in list(self.names):
+                for symbol, next_states in nka[state].items():
+                    if symbol != 'isTerminatingState':
+                        for next_state in next_states:
+                            self.state_index(next_state)
+            self.start = self.state_index(nka['startingState'])
+            self.epsilon = [0] * len(self.names)
+            self.moves = [{} for _ in self.names]
+            self.index_transitions(nka)
+        self.epsilon_free = not any(self.epsilon)
+        self.closures = self.closure_table()
+        self.closure_cache = {}
+
+    # Preuzima prelaze direktno iz CSR nizova NKA, stanja su vec gusto numerisana
+    # O(n + e), gdje je n broj stanja, a e broj prelaza
+    def index_compact(self, nka):
+        self.names = [str(state) for state in range(nka.num_states)]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.start = nka.start_state
+        for state in nka.accept_states:
+            self.accept_mask |= 1 << state
+        self.epsilon = [0] * nka.num_states
+        self.moves = [{} for _ in range(nka.num_states)]
+        for state in range(nka.num_states):
+            moves = self.moves[state]
+            for symbol, next_state in nka.transitions(state):
+                if symbol is None:
+                    self.epsilon[state] |= 1 << next_state
+                else:
+                    self.alphabet.add(symbol)
+                    moves[symbol] = moves.get(symbol, 0) | (1 << next_state)
+
+    # Vraca indeks stanja, dodjeljujuci novi ako stanje nije vidjeno
+    # O(1)
+    def state_index(self, name):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        return self.index[name]
+
+    # Pretvara prelaze iz recnika u bitsetove po stanju i simbolu
+    # O(n * m), gdje je n broj stanja, a m broj prelaza po stanju
+    def index_transitions(self, nka):
+        for state, transitions in nka.items():
+            if state == 'startingState':
+                continue
+            i = self.index[state]
+            for symbol, next_states in transitions.items():
+                if symbol == 'isTerminatingState':
+                    if next_states:
+                        self.accept_mask |= 1 << i
+                    continue
+                mask = 0
+                for next_state in next_states:
+                    mask |= 1 << self.index[next_state]
+                if symbol == 'epsilon':
+                    self.epsilon[i] |= mask
+                else:
+                    self.alphabet.add(symbol)
+                    self.moves[i][symbol] = self.moves[i].get(symbol, 0) | mask
+
+    # Racuna epsilon zatvorenje svakog pojedinacnog stanja jednom, unaprijed.
+    # Tarjanov algoritam (bez rekurzije) sazima epsilon cikluse u jake komponente;
+    # komponente izlaze u obrnutom topoloskom redosledu, pa su zatvorenja
+    # nasljednika vec izracunata kada se komponenta zatvori.
+    # O(n + e) bitset operacija, gdje je n broj stanja, a e broj epsilon prelaza
+    def closure_table(self):
+        count = len(self.names)
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack = []
+        closures = [0] * count
+        counter = 0
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, bits_of(self.epsilon[root]))]
+            while work:
+                state, successors = work[-1]
+                descended = False
+                for successor in successors:
+                    if order[successor] == -1:
+                        order[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, bits_of(self.epsilon[successor])))
+                        descended = True
+                        break
+                    if on_stack[successor]:
+                        low[state] = min(low[state], order[successor])
+                if descended:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[state])
+                if low[state] == order[state]:
+                    self.close_component(state, stack, on_stack, closures)
+        return closures
+
+    # Skida jaku komponentu sa steka i dodjeljuje svim njenim stanjima isto zatvorenje
+    # O(k + e), gdje je k broj stanja u komponenti, a e broj njihovih epsilon prelaza
+    def close_component(self, root, stack, on_stack, closures):
+        members = 0
+        component = []
+        while True:
+            state = stack.pop()
+            on_stack[state] = False
+            members |= 1 << state
+            component.append(state)
+            if state == root:
+                break
+        closure = members
+        for state in component:
+            for successor in bits_of(self.epsilon[state] & ~members):
+                closure |= closures[successor]
+        for state in component:
+            closures[state] = closure
+
+    # Epsilon zatvorenje skupa stanja kao unija zatvorenja pojedinacnih stanja.
+    # Rezultat se kesira po skupu stanja, jer se isti skupovi ponavljaju kroz konstrukciju.
+    # use_cache=False se koristi kada bi kesa rasla bez granice (simulacija NKA)
+    # NKA bez epsilon prelaza (npr. Glushkovljev) preskace zatvorenje u potpunosti.
+    # O(k), gdje je k broj stanja u skupu (O(1) ako je skup vec vidjen)
+    def closure(self, subset, use_cache=True):
+        if self.epsilon_free:
+            return subset
+        closure = self.closure_cache.get(subset) if use_cache else None
+        if closure is None:
+            closure = subset
+            for i in bits_of(subset):
+                closure |= self.closures[i]
+            if use_cache:
+                self.closure_cache[subset] = closure
+        return closure
+
+    # Prelaz skupa stanja po jednom simbolu (bez zatvorenja)
+    # O(k), gdje je k broj stanja u skupu
+    def move(self, subset, symbol):
+        move_states = 0
+        for i in bits_of(subset):
+            move_states |= self.moves[i].get(symbol, 0)
+        return move_states
+
+    # Prelazi skupa stanja po svim simbolima u jednom prolazu kroz skup
+    # O(k * m), gdje je k broj stanja u skupu, a m broj prelaza po stanju
+    def move_all(self, subset):
+        move_states = {}
+        for i in bits_of(subset):
+            for symbol, mask in self.moves[i].items():
+                move_states[symbol] = move_states.get(symbol, 0) | mask
+        return move_states
+
+    def is_terminating(self, subset):
+        return subset & self.accept_mask != 0
+
+    # Pretvaranje izmedju imena stanja i bitseta
+    # O(k), gdje je k broj stanja u skupu
+    def to_mask(self, states):
+        mask = 0
+        for state in states:
+            if state in self.index:
+                mask |= 1 << self.index[state]
+        return mask
+
+    def to_names(self, subset):
+        return frozenset(self.names[i] for i in bits_of(subset))
+
 
 # Klasa za pretvaranje NKA u DKA
-# prima NKA
+# prima NKA (objekat ili recnik iz NKA.to_dict)
 # vraca DKA
-
+# Stanja DKA su cijeli brojevi, a skupovi stanja NKA se internuju
+# u recnik bitset -> id, pa je provjera postojanja stanja O(1).
+# budget - opcioni Budget; provjerava se pri svakom novom stanju DKA, pa eksplozija
+# broja podskupova prekida konstrukciju izuzetkom BudgetExceeded umjesto da potrosi memoriju
 class NKAtoDKAKonvertor:
-    def __init__(self, nka):
+    def __init__(self, nka, budget=None):
         self.nka = nka
+        self.budget = budget
+        self.estimated_bytes = 0
+        self.bitset_nka = BitsetNKA(nka)
+        self.subsets = []
+        self.dfa = None
         self.dfa = self.convert()
 
     # Odredjenje epsilon-ciljnih stanja
     # O(n), gdje je n broj stanja u NFA
     def epsilon_closure(self, states):
-        closure = set(states)
-        queue = list(states)
-        i = 0
-        while i < len(queue):
-            state = queue[i]
-            if state in self.nka:
-                self.next_states_closure(state, closure, queue)
-            i += 1
-        return frozenset(closure)
-    
-    # Metoda za pretvaranje epsilon-ciljnih stanja
-    # O(m),gdje je m broj epsilon tranzicija iz stanja
-    def next_states_closure(self, state, closure, queue):
-        for next_state in self.nka[state].get("epsilon", []):           
-            if next_state not in closure:
-                closure.add(next_state)
-                queue.append(next_state)
+        closure = self.bitset_nka.closure(self.bitset_nka.to_mask(states))
+        return self.bitset_nka.to_names(closure)
 
     # Metoda koja vrsi prijelaz po simbolu
     # O(n), gdje je n broj stanja u NFA
     def move(self, states, symbol):
-        move_states = set()
-        for state in states:
-            if state in self.nka:
-                #provjera da li je isTerminatingState
-                if symbol == 'isTerminatingState':
-                    continue
-                for next_state in self.nka[state].get(symbol, []):
-                    move_states.add(next_state)
-        return frozenset(move_states)
+        move_states = self.bitset_nka.move(self.bitset_nka.to_mask(states), symbol)
+        return self.bitset_nka.to_names(move_states)
     
     # Metoda za pretvaranje NKA u DKA
+    # Rezultat se pamti, pa ponovni poziv ne radi konstrukciju iznova
     # O(2^n * m), gdje je n broj stanja u NFA, a m velicina alfabeta
     def convert(self):
+        if self.dfa is not None:
+            return self.dfa
         alphabet = self.extract_alphabet()
-        start_state = self.epsilon_closure([self.nka["startingState"]])
+        start_state = self.bitset_nka.closure(1 << self.bitset_nka.start)
     
         dka_states, dka_accept_states, dka_transition_function = self.construct_dka(alphabet, start_state)
+        dead_state = self.state_ids.get(0)
     
-        dka_states = [str(state) for state in dka_states]
-        start_state = str(start_state)
-        dka_accept_states = [str(state) for state in dka_accept_states]
-        dka_transition_function = {
-            str(k): {symbol: str(v) for symbol, v in transitions.items()}
-            for k, transitions in dka_transition_function.items()
-        }
-    
-        return DKA(alphabet, dka_states, start_state, dka_accept_states, dka_transition_function)
+        return DKA(alphabet, dka_states, 0, dka_accept_states, dka_transition_function, dead_state)
 
     # Pomocne metode za convert metodu
+    # Simboli se obilaze sortirano da bi numeracija stanja bila ponovljiva
     def convert_transition_function(self, queue, alphabet, dka_states, dka_accept_states, dka_transition_function):
+        symbols = sorted(alphabet)
         while queue:
-            current_state = queue.pop(0)
-            for symbol in alphabet:
-                move_states = self.move(current_state, symbol)
-                closure_states = self.epsilon_closure(move_states)
+            current_state = queue.popleft()
+            subset = self.subsets[current_state]
+            move_states = self.bitset_nka.move_all(subset)
+            transitions = {}
+            for symbol in symbols:
+                closure_states = self.bitset_nka.closure(move_states.get(symbol, 0))
+                next_state = self.state_ids.get(closure_states)
+                if next_state is None:
+                    next_state = self.intern(closure_states)
+                    dka_states.append(next_state)
+                    queue.append(next_state)
+                    if self.budget is not None:
+                        self.check_budget(closure_states, len(symbols), len(queue))
+                transitions[symbol] = next_state
+            dka_transition_function[current_state] = transitions
 
-                if closure_states not in dka_states:
-                    dka_states.append(closure_states)
-                    queue.append(closure_states)
+            if self.bitset_nka.is_terminating(subset):
+                dka_accept_states.add(current_state)
 
-                dka_transition_function.setdefault(current_state, {})[symbol] = closure_states
+    # Dodjeljuje novi id skupu stanja NKA
+    # O(1)
+    def intern(self, subset):
+        state = len(self.subsets)
+        self.state_ids[subset] = state
+        self.subsets.append(subset)
+        return state
 
-            if any(self.is_terminating(state) for state in current_state):
-                dka_accept_states.append(current_state)
-    # O(n * m), gdje je n broj stanja, a m broj prelaza po stanju
+    # Dodaje procjenu memorije novog stanja DKA i provjerava budzet
+    # O(1)
+    def check_budget(self, subset, symbol_count, unexplored):
+        self.estimated_bytes += DFA_STATE_BYTES + symbol_count * DFA_TRANSITION_BYTES + subset.bit_length() // 8
+        self.budget.check_dfa(len(self.subsets), unexplored, self.estimated_bytes)
+
+    # O(1), alfabet se izdvaja pri numerisanju stanja
     def extract_alphabet(self):
-        alphabet = set()
-        for state in self.nka.values():
-            for symbol in state:
-                if symbol != "epsilon":
-                    alphabet.add(symbol)
-
-        alphabet.discard("isTerminatingState")
-        alphabet.discard(self.nka["startingState"])
-        return alphabet
+        return set(self.bitset_nka.alphabet)
     
     # O(2^n * m), gdje je n broj stanja, a m broj prelaza po stanju
     def construct_dka(self, alphabet, start_state):
-        dka_states = [start_state]
-        dka_accept_states = []
+        self.state_ids = {}
+        self.subsets = []
+        start = self.intern(start_state)
+        dka_states = [start]
+        dka_accept_states = set()
         dka_transition_function = {}
-        queue = [start_state]
+        queue = deque([start])
         self.convert_transition_function(queue, alphabet, dka_states, dka_accept_states, dka_transition_function)
     
         return dka_states, dka_accept_states, dka_transition_function
     
     def is_terminating(self, state):
-        return state in self.nka and self.nka[state].get("isTerminatingState", False)
+        return self.bitset_nka.is_terminating(self.bitset_nka.to_mask([state]))
     
     
 # Ispisuje DKA
@@ -0,0 +1,205 @@
+from nka import *
+
+# Klasa za podatke Glushkovljeve konstrukcije jednog podstabla
+# positions - simbol svake pozicije (pojavljivanja literala), redom s lijeva
+# nullable - da li podstablo prihvata prazan string
+# first, last - skupovi pozicija kojima rijec moze pocinjati, odnosno zavrsavati se
+# follow - skup parova (p, q) takvih da pozicija q moze slijediti poziciju p
+class PositionFragment:
+    def __init__(self, positions, nullable, first, last, follow):
+        self.positions = positions
+        self.nullable = nullable
+        self.first = first
+        self.last = last
+        self.follow = follow
+
+    # Prazan string: nema pozicija, prihvata samo ε
+    @staticmethod
+    def empty():
+        return PositionFragment([], True, set(), set(), set())
+
+    # Kopija fragmenta sa svim pozicijama pomjerenim za offset
+    # O(p + f), gdje je p broj pozicija, a f broj parova u follow
+    def shifted(self, offset):
+        if offset == 0:
+            return self
+        return PositionFragment(
+            self.positions,
+            self.nullable,
+            {p + offset for p in self.first},
+            {p + offset for p in self.last},
+            {(p + offset, q + offset) for p, q in self.follow},
+        )
+
+    # Nadovezuje fragment na kraj ovog (ovaj se mijenja)
+    # budget - opcioni Budget, provjerava se posle svakog reda novih parova u follow
+    # O(p + f + |last| * |first|)
+    def append(self, other, budget=None):
+        other = other.shifted(len(self.positions))
+        self.positions.extend(other.positions)
+        self.follow |= other.follow
+        self.check_budget(budget)
+        for p in self.last:
+            self.follow.update((p, q) for q in other.first)
+            self.check_budget(budget)
+        if self.nullable:
+            self.first = self.first | other.first
+        if other.nullable:
+            self.last = self.last | other.last
+        else:
+            self.last = set(other.last)
+        self.nullable = self.nullable and other.nullable
+
+    # Unija sa drugim fragmentom (ovaj se mijenja, skupovi drugog se samo citaju)
+    # O(p + f) za drugi fragment
+    def union(self, other, budget=None):
+        other = other.shifted(len(self.positions))
+        self.positions.extend(other.positions)
+        self.follow |= other.follow
+        self.first |= other.first
+        self.last |= other.last
+        self.nullable = self.nullable or other.nullable
+        self.check_budget(budget)
+
+    # Dodaje povratak sa kraja na pocetak (x+); za x* jos treba nullable = True
+    # budget - opcioni Budget, provjerava se posle svakog reda novih parova u follow
+    # O(|last| * |first|)
+    def loop(self, budget=None):
+        self.follow = set(self.follow)
+        for p in self.last:
+            self.follow.update((p, q) for q in self.first)
+            self.check_budget(budget)
+
+    # Provjera budzeta sa trenutnom velicinom fragmenta: stanje po poziciji plus
+    # pocetno, prelaz po paru u follow i po poziciji u first. Parovi u follow se
+    # broje dok nastaju, pa se kvadratna konstrukcija prekida prije nego sto zavrsi.
+    # O(1)
+    def check_budget(self, budget):
+        if budget is not None:
+            budget.check_nfa(len(self.positions) + 1, len(self.follow) + len(self.first))
+
+
+# Klasa za Glushkovljevu (pozicionu) konstrukciju NKA
+# prima AST
+# vraca NKA bez epsilon prelaza: stanje 0 je pocetno, a stanje i+1 odgovara poziciji i.
+# Prelaz p -> q nosi simbol pozicije q, pa podskupovna konstrukcija nema korak zatvorenja.
+class ASTtoGlushkovNFA(ASTtoNFA):
+    # O(p^2) najgore, gdje je p broj pozicija (broj parova u follow skupu)
+    def construct(self):
+        self.reset([], {})
+        fragment = self.fragment_of(self.ast)
+        start_state = self.new_state()
+        for _ in fragment.positions:
+            self.new_state()
+        for q in sorted(fragment.first):
+            self.add_edge(start_state, fragment.positions[q], q + 1)
+        for p, q in sorted(fragment.follow):
+            self.add_edge(p + 1, fragment.positions[q], q + 1)
+        accept_states = [p + 1 for p in fragment.last]
+        if fragment.nullable:
+            accept_states.append(start_state)
+        return self.finish(start_state, None, accept_states)
+
+    # Racuna fragment za AST obilaskom u postorderu sa eksplicitnim stekom
+    # Fragment se pamti po cvoru, pa se ponovljeno (internovano) podstablo racuna jednom;
+    # combine ne mijenja fragmente podstabala, pa ih je bezbjedno dijeliti
+    # O(p^2) najgore, gdje je p broj pozicija
+    def fragment_of(self, node):
+        results = []
+        memo = {}
+        stack = [(node, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done and node in memo:
+                results.append(memo[node])
+                continue
+            children = children_of(node)
+            if children and not children_done:
+                stack.append((node, True))
+                for child in reversed(children):
+                    stack.append((child, False))
+                continue
+            child_fragments = results[len(results) - len(children):]
+            del results[len(results) - len(children):]
+            memo[node] = self.combine(node, child_fragments)
+            memo[node].check_budget(self.budget)
+            results.append(memo[node])
+        return results[0]
+
+    # Pravi fragment cvora od vec izracunatih fragmenata njegovih podstabala
+    # O(p + f) po cvoru (za ponavljanja puta broj kopija)
+    def combine(self, node, child_fragments):
+        node_type = type(node).__name__
+        if node_type == 'LiteralNode':
+            if node.char == 'ε':
+                return PositionFragment.empty()
+            return PositionFragment([node.char], False, {0}, {0}, set())
+
+        if node_type == 'SeqNode':
+            fragment = PositionFragment.empty()
+            for child in child_fragments:
+                fragment.append(child, self.budget)
+            return fragment
+
+        if node_type == 'OrNode':
+            fragment = PositionFragment([], False, set(), set(), set())
+            for child in child_fragments:
+                fragment.union(child, self.budget)
+            return fragment
+
+        child = child_fragments[0]
+        if node_type == 'StarNode':
+            return self.star(child)
+
+        if node_type == 'RepeatExactlyNode':
+            return self.repeat(child, int(node.num))
+
+        # x{n,m} = x^n (x?)^(m-n)
+        if node_type == 'RepeatBetweenNode':
+            fragment = self.repeat(child, int(node.low))
+            optional = PositionFragment(child.positions, True, child.first, child.last, child.follow)
+            for _ in range(int(node.high) - int(node.low)):
+                fragment.append(optional, self.budget)
+            return fragment
+
+        # x{0,} = x*, a x{n,} = x^(n-1) x+
+        if node_type == 'RepeatMinNode':
+            num = int(node.min)
+            if num == 0:
+                return self.star(child)
+            fragment = self.repeat(child, num - 1)
+            plus = PositionFragment(child.positions, child.nullable, child.first, child.last, child.follow)
+            plus.loop(self.budget)
+            fragment.append(plus, self.budget)
+            return fragment
+
+        raise Exception("Neocekivan tip AST cvora")
+
+    # x*
+    # O(f + |last| * |first|)
+    def star(self, child):
+        fragment = PositionFragment(child.positions, True, child.first, child.last, child.follow)
+        fragment.loop(self.budget)
+        return fragment
+
+    # x^num, num kopija istog fragmenta jedna za drugom
+    # O(num * (p + f))
+    def repeat(self, child, num):
+        fragment = PositionFragment.empty()
+        for _ in range(num):
+            fragment.append(child, self.budget)
+        return fragment
+
+
+# Test za Glushkovljevu konstrukciju
+def main():
+    regex = '(a+b)*abb'
+    print('Glushkovljev NKA za regex: ', regex + '\n')
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoGlushkovNFA(AST).construct().to_dict()
+    ilustrate_nka(nka)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import itertools
+from lexer import Lexer
+from parse import Parser
+from dka import NKAtoDKAKonvertor
+from min_dka import DKAMinimizer
+from derivatives import ASTtoDerivativeDKA
+from pipeline import NFA_CONSTRUCTIONS
+
+# Zajednicke pomocne funkcije za testove: gradjenje AST-a i automata iz regexa
+# i nabrajanje svih rijeci nad alfabetom do zadate duzine.
+
+def parse_regex(regex, alphabet):
+    return Parser(Lexer(regex, alphabet).lexer()).parse()
+
+# NKA za regex; construction je 'thompson' ili 'glushkov'
+def build_nka(regex, alphabet, construction='thompson'):
+    return NFA_CONSTRUCTIONS[construction](parse_regex(regex, alphabet)).construct()
+
+# DKA (objekat, ne recnik) za regex; 'derivatives' gradi DKA direktno iz AST-a
+def build_dka(regex, alphabet, construction='thompson'):
+    if construction == 'derivatives':
+        return ASTtoDerivativeDKA(parse_regex(regex, alphabet)).construct()
+    return NKAtoDKAKonvertor(build_nka(regex, alphabet, construction)).convert()
+
+# vraca (DKA iz Thompsonovog NKA, minimalni DKA u obliku recnika)
+def build_min_dka(regex, alphabet):
+    dka = build_dka(regex, alphabet)
+    return dka, DKAMinimizer(dka.to_dict()).to_dict()
+
+# Sve rijeci do duzine max_length kao torke simbola (za simbole od vise karaktera)
+def symbol_words(symbols, max_length):
+    for length in range(max_length + 1):
+        yield from itertools.product(sorted(symbols), repeat=length)
+
+# Sve rijeci do duzine max_length kao stringovi
+def words_over(symbols, max_length):
+    for word in symbol_words(symbols, max_length):
+        yield ''.join(word)
@@ -0,0 +1,100 @@
+from dka import *
+
+# Klasa za lijeni DKA
+# Prima NKA dobijen iz ASTtoNFA.construct().
+# Stanja DKA se prave tek kada ih ulaz posjeti i cuvaju se u ogranicenoj kesi.
+# Kada se kesa napuni, brise se cijela i konstrukcija nastavlja od tekuceg
+# skupa stanja (kao u RE2). Ako se kesa tokom jednog ulaza brise vise od
+# max_flushes puta, ostatak ulaza se obradjuje simulacijom NKA.
+class LazyDKA:
+    def __init__(self, nka, max_states=1000, max_flushes=8):
+        if max_states < 1:
+            raise Exception('Kesa lijenog DKA mora imati bar jedno stanje')
+        self.bitset_nka = BitsetNKA(nka)
+        self.max_states = max_states
+        self.max_flushes = max_flushes
+        self.start_subset = self.bitset_nka.closure(1 << self.bitset_nka.start)
+        self.flush_count = 0
+        self.fallback_count = 0
+        self.flush()
+
+    # Brise sva napravljena stanja i kesu zatvorenja
+    # O(1) amortizovano
+    def flush(self):
+        self.state_ids = {}
+        self.subsets = []
+        self.transitions = []
+        self.accepting = []
+        self.bitset_nka.closure_cache.clear()
+
+    # Dodjeljuje id skupu stanja NKA
+    # O(1)
+    def intern(self, subset):
+        state = len(self.subsets)
+        self.state_ids[subset] = state
+        self.subsets.append(subset)
+        self.transitions.append({})
+        self.accepting.append(self.bitset_nka.is_terminating(subset))
+        return state
+
+    # Vraca id stanja za skup, praveci ga ako ne postoji
+    # Vraca None ako bi novo stanje prepunilo kesu
+    # O(1)
+    def lookup(self, subset):
+        state = self.state_ids.get(subset)
+        if state is None and len(self.subsets) < self.max_states:
+            state = self.intern(subset)
+        return state
+
+    # Zamjena za DKA.execute: ulaz je string (simbol po karakter) ili lista simbola
+    # O(m * k) najgore, O(m) kada su stanja u kesi, gdje je m duzina ulaza,
+    # a k broj stanja NKA
+    def execute(self, input_string):
+        flushes = 0
+        state = self.lookup(self.start_subset)
+        if state is None:
+            self.flush()
+            state = self.intern(self.start_subset)
+        for position, symbol in enumerate(input_string):
+            next_state = self.transitions[state].get(symbol)
+            if next_state is None:
+                subset = self.bitset_nka.closure(self.bitset_nka.move(self.subsets[state], symbol))
+                if subset == 0:
+                    return False
+                next_state = self.lookup(subset)
+                if next_state is None:
+                    flushes += 1
+                    self.flush_count += 1
+                    if flushes > self.max_flushes:
+                        self.fallback_count += 1
+                        return self.simulate(subset, input_string[position + 1:])
+                    self.flush()
+                    next_state = self.intern(subset)
+                else:
+                    self.transitions[state][symbol] = next_state
+            state = next_state
+        return self.accepting[state]
+
+    # Simulacija NKA nad bitsetovima, bez pravljenja stanja DKA
+    # O(m * k), gdje je m duzina ulaza, a k broj stanja NKA
+    def simulate(self, subset, input_string):
+        for symbol in input_string:
+            subset = self.bitset_nka.closure(self.bitset_nka.move(subset, symbol), use_cache=False)
+            if subset == 0:
+                return False
+        return self.bitset_nka.is_terminating(subset)
+
+
+# Test primjer
+def main():
+    regex = '(a+b)*a(a+b){20}'
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    lazy_dka = LazyDKA(ASTtoNFA(AST).construct())
+    for word in ['a' + 'b' * 20, 'b' * 21, 'ab' * 30]:
+        print(word, lazy_dka.execute(word))
+    print('Napravljeno stanja:', len(lazy_dka.subsets))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from enum import Enum, auto
+from functools import lru_cache
 
 # Klasa za odredjivanje podataka o tokenu
 # Moguce odrediti vrstu tokena i njegovu vrednost
@@ -67,28 +68,84 @@ def checkCocatenation(input, alphabet, pos):
             return True
     return False
 
+# Kljuc kojim cvor trie-a oznacava kraj simbola (prazan string nije karakter)
+TRIE_END = ''
+
+# Klasa za prefiksno stablo (trie) simbola alfabeta
+# Gradi se jednom po alfabetu i moze se dijeliti izmedju vise Lexer objekata.
+# Alfabet uvijek sadrzi i 'ε', ali se skup koji je proslijedjen ne mijenja.
+class AlphabetTrie:
+    # O(s), gdje je s ukupna duzina svih simbola
+    def __init__(self, alphabet):
+        self.symbols = frozenset(alphabet) | {'ε'}
+        self.root = {}
+        for symbol in self.symbols:
+            node = self.root
+            for char in symbol:
+                node = node.setdefault(char, {})
+            node[TRIE_END] = symbol
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    # Vraca kraj najduzeg simbola koji pocinje na poziciji pos, ili -1 ako ga nema
+    # O(l), gdje je l duzina najduzeg simbola u alfabetu
+    def longest_match(self, text, pos):
+        node = self.root
+        end = -1
+        while pos < len(text):
+            node = node.get(text[pos])
+            if node is None:
+                break
+            pos += 1
+            if TRIE_END in node:
+                end = pos
+        return end
+
+    # Kao longest_match, ali za tekst koji jos nije zavrsen (npr. dio toka ulaza):
+    # vraca (kraj, otvoren), gdje je otvoren True ako je tekst zavrsio usred puta
+    # u trie-u koji se moze nastaviti, pa bi sledeci karakteri mogli dati duzi simbol
+    # O(l), gdje je l duzina najduzeg simbola u alfabetu
+    def longest_match_partial(self, text, pos):
+        node = self.root
+        end = -1
+        while pos < len(text):
+            node = node.get(text[pos])
+            if node is None:
+                return end, False
+            pos += 1
+            if TRIE_END in node:
+                end = pos
+        return end, len(node) > (TRIE_END in node)
+
+# Vraca trie za alfabet, isti alfabet dobija isti (vec izgradjen) trie
+# O(s) prvi put, O(n) za svaki sledeci poziv (hesiranje skupa)
+@lru_cache(maxsize=64)
+def compile_alphabet(alphabet):
+    return AlphabetTrie(alphabet)
+
 
 # Klasa za Lexer
-# prima string
+# prima string i alfabet (skup simbola ili AlphabetTrie)
 # vraca niz tokena
 class Lexer:
     def __init__(self, regexStr, alphabet):
         self.regexStr = regexStr
-        self.alphabet = alphabet
-        self.alphabet.add('ε')
+        if isinstance(alphabet, AlphabetTrie):
+            self.trie = alphabet
+        else:
+            self.trie = compile_alphabet(frozenset(alphabet))
+        self.alphabet = self.trie.symbols
 
-    # O(m * n * l), gdje je m duzina ulaznog niza, n je broj simbola u alfabetu, a l je duzina najdužeg simbola u alfabetu.
+    # Najduzi simbol alfabeta se trazi obilaskom trie-a
+    # O(m * l), gdje je m duzina ulaznog niza, a l je duzina najdužeg simbola u alfabetu.
     def lexer(self):
         tokenStream = []
         i = 0
         while i < len(self.regexStr):
-            # Provera da li se kombinacija susednih karaktera nalazi u alfabetu
-            j = i
-            #while j < len(self.regexStr) and self.regexStr[i:j+1] in self.alphabet:
-            while j < len(self.regexStr) and checkCocatenation(self.regexStr[i:j+1],self.alphabet, j-i+1):
-                j += 1
+            j = self.trie.longest_match(self.regexStr, i)
             # Ako se kombinacija nalazi u alfabetu, dodajemo je kao literal token
-            if j > i and self.regexStr[i:j] in self.alphabet:
+            if j > i:
                 token = Token(TokenType.LITERAL, self.regexStr[i:j])
                 tokenStream.append(token)
                 i = j
@@ -1,10 +1,19 @@
 from dka import *
+from collections import deque
 
 # Klasa za minimizaciju DKA
 # Minimizira DFA dijeljenjem stanja u grupe na temelju njihovog ponašanja i
 # pogledu prihvaćanja i prelaza.
+# strategy - 'hopcroft' (podrazumevano) ili 'moore' (referentna implementacija)
+# tags - opcioni recnik stanje -> oznaka (npr. bitmaska id-ova obrazaca koje stanje
+# prihvata); pocetna particija tada dijeli stanja po oznakama umjesto samo na
+# prihvatajuca i ostala, pa minimalni DKA cuva oznake (vidi to_tags)
+# rounds - broj koraka rafiniranja (obradjenih razdvajaca kod Hopcrofta, prolaza kod Moorea)
 class DKAMinimizer:
-    def __init__(self, dka_dict):
+    def __init__(self, dka_dict, strategy='hopcroft', tags=None):
+        self.strategy = strategy
+        self.tags = tags
+        self.rounds = 0
         self.states, self.start_state, self.alphabet, self.accept_states, self.reject_states, self.groups = self.extract_data(dka_dict)
         self.partition = self.make_partition(dka_dict)
         self.old_dka_dict = dka_dict
@@ -16,7 +25,6 @@ class DKAMinimizer:
         start_state = dka_dict['startingState']
         
         alphabet = self.extract_alphabet(dka_dict)
-        alphabet.remove(dka_dict['startingState'])
         accept_states = set([s for s in states if dka_dict[s]['isTerminatingState']])
         reject_states = set(states) - accept_states
         groups = [accept_states, reject_states]
@@ -27,19 +35,137 @@ class DKAMinimizer:
     # O(n*m), gdje je n broj stanja, a m broj prelaza po stanju
     def extract_alphabet(self, dka_dict):
         alphabet = []
-        for state in dka_dict.values():
+        for name, state in dka_dict.items():
+            if name == 'startingState':
+                continue
             for key in state:
                 if key != 'isTerminatingState':
                     alphabet.append(key)
         return list(set(alphabet))
 
     # Funkcija za formiranje particije na temelju ponašanja
-    # O(n^2 * m), gdje je n broj stanja, a m broj prelaza po stanju
+    # Bira algoritam prema strategiji zadatoj u konstruktoru
     def make_partition(self, dka_dict):
-        a_s, r_s = self.accept_states, self.reject_states
-        partition = [a_s, r_s]
+        match self.strategy:
+            case 'hopcroft':
+                return self.hopcroft_partition(dka_dict)
+            case 'moore':
+                return self.moore_partition(dka_dict)
+            case _:
+                raise Exception(f'Nepoznata strategija minimizacije: {self.strategy}')
+
+    # Hopcroftov algoritam za formiranje particije
+    # Radna lista cuva parove (blok, simbol) koji se koriste kao razdvajaci,
+    # a inverzni prelazi daju prethodnike bloka bez prolaska kroz sva stanja.
+    # Nedefinisani prelazi vode u mrtvo stanje koje je u zasebnom pocetnom bloku,
+    # isto kao 'stuck' u Mooreovom algoritmu.
+    # O(m * n log n), gdje je n broj stanja, a m broj simbola u alfabetu
+    def hopcroft_partition(self, dka_dict):
+        states = [state for state in dka_dict if state != 'startingState']
+        alphabet = self.extract_alphabet(dka_dict)
+        dead = len(states)
+        inverse = self.inverse_transitions(dka_dict, states, alphabet)
+
+        index = {state: i for i, state in enumerate(states)}
+        initial = [[index[state] for state in group] for group in self.initial_groups(dka_dict, states)]
+        block_of = [0] * (dead + 1)
+        blocks = []
+        for members in initial + [[dead]]:
+            if members:
+                for state in members:
+                    block_of[state] = len(blocks)
+                blocks.append(set(members))
+
+        # Dovoljno je krenuti od svih pocetnih blokova osim najveceg
+        worklist = deque()
+        in_worklist = set()
+        largest = max(range(len(blocks)), key=lambda b: len(blocks[b]))
+        for block in range(len(blocks)):
+            if block != largest:
+                for symbol in range(len(alphabet)):
+                    worklist.append((block, symbol))
+                    in_worklist.add((block, symbol))
+
+        while worklist:
+            splitter, symbol = worklist.popleft()
+            self.rounds += 1
+            in_worklist.discard((splitter, symbol))
+            touched = self.split_candidates(blocks[splitter], inverse[symbol], block_of)
+            for block, sources in touched.items():
+                if len(sources) == len(blocks[block]):
+                    continue
+                new_block = len(blocks)
+                blocks[block].difference_update(sources)
+                blocks.append(set(sources))
+                for state in sources:
+                    block_of[state] = new_block
+                for other in range(len(alphabet)):
+                    if (block, other) in in_worklist or len(sources) <= len(blocks[block]):
+                        pair = (new_block, other)
+                    else:
+                        pair = (block, other)
+                    worklist.append(pair)
+                    in_worklist.add(pair)
+
+        return self.ordered_partition(blocks, block_of[dead], states, dka_dict)
+
+    # Pocetne grupe stanja: prihvatajuca i ostala, ili po oznakama ako su zadate.
+    # Grupe prihvatajucih stanja su prve, prazne grupe se izostavljaju.
+    # O(n), gdje je n broj stanja
+    def initial_groups(self, dka_dict, states):
+        if self.tags is None:
+            key = lambda state: (not dka_dict[state]['isTerminatingState'],)
+        else:
+            key = lambda state: (not dka_dict[state]['isTerminatingState'], self.tags.get(state, 0))
+        groups = {}
+        for state in states:
+            groups.setdefault(key(state), []).append(state)
+        return [groups[group_key] for group_key in sorted(groups)]
+
+    # Racuna inverzne prelaze: inverse[simbol][stanje] je lista prethodnika
+    # Mrtvo stanje (indeks len(states)) prelazi samo u sebe
+    # O(n * m), gdje je n broj stanja, a m broj simbola u alfabetu
+    def inverse_transitions(self, dka_dict, states, alphabet):
+        index = {state: i for i, state in enumerate(states)}
+        dead = len(states)
+        inverse = []
+        for symbol in alphabet:
+            predecessors = [[] for _ in range(dead + 1)]
+            for i, state in enumerate(states):
+                predecessors[index.get(dka_dict[state].get(symbol), dead)].append(i)
+            predecessors[dead].append(dead)
+            inverse.append(predecessors)
+        return inverse
+
+    # Grupise prethodnike razdvajaca po blokovima kojima pripadaju
+    # O(k), gdje je k broj prelaza koji ulaze u razdvajac
+    def split_candidates(self, splitter, predecessors, block_of):
+        touched = {}
+        for target in splitter:
+            for source in predecessors[target]:
+                touched.setdefault(block_of[source], []).append(source)
+        return touched
+
+    # Izbacuje blok mrtvog stanja i vraca grupe imena stanja u stabilnom redosledu:
+    # prvo prihvatajuce grupe, zatim ostale, a unutar toga po prvom stanju grupe
+    # O(n), gdje je n broj stanja
+    def ordered_partition(self, blocks, dead_block, states, dka_dict):
+        ordered = []
+        for block, members in enumerate(blocks):
+            if block == dead_block or not members:
+                continue
+            first = min(members)
+            ordered.append((not dka_dict[states[first]]['isTerminatingState'], first, members))
+        ordered.sort(key=lambda item: item[:2])
+        return [set(states[state] for state in members) for _, _, members in ordered]
+
+    # Mooreov algoritam, cuva se kao referentna implementacija
+    # O(n^2 * m), gdje je n broj stanja, a m broj prelaza po stanju
+    def moore_partition(self, dka_dict):
+        partition = [set(group) for group in self.initial_groups(dka_dict, self.states)]
         
         while True:
+            self.rounds += 1
             new_partition = self.refine_partition(dka_dict, partition)
             if new_partition == partition:
                 break
@@ -101,12 +227,7 @@ class DKAMinimizer:
     # Funkcija za pretvaranje minDKA u direkorij
     # O(n*m), gdje je n broj stanja, a m broj prelaza po stanju
     def to_dict(self):
-        newStateNames = {}
-        for state in self.states:
-            for i, group in enumerate(self.partition):
-                if state in group:
-                    newStateNames[state] = i
-                    break
+        newStateNames = self.map_states_to_groups(self.partition)
         dka_dict = {"startingState": str(newStateNames[self.start_state])}
 
         for state in self.states:
@@ -118,6 +239,14 @@ class DKAMinimizer:
         
         return dka_dict
     
+    # Oznake stanja minimalnog DKA (imena kao u to_dict); sva stanja jedne grupe
+    # imaju istu oznaku, pa se uzima oznaka bilo kojeg od njih
+    # O(n), gdje je n broj stanja
+    def to_tags(self):
+        if self.tags is None:
+            raise Exception('Minimizacija nije pozvana sa oznakama stanja')
+        return {str(i): self.tags.get(next(iter(group)), 0) for i, group in enumerate(self.partition)}
+
     # Funkcija za definisanje prelaza
     # O(1)
     def define_transition(self, symbol, dka_dict, newStateNames, state):
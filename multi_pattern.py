@@ -0,0 +1,76 @@
+from compiled_dka import *
+
+# Pravi jedan NKA za vise AST-ova: novo pocetno stanje ima epsilon prelaz u pocetak
+# Thompsonovog fragmenta svakog obrasca, a krajevi fragmenata su prihvatajuca stanja.
+# Vraca NKA i listu zavrsnih stanja (indeks u listi je id obrasca).
+# O(n), gdje je n ukupan broj cvorova u AST-ovima
+def build_multi_nfa(asts):
+    builder = ASTtoNFA(None)
+    builder.reset([], {})
+    start_state = builder.new_state()
+    end_states = []
+    for ast in asts:
+        pattern_start = builder.new_state()
+        pattern_end = builder.new_state()
+        builder.add_edge(start_state, None, pattern_start)
+        builder.construct_from_ast(ast, pattern_start, pattern_end)
+        end_states.append(pattern_end)
+    return builder.finish(start_state, None, end_states), end_states
+
+
+# Klasa za vise obrazaca nad istim alfabetom kompajliranih u jedan DKA
+# Svako stanje DKA nosi oznaku: bitmasku id-ova obrazaca (redni broj u listi patterns)
+# koje prihvata. DKAMinimizer dijeli stanja po tim oznakama, pa minimalni DKA i dalje
+# razlikuje koji obrazac je prepoznat, a jedan prolaz kroz ulaz daje sve obrasce.
+# strategy - strategija minimizacije, kao u DKAMinimizer
+class MultiPatternDFA:
+    def __init__(self, patterns, alphabet, strategy='hopcroft'):
+        self.patterns = list(patterns)
+        asts = [Parser(Lexer(pattern, alphabet).lexer()).parse() for pattern in self.patterns]
+        nka, end_states = build_multi_nfa(asts)
+        converter = NKAtoDKAKonvertor(nka)
+        dfa = converter.convert()
+        dka_dict = dfa.to_dict()
+        tags = {}
+        for state, subset in enumerate(converter.subsets):
+            if state != dfa.dead_state:
+                tags[str(dfa.states_map[state])] = self.tag_of(subset, end_states)
+
+        minimizer = DKAMinimizer(dka_dict, strategy, tags)
+        self.dka = minimizer.to_dict()
+        self.tags = minimizer.to_tags()
+        self.compiled = CompiledDFA(self.dka, alphabet)
+        names = [name for name in self.dka if name != 'startingState']
+        self.state_tags = [self.tags[name] for name in names] + [0]
+
+    # Bitmaska obrazaca cije zavrsno stanje je u skupu stanja NKA
+    # O(p), gdje je p broj obrazaca
+    @staticmethod
+    def tag_of(subset, end_states):
+        tag = 0
+        for pattern_id, end_state in enumerate(end_states):
+            if subset >> end_state & 1:
+                tag |= 1 << pattern_id
+        return tag
+
+    # Bitmaska svih obrazaca koji prihvataju cijeli ulaz, u jednom prolazu
+    # O(m * l), gdje je m duzina ulaza, a l duzina najduzeg simbola
+    def match_mask(self, text):
+        return self.state_tags[self.compiled.final_state(text)]
+
+    # Id-ovi obrazaca koji prihvataju ulaz, rastuce
+    def matches(self, text):
+        return list(bits_of(self.match_mask(text)))
+
+
+# Test primjer
+def main():
+    patterns = ['(a+b)*abb', 'a*b*', '(a+b){3}', 'baa*']
+    multi = MultiPatternDFA(patterns, {'a', 'b'})
+    print(f'{len(patterns)} obrazaca, minimalni DKA ima {len(multi.dka) - 1} stanja')
+    for word in ['abb', 'aab', 'baa', 'b', 'babb']:
+        print(word, [patterns[i] for i in multi.matches(word)])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,188 +1,279 @@
 from parse import *
+from budget import *
 from collections import deque
+from array import array
+
+# Oznaka epsilon prelaza u nizu oznaka
+EPSILON = -1
 
 # Klasa za NFA
 # Predstavlja nedeterministički konačni automat (NFA) s početnim stanjem, završnim stanjem i skupom stanja.
+# Stanja su cijeli brojevi 0..n-1, a prelazi su u CSR obliku: prelazi stanja s
+# su na pozicijama offsets[s]..offsets[s+1]-1 nizova labels i targets.
+# labels sadrzi indeks simbola u listi symbols ili EPSILON.
+# accept_states - prihvatajuca stanja, podrazumevano samo end_state (Thompson);
+# konstrukcije bez jedinstvenog zavrsnog stanja (Glushkov) zadaju skup i end_state None.
 class NKA:
-    def __init__(self, start_state, end_state, states):
+    def __init__(self, start_state, end_state, symbols, offsets, labels, targets, accept_states=None):
         self.start_state = start_state
         self.end_state = end_state
-        self.states = states
-        self.state_mapping = {}
-        self.current_index = 0
+        self.accept_states = frozenset([end_state] if accept_states is None else accept_states)
+        self.symbols = symbols
+        self.offsets = offsets
+        self.labels = labels
+        self.targets = targets
+        self.num_states = len(offsets) - 1
 
-    # Metoda za mapiranje stanja
-    # O(1)
-    def map_state(self, state):
-        if state not in self.state_mapping:
-            self.state_mapping[state] = self.current_index
-            self.current_index += 1
-        return str(self.state_mapping[state])
+    # Vraca parove (simbol, sledece stanje) za dato stanje, simbol je None za epsilon
+    # O(k), gdje je k broj prelaza iz stanja
+    def transitions(self, state):
+        for k in range(self.offsets[state], self.offsets[state + 1]):
+            label = self.labels[k]
+            yield (None if label == EPSILON else self.symbols[label]), self.targets[k]
 
     # Metoda za pretvaranje u dictonary
+    # Imena stanja su njihovi indeksi, pa nema dodatnog mapiranja
     # O(n * m), gdje je n broj stanja, a m broj prelaza po stanju.
     def to_dict(self):
         nfa_representation = {
-            'startingState': self.map_state(self.start_state)
+            'startingState': str(self.start_state)
         }
 
-        for state_name, transitions in self.states.items():
-            state_id = self.map_state(state_name)
-            nfa_representation[state_id] = {
-                'isTerminatingState': state_id == self.map_state(self.end_state)
+        for state in range(self.num_states):
+            state_transitions = {
+                'isTerminatingState': state in self.accept_states
             }
-            for symbol, next_states in transitions.items():
-                transition_symbol = 'epsilon' if symbol == '' else symbol
-                transition_states = [self.map_state(next_state) for next_state in next_states]
-                nfa_representation[state_id][transition_symbol] = transition_states
+            for symbol, next_state in self.transitions(state):
+                transition_symbol = 'epsilon' if symbol is None else symbol
+                state_transitions.setdefault(transition_symbol, []).append(str(next_state))
+            nfa_representation[str(state)] = state_transitions
 
         return nfa_representation
 
 # Klasa za konstrukciju NKA
 # prima listu AST cvorova
 # vraca Nka
-    
+# Stanja i prelazi se dodaju u ravne nizove u jednom prolazu kroz AST:
+# svaki cvor dobija unaprijed zadato pocetno i krajnje stanje i samo dodaje
+# svoja unutrasnja stanja i prelaze, bez kopiranja stanja podstabala.
+# budget - opcioni Budget; broj stanja, procjena memorije i rok se provjeravaju pri
+# svakom novom stanju i prelazu, a prekoracenje baca BudgetExceeded
 class ASTtoNFA:
-    def __init__(self, ast):
+    def __init__(self, ast, budget=None):
         self.ast = ast
+        self.budget = budget
 
-    # O(n), gdje je n broj čvorova u AST-u. Svaka specifična vrsta čvora (LiteralNode, SeqNode, OrNode, itd.) ima stalnu 
-    # vremensku složenost za svoje specifične operacije, pod pretpostavkom da je kominovanje stanja linearno.
+    # O(n), gdje je n broj čvorova u AST-u (plus velicina razvijenih ponavljanja).
     def construct(self):
-        start_state, end_state, states = self.construct_from_ast(self.ast)
-        return NKA(start_state, end_state, states)
+        self.reset([], {})
+        start_state = self.new_state()
+        end_state = self.new_state()
+        self.construct_from_ast(self.ast, start_state, end_state)
+        return self.finish(start_state, end_state)
+
+    # Prazni nizove stanja i prelaza, tabela simbola moze biti dijeljena
+    # fragments - izgradjeni fragmenti ponavljanja po cvoru podstabla, dijele ih
+    # svi graditelji jedne konstrukcije
+    # O(1)
+    def reset(self, symbols, symbol_ids, fragments=None):
+        self.state_count = 0
+        self.symbols = symbols
+        self.symbol_ids = symbol_ids
+        self.fragments = {} if fragments is None else fragments
+        self.edge_sources = array('i')
+        self.edge_labels = array('i')
+        self.edge_targets = array('i')
 
-    def construct_from_ast(self, node):
+    # Utiskuje kopiju fragmenta izmedju start_state i end_state: unutrasnja stanja
+    # dobijaju novi uzastopni blok indeksa, pa je kopija samo pomjeranje indeksa
+    # O(e), gdje je e broj prelaza u fragmentu
+    def stamp_fragment(self, fragment, start_state, end_state):
+        state_count, sources, labels, targets = fragment
+        renumber = [start_state, end_state]
+        renumber.extend(range(self.state_count, self.state_count + state_count - 2))
+        self.state_count += state_count - 2
+        self.edge_sources.extend(array('i', [renumber[state] for state in sources]))
+        self.edge_labels.extend(labels)
+        self.edge_targets.extend(array('i', [renumber[state] for state in targets]))
+        if self.budget is not None:
+            self.budget.check_nfa(self.state_count, len(self.edge_targets))
+
+    # O(1)
+    def new_state(self):
+        self.state_count += 1
+        if self.budget is not None:
+            self.budget.check_nfa(self.state_count, len(self.edge_targets))
+        return self.state_count - 1
+
+    # Dodaje prelaz, simbol None ili 'ε' je epsilon prelaz
+    # O(1)
+    def add_edge(self, source, symbol, target):
+        if symbol is None or symbol == 'ε':
+            label = EPSILON
+        else:
+            label = self.symbol_ids.get(symbol)
+            if label is None:
+                label = len(self.symbols)
+                self.symbol_ids[symbol] = label
+                self.symbols.append(symbol)
+        self.edge_sources.append(source)
+        self.edge_labels.append(label)
+        self.edge_targets.append(target)
+        if self.budget is not None:
+            self.budget.check_nfa(self.state_count, len(self.edge_targets))
+
+    # Slaze prelaze po izvornom stanju (sortiranje prebrojavanjem) u CSR oblik
+    # Redosled prelaza jednog stanja ostaje redosled dodavanja
+    # O(n + e), gdje je n broj stanja, a e broj prelaza
+    def finish(self, start_state, end_state, accept_states=None):
+        offsets = array('i', [0]) * (self.state_count + 1)
+        for source in self.edge_sources:
+            offsets[source + 1] += 1
+        for state in range(self.state_count):
+            offsets[state + 1] += offsets[state]
+        position = offsets[:-1]
+        labels = array('i', [0]) * len(self.edge_labels)
+        targets = array('i', [0]) * len(self.edge_targets)
+        for source, label, target in zip(self.edge_sources, self.edge_labels, self.edge_targets):
+            k = position[source]
+            labels[k] = label
+            targets[k] = target
+            position[source] = k + 1
+        return NKA(start_state, end_state, self.symbols, offsets, labels, targets, accept_states)
+
+    # Gradi fragment za cvor izmedju zadatih stanja start_state i end_state.
+    # Umjesto rekurzije koristi se stek zadataka (graditelj, vrsta, argumenti);
+    # zadaci se skidaju istim redosledom kojim bi ih obisla rekurzija, pa su
+    # numeracija stanja i redosled prelaza isti kao kod rekurzivne konstrukcije.
+    # O(n), gdje je n broj čvorova u AST-u (plus velicina razvijenih ponavljanja).
+    def construct_from_ast(self, node, start_state, end_state):
+        stack = [(self, 'build', (node, start_state, end_state))]
+        while stack:
+            builder, kind, args = stack.pop()
+            match kind:
+                case 'build':
+                    builder.expand(stack, *args)
+                case 'edge':
+                    builder.add_edge(*args)
+                case 'sequence':
+                    builder.sequence_step(stack, *args)
+                case 'repeat':
+                    builder.stamp_repeat(*args)
+
+    # Obradjuje jedan cvor: dodaje njegova stanja i prelaze, a podstabla stavlja na stek
+    # O(k), gdje je k broj podstabala cvora
+    def expand(self, stack, node, start_state, end_state):
         node_type = type(node).__name__
         if node_type == 'LiteralNode':
-            start_state = object()
-            end_state = object()
-            if node.char == 'ε':
-                states = {
-                    start_state: {'': {end_state}},
-                    end_state: {'': set()}
-                }
-                return start_state, end_state, states
-            states = {
-                start_state: {node.char: {end_state}},
-                end_state: {'': set()}
-            }
-            return start_state, end_state, states
+            self.add_edge(start_state, node.char, end_state)
 
         elif node_type == 'SeqNode':
-            left_start, left_end, left_states = self.construct_from_ast(node.left)
-            right_start, right_end, right_states = self.construct_from_ast(node.right)
-            states = {**left_states, **right_states, left_end: {'': {right_start}}}
-            return left_start, right_end, states
+            stack.append((self, 'sequence', (node, 0, start_state, end_state)))
 
+        # Svaka alternativa dobija svoje pocetno i krajnje stanje
         elif node_type == 'OrNode':
-            left_start, left_end, left_states = self.construct_from_ast(node.left)
-            right_start, right_end, right_states = self.construct_from_ast(node.right)
-            start_state = object()
-            end_state = object()
-            states = {
-                start_state: {'': {left_start, right_start}},
-                **left_states, **right_states,
-                left_end: {'': {end_state}},
-                right_end: {'': {end_state}},
-                end_state: {'': set()},
-            }
-            return start_state, end_state, states
+            branch_starts = [self.new_state() for _ in node.children]
+            branch_ends = [self.new_state() for _ in node.children]
+            for branch_start in branch_starts:
+                self.add_edge(start_state, None, branch_start)
+            for branch_end in reversed(branch_ends):
+                stack.append((self, 'edge', (branch_end, None, end_state)))
+            for child, branch_start, branch_end in reversed(list(zip(node.children, branch_starts, branch_ends))):
+                stack.append((self, 'build', (child, branch_start, branch_end)))
 
         elif node_type == 'StarNode':
-            sub_start, sub_end, sub_states = self.construct_from_ast(node.left)
-            start_state = object()
-            end_state = object()
-            states = {
-                start_state: {'': {sub_start, end_state}},
-                **sub_states,
-                sub_end: {'': {start_state, end_state}},
-                end_state: {'': set()}
-            }
-            return start_state, end_state, states
-        
-        elif node_type == 'RepeatExactlyNode':
-            sub_start, sub_final, sub_states = self.construct_from_ast(node.left)
-            num = int(node.num)
+            self.push_star(stack, node.left, start_state, end_state)
 
-            if num == 0:
-                starting_state = object()
-                final_state = object()
-                states = {
-                    starting_state: {'': {final_state}},
-                    final_state: {'': set()}
-                }
-                return starting_state, final_state, states
-
-            starting_state = object()
-            states = {}
-            previous_final = starting_state
-
-            for _ in range(num):
-                current_start, current_final, current_states = self.construct_from_ast(node.left)
-                states.update(current_states)
-                states[previous_final] = {'': {current_start}}
-                previous_final = current_final
+        elif node_type == 'RepeatExactlyNode' and int(node.num) == 0:
+            self.add_edge(start_state, None, end_state)
 
-            final_state = previous_final
-            states[final_state] = {'': set()}
+        # x{0,} je isto sto i x*
+        elif node_type == 'RepeatMinNode' and int(node.min) == 0:
+            self.push_star(stack, node.left, start_state, end_state)
+
+        # Podstablo ponavljanja se gradi jednom, u zasebnom graditelju sa lokalnom
+        # numeracijom (0 je pocetno, 1 krajnje stanje), a zatim se utiskuje potreban broj kopija.
+        # AST je internovan, pa drugo ponavljanje istog podstabla koristi vec izgradjen fragment.
+        elif node_type in ('RepeatExactlyNode', 'RepeatBetweenNode', 'RepeatMinNode'):
+            fragment_builder = self.fragments.get(node.left)
+            if fragment_builder is not None:
+                stack.append((self, 'repeat', (node, start_state, end_state, fragment_builder)))
+                return
+            fragment_builder = type(self)(node.left, self.budget)
+            fragment_builder.reset(self.symbols, self.symbol_ids, self.fragments)
+            self.fragments[node.left] = fragment_builder
+            fragment_start = fragment_builder.new_state()
+            fragment_end = fragment_builder.new_state()
+            stack.append((self, 'repeat', (node, start_state, end_state, fragment_builder)))
+            stack.append((fragment_builder, 'build', (node.left, fragment_start, fragment_end)))
+
+        else:
+            raise Exception("Neocekivan tip AST cvora")
+
+    # Sekvenca od i-tog podstabla nadalje: podstablo i, epsilon prelaz, pa ostatak
+    # O(1)
+    def sequence_step(self, stack, node, i, start_state, end_state):
+        if i == len(node.children) - 1:
+            stack.append((self, 'build', (node.children[i], start_state, end_state)))
+            return
+        left_end = self.new_state()
+        right_start = self.new_state()
+        stack.append((self, 'sequence', (node, i + 1, right_start, end_state)))
+        stack.append((self, 'edge', (left_end, None, right_start)))
+        stack.append((self, 'build', (node.children[i], start_state, left_end)))
+
+    # Kleeneova zvezda oko podstabla
+    # O(1)
+    def push_star(self, stack, node, start_state, end_state):
+        sub_start = self.new_state()
+        sub_end = self.new_state()
+        self.add_edge(start_state, None, sub_start)
+        self.add_edge(start_state, None, end_state)
+        stack.append((self, 'edge', (sub_end, None, end_state)))
+        stack.append((self, 'edge', (sub_end, None, start_state)))
+        stack.append((self, 'build', (node, sub_start, sub_end)))
+
+    # Lanac kopija izgradjenog fragmenta za cvorove ponavljanja
+    # O(k * e), gdje je k broj kopija, a e broj prelaza u fragmentu
+    def stamp_repeat(self, node, start_state, end_state, fragment_builder):
+        fragment = (fragment_builder.state_count, fragment_builder.edge_sources,
+                    fragment_builder.edge_labels, fragment_builder.edge_targets)
+        node_type = type(node).__name__
+        if node_type == 'RepeatExactlyNode':
+            num = int(node.num)
+            previous_final = start_state
+            for i in range(num):
+                current_start = self.new_state()
+                current_final = end_state if i == num - 1 else self.new_state()
+                self.add_edge(previous_final, None, current_start)
+                self.stamp_fragment(fragment, current_start, current_final)
+                previous_final = current_final
 
-            return starting_state, final_state, states
-        
         elif node_type == 'RepeatBetweenNode':
-            sub_start, sub_final, sub_states = self.construct_from_ast(node.left)
-            num = int(node.high)
-
-            starting_state = object()
-            states = {}
-            previous_final = starting_state
-
-            final_state = object()
-            for _ in range(num):
-                current_start, current_final, current_states = self.construct_from_ast(node.left)
-                states.update(current_states)
-                if _ >= int(node.low):
-                    states[previous_final] = {'' : {current_start, final_state}}
-                else:
-                    states[previous_final] = {'': {current_start}}
+            previous_final = start_state
+            for i in range(int(node.high)):
+                current_start = self.new_state()
+                current_final = self.new_state()
+                self.add_edge(previous_final, None, current_start)
+                if i >= int(node.low):
+                    self.add_edge(previous_final, None, end_state)
+                self.stamp_fragment(fragment, current_start, current_final)
                 previous_final = current_final
-                
-            states[previous_final] = {'': {final_state}}
-            states[final_state] = {'': set()}
+            self.add_edge(previous_final, None, end_state)
 
-            return starting_state, final_state, states
-        
         elif node_type == 'RepeatMinNode':
-            sub_start, sub_final, sub_states = self.construct_from_ast(node.left)
-            num = int(node.min)
-
-            if num == 0:
-                starting_state = object()
-                final_state = object()
-                states = {
-                    starting_state: {'': {final_state}},
-                    final_state: {'': set()}
-                }
-                return starting_state, final_state, states
-
-            starting_state = object()
-            states = {}
-            previous_final = starting_state
-            
-            return_back = object()
+            previous_final = start_state
+            return_back = start_state
             # Kreira prvi deo automata koji ponavlja 'num' puta
-            for _ in range(num):
-                current_start, current_final, current_states = self.construct_from_ast(node.left)
-                states.update(current_states)
+            for _ in range(int(node.min)):
+                current_start = self.new_state()
+                current_final = self.new_state()
+                self.add_edge(previous_final, None, current_start)
+                self.stamp_fragment(fragment, current_start, current_final)
                 return_back = current_start
-                states[previous_final] = {'': {current_start}}
                 previous_final = current_final
-
-            final_state = object()
-            states[previous_final] = {'': {return_back, final_state}}
-            states[final_state] = {'': set()}
-
-            return starting_state, final_state, states
+            self.add_edge(previous_final, None, return_back)
+            self.add_edge(previous_final, None, end_state)
 
 # Funkcija za ispis stanja i prelaza za NKA
 # O(n * m), gdje je n broj stanja, a m broj prelaza po stanju
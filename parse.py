@@ -1,85 +1,182 @@
+import weakref
 from lexer import TokenType, Lexer
 
 # Osnovna klasa za sve cvorove
+# Cvorovi su nepromjenljivi i internovani (hash-consing): konstruktor za iste
+# argumente vraca isti objekat, pa su strukturno jednaka podstabla jedan objekat.
+# Hash se racuna jednom, iz tipa i hash-eva podstabala, a jednakost je identitet,
+# pa se cvor moze koristiti kao kljuc za memoizaciju u kasnijim fazama.
+# Kljuc se pravi od normalizovanih argumenata, pa npr. x{2} i x{02} daju isti cvor.
+# Tabela internovanih cvorova ima slabe reference i ne drzi AST u memoriji.
+# pickle i copy ponovo pozivaju konstruktor (vidi __reduce__), pa i kopija je internovan cvor.
 class INode():
-    def __init__(self):
+    __slots__ = ('hash', '__weakref__')
+    fields = ()
+    interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        values = cls.normalize(args)
+        key = (cls, *values)
+        node = INode.interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            for field, value in zip(cls.fields, values):
+                object.__setattr__(node, field, value)
+            object.__setattr__(node, 'hash', hash(key))
+            INode.interned[key] = node
+        return node
+
+    def __init__(self, *args):
         pass
 
+    @classmethod
+    def normalize(cls, args):
+        return args
+
+    def __hash__(self):
+        return self.hash
+
+    def __setattr__(self, name, value):
+        raise Exception('AST cvorovi su nepromjenljivi')
+
+    def __delattr__(self, name):
+        raise Exception('AST cvorovi su nepromjenljivi')
+
+    # Argumenti konstruktora za pickle i copy
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, field) for field in self.fields)
+
+    # Broj internovanih cvorova koji su trenutno zivi
+    @staticmethod
+    def interned_count():
+        return len(INode.interned)
+
+# Osnovna klasa za cvorove sa proizvoljnim brojem podstabala (ILI i sekvenca)
+# left i right daju binarni pogled: prvo podstablo i ostatak liste
+class ListNode(INode):
+    __slots__ = ('children',)
+    fields = ('children',)
+
+    @classmethod
+    def normalize(cls, args):
+        return (args,)
+
+    def __reduce__(self):
+        return type(self), self.children
+
+    @property
+    def left(self):
+        return self.children[0]
+
+    @property
+    def right(self):
+        if len(self.children) == 2:
+            return self.children[1]
+        return type(self)(*self.children[1:])
+
 # Klasa za predstavljanje ILI operacije u AST
-class OrNode(INode):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
+class OrNode(ListNode):
+    __slots__ = ()
 
 # Klasa za predstavljanje sekvence u AST
-class SeqNode(INode):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
+class SeqNode(ListNode):
+    __slots__ = ()
 
 # Klasa za predstavljanje operacije ponavljanja u AST
 class StarNode(INode):
-    def __init__(self, left):
-        self.left = left
+    __slots__ = ('left',)
+    fields = ('left',)
 
 # Klasa za predstavljanje karaktera iz alfabeta u AST
 class LiteralNode(INode):
-    def __init__(self, char):
-        self.char = char
+    __slots__ = ('char',)
+    fields = ('char',)
+
+# Osnovna klasa za operatore ponavljanja; broj ponavljanja se cuva kao int,
+# bez obzira da li je zadat kao int ili kao sadrzaj tokena ('2', '02')
+class RepeatNode(INode):
+    __slots__ = ()
+
+    @classmethod
+    def normalize(cls, args):
+        return (args[0], *(int(count) for count in args[1:]))
 
 # Klasa za predstavljanje operatora ponavljanja tacan broj puta u AST
-class RepeatExactlyNode(INode):
-    def __init__(self, left, num):
-        self.left = left
-        self.num = num
+class RepeatExactlyNode(RepeatNode):
+    __slots__ = ('left', 'num')
+    fields = ('left', 'num')
 
 # Klasa za predstavljanje operatora ponavljanja izmedju granica u AST
-class RepeatBetweenNode(INode):
-    def __init__(self, left, low, high):
-        self.left = left
-        self.low = low
-        self.high = high
+class RepeatBetweenNode(RepeatNode):
+    __slots__ = ('left', 'low', 'high')
+    fields = ('left', 'low', 'high')
 
 # Klasa za predstavljanje operatora ponavljanja minimalan ili veci broj puta u AST
-class RepeatMinNode(INode):
-    def __init__(self, left, min):
-        self.left = left
-        self.min = min
+class RepeatMinNode(RepeatNode):
+    __slots__ = ('left', 'min')
+    fields = ('left', 'min')
 
 # Ispisuje AST s odgovarajućim uvlačenjem.
+# Obilazak koristi eksplicitan stek, pa dubina AST-a nije ogranicena dubinom rekurzije.
 # Asimptotska složenost: O(n), gdje je n broj čvorova u AST-u.
 # idt - uvlacak relevantan samo za ispis
         
 def print_ast(node, idt=0):
-    node_type = type(node).__name__
-    indent_str = ' ' * idt
-    if node_type == 'OrNode':
-        print(f"{indent_str}OR")
-        print_ast(node.left, idt + 2)
-        print_ast(node.right, idt + 2)
-    elif node_type == 'SeqNode':
-        print(f"{indent_str}SEQ")
-        print_ast(node.left, idt + 2)
-        print_ast(node.right, idt + 2)
-    elif node_type == 'StarNode':
-        print(f"{indent_str}STAR")
-        print_ast(node.left, idt + 2)
-    elif node_type == 'LiteralNode':
-        print(f"{indent_str}LITERAL: {node.char}")
-    elif node_type == 'RepeatExactlyNode':
-        print(f"{indent_str}REPEAT_EXACTLY: {node.num}")
-        print_ast(node.left, idt + 2)
-    elif node_type == 'RepeatBetweenNode':
-        print(f"{indent_str}REPEAT_BETWEEN: {node.low}-{node.high}")
-        print_ast(node.left, idt + 2)
-    elif node_type == 'RepeatMinNode':
-        print(f"{indent_str}REPEAT_MIN: {node.min}")
-        print_ast(node.left, idt + 2)
-    else:
-        raise Exception("Neocekivan tip AST cvora")
+    stack = [(node, idt)]
+    while stack:
+        node, idt = stack.pop()
+        node_type = type(node).__name__
+        indent_str = ' ' * idt
+        if node_type == 'OrNode':
+            print(f"{indent_str}OR")
+        elif node_type == 'SeqNode':
+            print(f"{indent_str}SEQ")
+        elif node_type == 'StarNode':
+            print(f"{indent_str}STAR")
+        elif node_type == 'LiteralNode':
+            print(f"{indent_str}LITERAL: {node.char}")
+        elif node_type == 'RepeatExactlyNode':
+            print(f"{indent_str}REPEAT_EXACTLY: {node.num}")
+        elif node_type == 'RepeatBetweenNode':
+            print(f"{indent_str}REPEAT_BETWEEN: {node.low}-{node.high}")
+        elif node_type == 'RepeatMinNode':
+            print(f"{indent_str}REPEAT_MIN: {node.min}")
+        else:
+            raise Exception("Neocekivan tip AST cvora")
+        for child in reversed(children_of(node)):
+            stack.append((child, idt + 2))
+
+# Vraca listu direktnih podstabala cvora
+# O(k), gdje je k broj podstabala
+def children_of(node):
+    if isinstance(node, ListNode):
+        return node.children
+    if isinstance(node, LiteralNode):
+        return []
+    return [node.left]
+
+# Pravi cvor istog tipa i sa istim parametrima kao node, ali sa datim podstablima
+# O(k), gdje je k broj podstabala
+def with_children(node, children):
+    if isinstance(node, ListNode):
+        return type(node)(*children)
+    if isinstance(node, LiteralNode):
+        return node
+    if isinstance(node, StarNode):
+        return StarNode(children[0])
+    if isinstance(node, RepeatExactlyNode):
+        return RepeatExactlyNode(children[0], node.num)
+    if isinstance(node, RepeatBetweenNode):
+        return RepeatBetweenNode(children[0], node.low, node.high)
+    if isinstance(node, RepeatMinNode):
+        return RepeatMinNode(children[0], node.min)
+    raise Exception("Neocekivan tip AST cvora")
 
 # Klasa za parser 
 # Pretvara niz tokena u AST.
+# Parser ne koristi rekurziju: otvorene zagrade se cuvaju na eksplicitnom steku,
+# a svaki nivo pamti zavrsene alternative i faktore tekuce sekvence.
+# Uzastopni faktori daju jedan SeqNode, a alternative jedan OrNode sa listom podstabala.
 class Parser:
     def __init__(self, tokenStream):
         self.tokenStream = tokenStream
@@ -87,39 +184,60 @@ class Parser:
     
     #O(n), gdje je n broj tokena.
     def parse(self) -> INode:
-        ast = self.expression()
-        if self.currToken < len(self.tokenStream):
-            raise Exception("Neocekivan token")
-        return ast
-
-    #O(n), gdje je n broj tokena.
-    def expression(self):
-        left_ast = self.term()
-        if self.check(TokenType.OR):
-            return OrNode(left_ast, self.expression())
-        return left_ast
-    
-    #O(n), gdje je n broj tokena.
-    def term(self):
-        left_ast = self.character()
+        # Svaki nivo je par (alternative, faktori tekuce sekvence)
+        stack = [([], [])]
         while self.currToken < len(self.tokenStream):
+            alternatives, sequence = stack[-1]
             ttype = self.tokenStream[self.currToken].token_type
-            if ttype not in [TokenType.LITERAL, TokenType.OPEN_PAREN]:
-                break
-            right_ast = self.term()
-            left_ast = SeqNode(left_ast, right_ast)
-        return left_ast
+            if ttype == TokenType.LITERAL:
+                self.currToken += 1
+                sequence.append(self.postfix(LiteralNode(self.tokenStream[self.currToken - 1].content)))
+            elif ttype == TokenType.OPEN_PAREN:
+                self.currToken += 1
+                stack.append(([], []))
+            elif not sequence:
+                # Ocekuje se faktor (literal ili zagrada), a stigao je operator
+                raise Exception("Greska u parsiranju")
+            elif ttype == TokenType.OR:
+                self.currToken += 1
+                alternatives.append(self.sequence(sequence))
+                sequence.clear()
+            elif ttype == TokenType.CLOSED_PAREN and len(stack) > 1:
+                self.currToken += 1
+                ast = self.expression(alternatives, sequence)
+                stack.pop()
+                stack[-1][1].append(self.postfix(ast))
+            elif len(stack) > 1:
+                raise Exception(f"Ocekivan token {TokenType.getTokenValue(TokenType.CLOSED_PAREN)}")
+            else:
+                raise Exception("Neocekivan token")
+        if len(stack) > 1:
+            if not stack[-1][1]:
+                raise Exception("Greska u parsiranju")
+            raise Exception(f"Ocekivan token {TokenType.getTokenValue(TokenType.CLOSED_PAREN)}")
+        alternatives, sequence = stack[0]
+        return self.expression(alternatives, sequence)
 
-    #O(n), gdje je n broj tokena.
-    def character(self):
-        ast = None
-        if self.check(TokenType.LITERAL):
-            ast = LiteralNode(self.tokenStream[self.currToken - 1].content)
-        elif self.check(TokenType.OPEN_PAREN):
-            ast = self.expression()
-            self.expect(TokenType.CLOSED_PAREN)
-        else:
+    # Zatvara izraz: alternative i poslednja sekvenca daju OrNode (ili samo sekvencu)
+    # O(k), gdje je k broj alternativa
+    def expression(self, alternatives, sequence):
+        alternatives.append(self.sequence(sequence))
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return OrNode(*alternatives)
+
+    # Zatvara sekvencu faktora, prazna sekvenca je greska
+    # O(k), gdje je k broj faktora
+    def sequence(self, factors):
+        if not factors:
             raise Exception("Greska u parsiranju")
+        if len(factors) == 1:
+            return factors[0]
+        return SeqNode(*factors)
+
+    # Primjenjuje operatore ponavljanja {..} i * na procitani faktor
+    # O(1)
+    def postfix(self, ast):
         if self.check(TokenType.OPEN_BRACE):
             left_ast = ast
             if self.tokenStream[self.currToken].token_type == TokenType.META_CHAR:
@@ -0,0 +1,196 @@
+import time
+import tracemalloc
+from min_dka import *
+from glushkov import ASTtoGlushkovNFA
+from derivatives import ASTtoDerivativeDKA
+from symbol_classes import symbol_classes, compress_ast
+from simplify import simplify_ast
+from reduce_nka import reduce_nka
+
+# Konstrukcije NKA koje se mogu izabrati u pipeline-u
+NFA_CONSTRUCTIONS = {
+    'thompson': ASTtoNFA,
+    'glushkov': ASTtoGlushkovNFA,
+}
+
+# Sve konstrukcije: 'derivatives' gradi DKA direktno iz AST-a, bez NKA
+CONSTRUCTIONS = [*NFA_CONSTRUCTIONS, 'derivatives']
+
+# Broj cvorova AST-a, obilazak sa eksplicitnim stekom
+# O(n), gdje je n broj cvorova
+def count_nodes(ast):
+    count = 0
+    stack = [ast]
+    while stack:
+        count += 1
+        stack.extend(children_of(stack.pop()))
+    return count
+
+
+# Klasa za dogadjaj jedne faze pipeline-a
+# phase - ime faze ('lex', 'parse', 'simplify', 'classes', 'nfa', 'reduce', 'dfa', 'minimize')
+# wall_time, cpu_time - trajanje faze u sekundama (perf_counter i process_time)
+# counts - recnik brojeva za fazu (tokeni, cvorovi AST-a, stanja, koraci rafiniranja)
+# peak_bytes - vrsna memorija faze iz tracemalloc-a, ili None ako se ne mjeri
+class PhaseEvent:
+    def __init__(self, phase, wall_time, cpu_time, counts, peak_bytes=None):
+        self.phase = phase
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.counts = counts
+        self.peak_bytes = peak_bytes
+
+    def to_dict(self):
+        return {
+            'phase': self.phase,
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'counts': self.counts,
+            'peak_bytes': self.peak_bytes,
+        }
+
+
+# Osnovna klasa za hook-ove pipeline-a; hook nasljedjuje klasu i redefinise on_phase
+# trace_memory - ako je True bar za jedan hook, faze se mjere i tracemalloc-om
+class PipelineHook:
+    trace_memory = False
+
+    def on_phase(self, event):
+        pass
+
+
+# Hook koji samo skuplja dogadjaje
+class EventCollector(PipelineHook):
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.events = []
+
+    def on_phase(self, event):
+        self.events.append(event)
+
+
+# Klasa za pipeline: Lexer -> Parser -> NKA -> DKA -> minimalni DKA
+# construction - 'thompson' (podrazumevano), 'glushkov' (NKA bez epsilon prelaza)
+# ili 'derivatives' (DKA direktno pomocu Brzozowskijevih izvoda)
+# hooks - objekti PipelineHook koji dobijaju PhaseEvent posle svake faze.
+# Bez hook-ova faze se pozivaju direktno, bez mjerenja i brojanja.
+# budget - opcioni Budget za konstrukciju NKA i DKA; prekoracenje baca BudgetExceeded
+# simplify - ako je True, AST se prije konstrukcije algebarski pojednostavljuje (faza 'simplify')
+# reduce_nfa - ako je True, NKA se prije determinizacije smanjuje: bez epsilon prelaza,
+#              bez beskorisnih stanja i sa spojenim stanjima istog ponasanja (faza 'reduce')
+class CompilePipeline:
+    def __init__(self, construction='thompson', hooks=(), budget=None, simplify=False, reduce_nfa=False):
+        if construction not in CONSTRUCTIONS:
+            raise Exception(f'Nepoznata konstrukcija: {construction}')
+        self.construction = construction
+        self.hooks = list(hooks)
+        self.budget = budget
+        self.simplify = simplify
+        self.reduce_nfa = reduce_nfa
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    # Pokrece fazu; sa hook-ovima mjeri vrijeme (i memoriju) i salje dogadjaj.
+    # counter racuna brojeve iz rezultata faze, van mjerenog vremena.
+    def run_phase(self, phase, function, counter):
+        if not self.hooks:
+            return function()
+        trace_memory = any(hook.trace_memory for hook in self.hooks)
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = function()
+            cpu_time = time.process_time() - cpu_start
+            wall_time = time.perf_counter() - wall_start
+            peak_bytes = tracemalloc.get_traced_memory()[1] - base if trace_memory else None
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+        event = PhaseEvent(phase, wall_time, cpu_time, counter(result), peak_bytes)
+        for hook in self.hooks:
+            hook.on_phase(event)
+        return result
+
+    # vraca minimalni DKA u obliku recnika
+    # O(2^n * m), gdje je n broj stanja NKA, a m velicina alfabeta
+    def compile(self, regex, alphabet):
+        return self.build(self.parse(regex, alphabet))
+
+    # Kao compile, ali se prije konstrukcije simboli sazimaju u klase ekvivalencije,
+    # pa determinizacija i minimizacija rade nad klasama umjesto nad svim simbolima.
+    # vraca (minimalni DKA nad predstavnicima klasa, recnik simbol -> predstavnik);
+    # oboje se daje CompiledDFA(minDKA, symbol_classes=...) za prepoznavanje
+    # O(2^n * k), gdje je k broj klasa
+    def compile_classes(self, regex, alphabet):
+        AST = self.parse(regex, alphabet)
+        class_of, AST = self.run_phase('classes', lambda: self.compress(AST, alphabet),
+                                       lambda result: {'symbols': len(result[0]), 'classes': len(set(result[0].values()))})
+        return self.build(AST), class_of
+
+    def parse(self, regex, alphabet):
+        tokenStream = self.run_phase('lex', lambda: Lexer(regex, alphabet).lexer(),
+                                     lambda tokens: {'tokens': len(tokens)})
+        AST = self.run_phase('parse', lambda: Parser(tokenStream).parse(),
+                             lambda AST: {'ast_nodes': count_nodes(AST)})
+        if not self.simplify:
+            return AST
+        AST, _ = self.run_phase('simplify', lambda: simplify_ast(AST),
+                                lambda result: {'ast_nodes': count_nodes(result[0]), 'rewrites': result[1]['rewrites'],
+                                                'rounds': result[1]['rounds']})
+        return AST
+
+    def compress(self, AST, alphabet):
+        class_of = symbol_classes(AST, alphabet)
+        return class_of, compress_ast(AST, class_of)
+
+    # Konstrukcija DKA i minimizacija za vec parsiran AST
+    def build(self, AST):
+        if self.construction == 'derivatives':
+            dka = self.run_phase('dfa', lambda: ASTtoDerivativeDKA(AST, budget=self.budget).construct(),
+                                 lambda dka: {'dfa_states': len(dka.states)})
+        else:
+            construction = NFA_CONSTRUCTIONS[self.construction]
+            nka = self.run_phase('nfa', lambda: construction(AST, self.budget).construct(),
+                                 lambda nka: {'nfa_states': nka.num_states, 'nfa_transitions': len(nka.targets)})
+            if self.reduce_nfa:
+                nka, _ = self.run_phase('reduce', lambda: reduce_nka(nka),
+                                        lambda result: {'nfa_states': result[0].num_states, 'nfa_transitions': len(result[0].targets),
+                                                        'merge_rounds': result[1]['merge_rounds']})
+            dka = self.run_phase('dfa', lambda: NKAtoDKAKonvertor(nka, self.budget).convert(),
+                                 lambda dka: {'dfa_states': len(dka.states)})
+        _, minDKA = self.run_phase('minimize', lambda: self.minimize(dka),
+                                   lambda result: {'min_dfa_states': len(result[1]) - 1, 'partition_rounds': result[0].rounds})
+        return minDKA
+
+    def minimize(self, dka):
+        minimizer = DKAMinimizer(dka.to_dict())
+        return minimizer, minimizer.to_dict()
+
+
+# Funkcija koja prolazi kroz sve faze bez hook-ova
+# vraca minimalni DKA u obliku recnika
+# O(2^n * m), gdje je n broj stanja NKA, a m velicina alfabeta
+def compile_regex(regex, alphabet, construction='thompson', budget=None, simplify=False, reduce_nfa=False):
+    return CompilePipeline(construction, budget=budget, simplify=simplify, reduce_nfa=reduce_nfa).compile(regex, alphabet)
+
+
+# Test primjer
+def main():
+    regex = '(a+b)*a(a+b){2}'
+    for construction in CONSTRUCTIONS:
+        collector = EventCollector(trace_memory=True)
+        minDKA = CompilePipeline(construction, [collector]).compile(regex, {'a', 'b'})
+        print(f'{construction}: minimalni DKA za {regex} ima {len(minDKA) - 1} stanja')
+        for event in collector.events:
+            print(f'  {event.phase}: {event.wall_time * 1000:.3f} ms, {event.peak_bytes} B, {event.counts}')
+
+
+if __name__ == "__main__":
+    main()
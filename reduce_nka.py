@@ -0,0 +1,159 @@
+from dka import *
+
+# Klasa za smanjivanje NKA prije podskupovne konstrukcije
+# prima NKA (objekat iz ASTtoNFA ili ASTtoGlushkovNFA)
+# vraca NKA bez epsilon prelaza koji prihvata isti jezik, pa ga NKAtoDKAKonvertor
+# koristi bez izmjena. Koraci:
+#   1. uklanjanje epsilon prelaza: stanje q dobija prelaze svih stanja iz svog
+#      epsilon zatvorenja i prihvata ako zatvorenje sadrzi prihvatajuce stanje;
+#      zadrzavaju se samo stanja dostizna iz pocetnog (pocetno i ciljevi prelaza po simbolu)
+#   2. uklanjanje stanja iz kojih se ne moze stici do prihvatajuceg
+#   3. spajanje stanja sa istim ponasanjem: ista prihvatljivost i isti skupovi ciljeva
+#      po svakom simbolu (ciljevi se porede po vec spojenim klasama), do fiksne tacke
+# Epsilon zatvorenja se racunaju jednom, kao u podskupovnoj konstrukciji (BitsetNKA).
+# stats - brojevi stanja i prelaza prije i posle svakog koraka
+class NKAReducer:
+    def __init__(self, nka):
+        self.nka = nka
+        self.stats = {
+            'states_before': nka.num_states,
+            'transitions_before': len(nka.targets),
+            'epsilon_transitions': sum(1 for label in nka.labels if label == EPSILON),
+        }
+
+    # O(n * c * m + r * e), gdje je c velicina epsilon zatvorenja, m broj prelaza po
+    # stanju, r broj krugova spajanja, a e broj prelaza posle uklanjanja epsilon prelaza
+    def reduce(self):
+        accepting, edges = self.remove_epsilon()
+        self.stats['unreachable_states'] = self.nka.num_states - len(edges)
+        accepting, edges = self.prune(accepting, edges)
+        classes, class_count = self.merge(accepting, edges)
+        self.stats['merged_states'] = len(edges) - class_count
+        return self.build(accepting, edges, classes)
+
+    # Korak 1; vraca listu prihvatljivosti i listu recnika simbol -> lista ciljeva,
+    # sa stanjima prenumerisanim redom otkrivanja (pocetno stanje je 0)
+    # O(n * c * m)
+    def remove_epsilon(self):
+        bits = BitsetNKA(self.nka)
+        number = {bits.start: 0}
+        order = [bits.start]
+        accepting = []
+        moves = []
+        for state in order:
+            closure = bits.closures[state]
+            accepting.append(closure & bits.accept_mask != 0)
+            state_moves = bits.move_all(closure)
+            for mask in state_moves.values():
+                for target in bits_of(mask):
+                    if target not in number:
+                        number[target] = len(order)
+                        order.append(target)
+            moves.append(state_moves)
+        edges = [{symbol: sorted(number[target] for target in bits_of(mask)) for symbol, mask in state_moves.items()}
+                 for state_moves in moves]
+        return accepting, edges
+
+    # Korak 2: zadrzava stanja iz kojih je prihvatajuce stanje dostizno (pocetno uvijek)
+    # O(n + e)
+    def prune(self, accepting, edges):
+        predecessors = [[] for _ in edges]
+        for state, state_edges in enumerate(edges):
+            for targets in state_edges.values():
+                for target in targets:
+                    predecessors[target].append(state)
+        useful = [False] * len(edges)
+        queue = deque(state for state, accepts in enumerate(accepting) if accepts)
+        for state in queue:
+            useful[state] = True
+        while queue:
+            for predecessor in predecessors[queue.popleft()]:
+                if not useful[predecessor]:
+                    useful[predecessor] = True
+                    queue.append(predecessor)
+        useful[0] = True
+        kept = [state for state in range(len(edges)) if useful[state]]
+        self.stats['dead_states'] = len(edges) - len(kept)
+        number = {state: i for i, state in enumerate(kept)}
+        pruned = []
+        for state in kept:
+            state_edges = {}
+            for symbol, targets in edges[state].items():
+                targets = [number[target] for target in targets if useful[target]]
+                if targets:
+                    state_edges[symbol] = targets
+            pruned.append(state_edges)
+        return [accepting[state] for state in kept], pruned
+
+    # Korak 3: svako stanje pocinje u svojoj klasi; u svakom krugu stanja sa istim
+    # potpisom (prihvatljivost, simbol -> skup klasa ciljeva) dobijaju istu klasu.
+    # Klase se samo spajaju, pa se staje kada se broj klasa ne promijeni.
+    # vraca (klasa svakog stanja, broj klasa)
+    # O(r * e log e)
+    def merge(self, accepting, edges):
+        classes = list(range(len(edges)))
+        class_count = len(edges)
+        rounds = 0
+        while True:
+            rounds += 1
+            signatures = {}
+            new_classes = []
+            for state, state_edges in enumerate(edges):
+                signature = (accepting[state], tuple(sorted(
+                    (symbol, tuple(sorted({classes[target] for target in targets})))
+                    for symbol, targets in state_edges.items())))
+                new_classes.append(signatures.setdefault(signature, len(signatures)))
+            if len(signatures) == class_count:
+                self.stats['merge_rounds'] = rounds
+                return classes, class_count
+            classes = new_classes
+            class_count = len(signatures)
+
+    # Pravi NKA od klasa; klase se numerisu redom otkrivanja iz pocetne, a prelazi
+    # se dodaju redom simbola iz originalnog NKA
+    # O(n + e)
+    def build(self, accepting, edges, classes):
+        representative = {}
+        for state in range(len(edges)):
+            representative.setdefault(classes[state], state)
+        builder = ASTtoNFA(None)
+        builder.reset(list(self.nka.symbols), {symbol: i for i, symbol in enumerate(self.nka.symbols)})
+        number = {classes[0]: builder.new_state()}
+        queue = deque([classes[0]])
+        accept_states = set()
+        while queue:
+            current = queue.popleft()
+            state = representative[current]
+            if accepting[state]:
+                accept_states.add(number[current])
+            for symbol in sorted(edges[state], key=builder.symbol_ids.get):
+                for target_class in sorted({classes[target] for target in edges[state][symbol]}):
+                    if target_class not in number:
+                        number[target_class] = builder.new_state()
+                        queue.append(target_class)
+                    builder.add_edge(number[current], symbol, number[target_class])
+        reduced = builder.finish(0, None, accept_states)
+        self.stats['states_after'] = reduced.num_states
+        self.stats['transitions_after'] = len(reduced.targets)
+        return reduced
+
+
+# Smanjuje NKA; vraca (smanjen NKA, statistika)
+def reduce_nka(nka):
+    reducer = NKAReducer(nka)
+    reduced = reducer.reduce()
+    return reduced, reducer.stats
+
+
+# Test primjer
+def main():
+    alphabet = {'a', 'b', 'c'}
+    for regex in ['ab+cb', '(a+b)*a(a+b){3}', 'εa{3,6}bε']:
+        AST = Parser(Lexer(regex, alphabet).lexer()).parse()
+        reduced, stats = reduce_nka(ASTtoNFA(AST).construct())
+        print(f'{regex}: {stats}')
+        ilustrate_nka(reduced.to_dict())
+
+
+if __name__ == "__main__":
+    main()
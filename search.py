@@ -0,0 +1,173 @@
+from compiled_dka import *
+
+# Id za karakter koji nije simbol alfabeta (razdvaja pogotke, ne moze biti u pogotku)
+UNKNOWN = -1
+
+# Pravi obrnut NKA sa Σ* prefiksom: prelazi su obrnuti, novo pocetno stanje ima petlju
+# po svakom simbolu alfabeta i epsilon prelaz u svako prihvatajuce stanje originala,
+# a prihvatajuce stanje je pocetno stanje originala. Citanjem obrnutog teksta od kraja
+# do pozicije s, NKA prihvata tacno kada neka rijec jezika pocinje na poziciji s.
+# O(n + e + m), gdje je n broj stanja, e broj prelaza, a m velicina alfabeta
+def reverse_nfa(nka, alphabet):
+    builder = ASTtoNFA(None)
+    builder.reset(list(nka.symbols), {symbol: i for i, symbol in enumerate(nka.symbols)})
+    builder.state_count = nka.num_states
+    for state in range(nka.num_states):
+        for symbol, next_state in nka.transitions(state):
+            builder.add_edge(next_state, symbol, state)
+    loop_state = builder.new_state()
+    for symbol in sorted(set(alphabet) - {'ε'}):
+        builder.add_edge(loop_state, symbol, loop_state)
+    for accept_state in sorted(nka.accept_states):
+        builder.add_edge(loop_state, None, accept_state)
+    return builder.finish(loop_state, nka.start_state)
+
+
+# Pravi podskupovni DKA (bez minimizacije) i kompajlira ga; vraca CompiledDFA i, za
+# svako njegovo stanje, skup stanja NKA (bitset) koji to stanje predstavlja.
+# Mrtvo stanje predstavlja prazan skup.
+# O(2^n * m), gdje je n broj stanja NKA, a m velicina alfabeta
+def compile_with_subsets(nka, alphabet):
+    konvertor = NKAtoDKAKonvertor(nka)
+    dka = konvertor.convert()
+    dka_dict = dka.to_dict()
+    compiled = CompiledDFA(dka_dict, alphabet)
+    state_of = {str(number): state for state, number in dka.states_map.items()}
+    subsets = [konvertor.subsets[state_of[name]] for name in dka_dict if name != 'startingState']
+    subsets.append(0)
+    return compiled, subsets
+
+
+# Klasa za pretragu teksta (bez sidrenja): pronalazi sve pogotke koji se ne preklapaju,
+# najlijevije-najduze, kao (pocetak, kraj) pozicije karaktera u tekstu.
+# Tekst se jednom tokenizuje (najduzim poklapanjem simbola, karakteri van alfabeta su
+# UNKNOWN), pa se prolazi dva puta:
+#   1. unazad, DKA za Σ* rev(R) napravljenim od obrnutog Thompsonovog NKA; u jednom
+#      linearnom prolazu oznacava sve pozicije na kojima pocinje neki pogodak i pamti
+#      stanje za svaku poziciju. Stanje na poziciji i je skup stanja NKA iz kojih
+#      neki dio teksta koji pocinje na i vodi u prihvatajuce stanje.
+#   2. unaprijed, od najlijevijeg oznacenog pocetka, DKA za R trazi najduzi kraj.
+#      Prije svakog tokena provjerava se da li skup stanja NKA unaprijed sijece skup
+#      iz prolaza unazad; ako ne sijece, nijedan pogodak iz tog pocetka ne zavrsava
+#      dalje, pa se staje. Prolaz unaprijed zato ne cita tokene iza kraja pogotka
+#      (najvise jedan), a pretraga se nastavlja od kraja pogotka, pa je ukupan rad linearan.
+# Oba DKA su podskupovna (bez minimizacije), jer provjera presjeka treba skupove stanja NKA.
+class Searcher:
+    def __init__(self, regex, alphabet):
+        tokenStream = Lexer(regex, alphabet).lexer()
+        AST = Parser(tokenStream).parse()
+        nka = ASTtoNFA(AST).construct()
+        self.forward, self.forward_subsets = compile_with_subsets(nka, alphabet)
+        self.backward, self.backward_subsets = compile_with_subsets(reverse_nfa(nka, alphabet), alphabet)
+        if self.forward.symbols != self.backward.symbols:
+            raise Exception('DKA za pretragu unaprijed i unazad nemaju iste simbole')
+        self.extend_cache = {}
+
+    # Tokenizuje tekst; vraca id-ove simbola i pozicije njihovih pocetaka (plus kraj teksta)
+    # O(m * l), gdje je m duzina teksta, a l duzina najduzeg simbola
+    def tokenize(self, text):
+        trie = self.forward.trie
+        symbol_ids = self.forward.symbol_ids
+        ids = array('i')
+        bounds = array('i')
+        pos = 0
+        while pos < len(text):
+            end = trie.longest_match(text, pos)
+            symbol_id = symbol_ids.get(text[pos:end]) if end > pos else None
+            bounds.append(pos)
+            if symbol_id is None:
+                ids.append(UNKNOWN)
+                pos += 1
+            else:
+                ids.append(symbol_id)
+                pos = end
+        bounds.append(len(text))
+        return ids, bounds
+
+    # Prolaz unazad: starts[i] je 1 ako neki pogodak pocinje na tokenu i, a rows[i] je
+    # red DKA unazad posle citanja tokena od kraja do i (rows[len(ids)] je pocetni red).
+    # Karakter van alfabeta vraca DKA u pocetno stanje (Σ* petlja je jedina koja ga prezivi)
+    # O(t), gdje je t broj tokena
+    def match_starts(self, ids):
+        dfa = self.backward
+        table = dfa.table
+        stride = dfa.stride
+        starts = bytearray(len(ids) + 1)
+        rows = array('i', [dfa.start_row]) * (len(ids) + 1)
+        row = dfa.start_row
+        starts[len(ids)] = dfa.is_accepting(row // stride)
+        for i in range(len(ids) - 1, -1, -1):
+            symbol_id = ids[i]
+            row = dfa.start_row if symbol_id == UNKNOWN else table[row + symbol_id]
+            starts[i] = dfa.is_accepting(row // stride)
+            rows[i] = row
+        return starts, rows
+
+    # Da li se iz stanja unaprijed (red forward_row) moze stici u prihvatajuce stanje
+    # citajuci tekst od pozicije ciji je red unazad backward_row; pamti se po paru redova
+    # O(n / 64) prvi put, O(1) nakon toga, gdje je n broj stanja NKA
+    def can_extend(self, forward_row, backward_row):
+        key = (forward_row, backward_row)
+        result = self.extend_cache.get(key)
+        if result is None:
+            forward_subset = self.forward_subsets[forward_row // self.forward.stride]
+            backward_subset = self.backward_subsets[backward_row // self.backward.stride]
+            result = self.extend_cache[key] = forward_subset & backward_subset != 0
+        return result
+
+    # Najduzi pogodak sidren na tokenu start; vraca indeks tokena na kojem se zavrsava.
+    # Token i se cita samo ako neki pogodak iz start zavrsava na i ili kasnije.
+    # O(e - start + 1), gdje je e kraj najduzeg pogotka
+    def longest_end(self, ids, rows, start):
+        dfa = self.forward
+        table = dfa.table
+        stride = dfa.stride
+        row = dfa.start_row
+        last = start if dfa.is_accepting(row // stride) else -1
+        for i in range(start, len(ids)):
+            symbol_id = ids[i]
+            if symbol_id == UNKNOWN or not self.can_extend(row, rows[i]):
+                break
+            row = table[row + symbol_id]
+            if dfa.is_accepting(row // stride):
+                last = i + 1
+        return last
+
+    # Generator pogodaka (pocetak, kraj) u tekstu, slijeva nadesno, bez preklapanja.
+    # Prazan pogodak se prijavljuje kao (i, i), nakon njega pretraga ide na sledeci token.
+    # Svaki token se u prolazu unaprijed cita najvise dva puta (u pogotku i jednom iza njega).
+    # O(m * l + t), gdje je t broj tokena
+    def finditer(self, text):
+        ids, bounds = self.tokenize(text)
+        starts, rows = self.match_starts(ids)
+        pos = 0
+        while True:
+            start = starts.find(1, pos)
+            if start == -1:
+                return
+            end = self.longest_end(ids, rows, start)
+            yield bounds[start], bounds[end]
+            pos = end if end > start else start + 1
+
+    # Svi pogoci kao lista (pocetak, kraj)
+    def find_all(self, text):
+        return list(self.finditer(text))
+
+    # Prvi (najlijeviji-najduzi) pogodak ili None
+    def search(self, text):
+        return next(self.finditer(text), None)
+
+
+# Test primjer
+def main():
+    alphabet = {'a', 'b', 'c'}
+    regex = 'ab*c+ba'
+    text = 'xxabbbc ac abcba ba'
+    searcher = Searcher(regex, alphabet)
+    print(f'pogoci za {regex} u {text!r}:')
+    for start, end in searcher.finditer(text):
+        print(f'  [{start}, {end}) {text[start:end]!r}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+from parse import *
+
+EPSILON = LiteralNode('ε')
+
+
+def is_epsilon(node):
+    return node is EPSILON
+
+# Broj razlicitih cvorova AST-a; zajednicka (internovana) podstabla se broje jednom
+# O(n), gdje je n broj razlicitih cvorova
+def distinct_nodes(ast):
+    seen = {ast}
+    stack = [ast]
+    while stack:
+        for child in children_of(stack.pop()):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return len(seen)
+
+
+# Klasa za algebarsko pojednostavljivanje AST-a prije konstrukcije NKA.
+# Pravila cuvaju jezik i primjenjuju se odozdo nagore dok se AST ne prestane mijenjati:
+#   seq_flatten      (xy)z -> xyz                 or_flatten     (x+y)+z -> x+y+z
+#   seq_epsilon      xεy -> xy                     or_duplicate   x+y+x -> x+y
+#   single_child     sekvenca/unija sa jednim podstablom -> podstablo
+#   or_epsilon       ε+x -> x, ako x prihvata ε
+#   star_star        (x*)* -> x*                   star_epsilon   ε* -> ε
+#   star_or_epsilon  (ε+x)* -> x*                  star_repeat    (x{0,})*, (x{1,h})* -> x*
+#   repeat_zero      x{0}, x{0,0} -> ε             repeat_one     x{1}, x{1,1} -> x
+#   repeat_epsilon   ε{n}, ε{l,h}, ε{n,} -> ε      repeat_exact   x{n,n} -> x{n}
+#   repeat_min_star  x{0,} -> x*                   repeat_of_star (x*){n}, (x*){l,h}, (x*){n,} -> x*
+#   repeat_nested    (x{m}){n} -> x{mn}, (x{l,h}){n} -> x{nl,nh},
+#                    (x{m,}){n} -> x{mn,}, (x{m,}){n,} -> x{mn,}
+# Cvorovi su internovani, pa se nepromijenjeno podstablo prepoznaje po identitetu,
+# a svako razlicito podstablo se obradjuje jednom po prolazu.
+# changes - recnik ime pravila -> broj primjena, rounds - broj prolaza
+class ASTSimplifier:
+    def __init__(self, ast):
+        self.ast = ast
+        self.changes = {}
+        self.rounds = 0
+        self.nullable_memo = {}
+
+    # Prolazi kroz AST dok se ne dostigne fiksna tacka; vraca pojednostavljen AST
+    # O(r * n), gdje je r broj prolaza, a n broj razlicitih cvorova
+    def simplify(self):
+        ast = self.ast
+        while True:
+            self.rounds += 1
+            simplified = self.rewrite_pass(ast)
+            if simplified is ast:
+                return ast
+            ast = simplified
+
+    # Izvjestaj o izmjenama: broj prolaza, primjene pravila i broj razlicitih cvorova
+    def report(self, simplified):
+        return {
+            'rounds': self.rounds,
+            'rewrites': sum(self.changes.values()),
+            'rules': dict(sorted(self.changes.items())),
+            'nodes_before': distinct_nodes(self.ast),
+            'nodes_after': distinct_nodes(simplified),
+        }
+
+    # Jedan prolaz u postorderu sa eksplicitnim stekom
+    # O(n)
+    def rewrite_pass(self, ast):
+        memo = {}
+        stack = [(ast, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node in memo:
+                continue
+            children = children_of(node)
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children) if child not in memo)
+                continue
+            result = with_children(node, [memo[child] for child in children])
+            while True:
+                rewritten = self.rewrite(result)
+                if rewritten is result:
+                    break
+                result = rewritten
+            memo[node] = result
+        return memo[ast]
+
+    def applied(self, rule, result):
+        self.changes[rule] = self.changes.get(rule, 0) + 1
+        return result
+
+    # Primjenjuje prvo pravilo koje odgovara cvoru; vraca isti cvor ako nijedno ne odgovara
+    # O(k), gdje je k broj podstabala
+    def rewrite(self, node):
+        if isinstance(node, SeqNode):
+            return self.rewrite_seq(node)
+        if isinstance(node, OrNode):
+            return self.rewrite_or(node)
+        if isinstance(node, StarNode):
+            return self.rewrite_star(node)
+        if isinstance(node, (RepeatExactlyNode, RepeatBetweenNode, RepeatMinNode)):
+            return self.rewrite_repeat(node)
+        return node
+
+    def rewrite_seq(self, node):
+        if len(node.children) == 1:
+            return self.applied('single_child', node.children[0])
+        if any(isinstance(child, SeqNode) for child in node.children):
+            children = []
+            for child in node.children:
+                children.extend(child.children if isinstance(child, SeqNode) else [child])
+            return self.applied('seq_flatten', SeqNode(*children))
+        if any(is_epsilon(child) for child in node.children):
+            children = [child for child in node.children if not is_epsilon(child)]
+            if not children:
+                return self.applied('seq_epsilon', EPSILON)
+            return self.applied('seq_epsilon', children[0] if len(children) == 1 else SeqNode(*children))
+        return node
+
+    def rewrite_or(self, node):
+        if len(node.children) == 1:
+            return self.applied('single_child', node.children[0])
+        if any(isinstance(child, OrNode) for child in node.children):
+            children = []
+            for child in node.children:
+                children.extend(child.children if isinstance(child, OrNode) else [child])
+            return self.applied('or_flatten', OrNode(*children))
+        children = list(dict.fromkeys(node.children))
+        if len(children) < len(node.children):
+            return self.applied('or_duplicate', OrNode(*children))
+        if EPSILON in children and any(self.nullable(child) for child in children if not is_epsilon(child)):
+            children.remove(EPSILON)
+            return self.applied('or_epsilon', OrNode(*children))
+        return node
+
+    def rewrite_star(self, node):
+        child = node.left
+        if isinstance(child, StarNode):
+            return self.applied('star_star', child)
+        if is_epsilon(child):
+            return self.applied('star_epsilon', EPSILON)
+        if isinstance(child, OrNode) and EPSILON in child.children:
+            children = [alternative for alternative in child.children if not is_epsilon(alternative)]
+            return self.applied('star_or_epsilon', StarNode(children[0] if len(children) == 1 else OrNode(*children)))
+        if isinstance(child, RepeatMinNode) and child.min <= 1:
+            return self.applied('star_repeat', StarNode(child.left))
+        if isinstance(child, RepeatBetweenNode) and child.low <= 1 and child.high >= 1:
+            return self.applied('star_repeat', StarNode(child.left))
+        return node
+
+    def rewrite_repeat(self, node):
+        child = node.left
+        low, high = repeat_bounds(node)
+        if high == 0:
+            return self.applied('repeat_zero', EPSILON)
+        if is_epsilon(child):
+            return self.applied('repeat_epsilon', EPSILON)
+        if low == 1 and high == 1:
+            return self.applied('repeat_one', child)
+        if isinstance(node, RepeatBetweenNode) and low == high:
+            return self.applied('repeat_exact', RepeatExactlyNode(child, node.low))
+        if isinstance(node, RepeatMinNode) and low == 0:
+            return self.applied('repeat_min_star', StarNode(child))
+        if isinstance(child, StarNode):
+            return self.applied('repeat_of_star', child)
+        return self.fold_nested(node, child)
+
+    # Spaja ugnijezdena ponavljanja: broj ponavljanja x je zbir n brojeva iz intervala
+    # unutrasnjeg ponavljanja, pa je spoj ispravan samo kada je taj skup zbirova interval
+    def fold_nested(self, node, child):
+        if isinstance(node, RepeatBetweenNode) or not isinstance(child, (RepeatExactlyNode, RepeatBetweenNode, RepeatMinNode)):
+            return node
+        n = node.num if isinstance(node, RepeatExactlyNode) else node.min
+        inner_low, inner_high = repeat_bounds(child)
+        if isinstance(node, RepeatExactlyNode):
+            if inner_high is None:
+                return self.applied('repeat_nested', RepeatMinNode(child.left, n * inner_low))
+            if inner_low == inner_high:
+                return self.applied('repeat_nested', RepeatExactlyNode(child.left, n * inner_low))
+            return self.applied('repeat_nested', RepeatBetweenNode(child.left, n * inner_low, n * inner_high))
+        if inner_high is None:
+            return self.applied('repeat_nested', RepeatMinNode(child.left, n * inner_low))
+        return node
+
+    # Da li podstablo prihvata prazan string; pamti se po (internovanom) cvoru
+    # O(n) ukupno za sve pozive
+    def nullable(self, node):
+        memo = self.nullable_memo
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in memo:
+                stack.pop()
+                continue
+            pending = [child for child in children_of(current) if child not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if isinstance(current, LiteralNode):
+                memo[current] = is_epsilon(current)
+            elif isinstance(current, SeqNode):
+                memo[current] = all(memo[child] for child in current.children)
+            elif isinstance(current, OrNode):
+                memo[current] = any(memo[child] for child in current.children)
+            elif isinstance(current, StarNode):
+                memo[current] = True
+            else:
+                memo[current] = repeat_bounds(current)[0] == 0 or memo[current.left]
+        return memo[node]
+
+
+# Granice ponavljanja kao brojevi (low, high); high je None za x{n,}
+def repeat_bounds(node):
+    if isinstance(node, RepeatExactlyNode):
+        return node.num, node.num
+    if isinstance(node, RepeatBetweenNode):
+        return node.low, node.high
+    return node.min, None
+
+# Pojednostavljuje AST; vraca (pojednostavljen AST, izvjestaj)
+def simplify_ast(ast):
+    simplifier = ASTSimplifier(ast)
+    simplified = simplifier.simplify()
+    return simplified, simplifier.report(simplified)
+
+
+# Test primjer
+def main():
+    alphabet = {'a', 'b', 'd', 'STOP'}
+    for regex in ['εa{3,6}bdSTOPε', '((a*)*){2,}b', '(a+b+a){1}(b{2}){3}', 'a{0}b(ε+a*)']:
+        AST = Parser(Lexer(regex, alphabet).lexer()).parse()
+        simplified, report = simplify_ast(AST)
+        print(f'{regex}: {report}')
+        print_ast(simplified)
+
+
+if __name__ == "__main__":
+    main()
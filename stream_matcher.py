@@ -0,0 +1,119 @@
+from compiled_dka import *
+
+# Klasa za prepoznavanje ulaza koji stize u dijelovima (npr. iz pipe-a ili velikog fajla)
+# Prima minimalni DKA (recnik koji vraca DKAMinimizer.to_dict()) ili vec kompajliran
+# CompiledDFA/MappedDFA. Izmedju poziva feed() pamti samo trenutno stanje DKA i
+# neobradjeni kraj ulaza: ako dio moze biti pocetak duzeg visekarakternog simbola
+# (npr. 'ST' kada postoje 'ST' i 'STOP'), ceka se sledeci dio. Rezultat je isti kao
+# kada bi se cijeli ulaz prepoznao odjednom (najduze poklapanje simbola).
+class StreamMatcher:
+    def __init__(self, dka, alphabet=None):
+        self.dfa = dka if isinstance(dka, CompiledDFA) else CompiledDFA(dka, alphabet)
+        self.dead_row = self.dfa.dead_state * self.dfa.stride
+        self.reset()
+
+    # Vraca prepoznavanje na pocetak
+    # O(1)
+    def reset(self):
+        self.row = self.dfa.start_row
+        self.pending = ''
+        self.consumed = 0
+
+    # Trenutno stanje DKA (bez neobradjenog kraja ulaza)
+    @property
+    def state(self):
+        return self.row // self.dfa.stride
+
+    # Da li je ulaz odbijen bez obzira na nastavak
+    def is_dead(self):
+        return self.row == self.dead_row
+
+    # Obradjuje sledeci dio ulaza
+    # O(c * l), gdje je c duzina dijela, a l duzina najduzeg simbola
+    def feed(self, chunk):
+        self.consumed += len(chunk)
+        if self.row == self.dead_row:
+            return
+        if self.dfa.single_char:
+            self.row = self.advance_chars(self.row, chunk)
+            return
+        text = self.pending + chunk
+        self.row, pos = self.advance(self.row, text, final=False)
+        self.pending = text[pos:]
+
+    # Da li bi ulaz bio prihvacen kada bi se ovdje zavrsio.
+    # Neobradjeni kraj se obradjuje probno, stanje matcher-a se ne mijenja.
+    # O(l)
+    def is_accepting(self):
+        row = self.row
+        if self.pending:
+            row, _ = self.advance(row, self.pending, final=True)
+        return self.dfa.is_accepting(row // self.dfa.stride)
+
+    # Stanje matcher-a kao nepromjenljiva torka koja se moze sacuvati (npr. pickle-om)
+    # i kasnije vratiti pomocu restore(); vazi za isti DKA
+    # O(1)
+    def snapshot(self):
+        return (self.state, self.pending, self.consumed)
+
+    # O(1)
+    def restore(self, snapshot):
+        state, pending, consumed = snapshot
+        if not 0 <= state < self.dfa.state_count:
+            raise Exception(f'Nepostojece stanje DKA: {state}')
+        self.row = state * self.dfa.stride
+        self.pending = pending
+        self.consumed = consumed
+
+    # Prelazi za alfabet ciji su svi simboli jedan karakter
+    # O(c)
+    def advance_chars(self, row, text):
+        table = self.dfa.table
+        ids = self.dfa.symbol_ids
+        for char in text:
+            symbol_id = ids.get(char)
+            if symbol_id is None:
+                return self.dead_row
+            row = table[row + symbol_id]
+            if row == self.dead_row:
+                return row
+        return row
+
+    # Prelazi za visekarakterne simbole. Ako final nije True, a tekst se zavrsava
+    # usred moguceg simbola, obrada staje i vraca se pozicija od koje treba nastaviti.
+    # O(c * l)
+    def advance(self, row, text, final):
+        table = self.dfa.table
+        ids = self.dfa.symbol_ids
+        trie = self.dfa.trie
+        pos = 0
+        while pos < len(text):
+            end, open_ended = trie.longest_match_partial(text, pos)
+            if open_ended and not final:
+                return row, pos
+            symbol_id = ids.get(text[pos:end]) if end > pos else None
+            if symbol_id is None:
+                return self.dead_row, len(text)
+            row = table[row + symbol_id]
+            if row == self.dead_row:
+                return row, len(text)
+            pos = end
+        return row, pos
+
+
+# Test primjer
+def main():
+    alphabet = {'START', 'AB', 'STOP', 'ST'}
+    regex = 'START(AB)*STOP+ST'
+    rl = Lexer(regex, alphabet)
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct()
+    dka = NKAtoDKAKonvertor(nka).convert().to_dict()
+    matcher = StreamMatcher(DKAMinimizer(dka).to_dict(), alphabet)
+    for chunk in ['ST', 'AR', 'TA', 'BAB', 'ST', 'OP']:
+        matcher.feed(chunk)
+        print(f'{chunk!r}: stanje {matcher.state}, neobradjeno {matcher.pending!r}, prihvata {matcher.is_accepting()}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from parse import *
+
+# Skupovi literala koje AST razlikuje: svaki samostalan literal je jednoclan skup, a
+# literali koji su direktna podstabla istog ILI cvora cine jedan skup (a+b+cd daje {a, b}).
+# ε nije simbol alfabeta i ne ulazi ni u jedan skup.
+# O(n), gdje je n broj cvorova u AST-u
+def literal_sets(ast):
+    sets = []
+    stack = [(ast, False)]
+    while stack:
+        node, in_union = stack.pop()
+        if isinstance(node, LiteralNode):
+            if not in_union and node.char != 'ε':
+                sets.append({node.char})
+            continue
+        if isinstance(node, OrNode):
+            literals = {child.char for child in node.children if isinstance(child, LiteralNode) and child.char != 'ε'}
+            if literals:
+                sets.append(literals)
+            stack.extend((child, True) for child in node.children)
+        else:
+            stack.extend((child, False) for child in children_of(node))
+    return sets
+
+# Klase ekvivalencije simbola: dva simbola su u istoj klasi ako ih svaki skup literala
+# iz AST-a sadrzi oba ili nijedan, pa zamjena jednog drugim ne mijenja jezik.
+# Simboli alfabeta koji se ne pojavljuju u izrazu cine jednu klasu.
+# Vraca recnik simbol -> predstavnik klase (najmanji simbol klase).
+# O(s + m log m), gdje je s ukupna velicina skupova, a m velicina alfabeta
+def symbol_classes(ast, alphabet):
+    signatures = {symbol: [] for symbol in set(alphabet) - {'ε'}}
+    for set_id, literals in enumerate(literal_sets(ast)):
+        for symbol in literals:
+            signatures.setdefault(symbol, []).append(set_id)
+    classes = {}
+    for symbol in sorted(signatures):
+        classes.setdefault(tuple(signatures[symbol]), []).append(symbol)
+    return {symbol: members[0] for members in classes.values() for symbol in members}
+
+# Prepisuje AST tako da svaki literal postane predstavnik svoje klase. Skup literala
+# ILI cvora je unija cijelih klasa, pa se zamjenjuje predstavnicima tih klasa bez
+# ponavljanja (za 1000 simbola iste klase ostaje jedna grana).
+# O(n), gdje je n broj cvorova u AST-u
+def compress_ast(ast, class_of):
+    results = []
+    stack = [(ast, False)]
+    while stack:
+        node, children_done = stack.pop()
+        children = children_of(node)
+        if children and not children_done:
+            stack.append((node, True))
+            for child in reversed(children):
+                stack.append((child, False))
+            continue
+        new_children = results[len(results) - len(children):]
+        del results[len(results) - len(children):]
+        if isinstance(node, LiteralNode):
+            results.append(node if node.char == 'ε' else LiteralNode(class_of[node.char]))
+        elif isinstance(node, OrNode):
+            kept = []
+            seen = set()
+            for child in new_children:
+                if isinstance(child, LiteralNode):
+                    if child.char in seen:
+                        continue
+                    seen.add(child.char)
+                kept.append(child)
+            results.append(kept[0] if len(kept) == 1 else OrNode(*kept))
+        else:
+            results.append(with_children(node, new_children))
+    return results[0]
+
+
+# Test primjer
+def main():
+    alphabet = {f'S{i}' for i in range(100)}
+    regex = '(' + '+'.join(sorted(alphabet)) + ')*S7'
+    AST = Parser(Lexer(regex, alphabet).lexer()).parse()
+    class_of = symbol_classes(AST, alphabet)
+    print(f'{len(alphabet)} simbola, {len(set(class_of.values()))} klase')
+    print_ast(compress_ast(AST, class_of))
+
+
+if __name__ == "__main__":
+    main()
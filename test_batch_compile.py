@@ -0,0 +1,68 @@
+import itertools
+import json
+import pytest
+from batch_compile import compile_batch, read_records, main
+from pipeline import compile_regex
+
+RECORDS = [
+    (1, 'εa{7,6}', {'a'}),
+    (2, 'a{2,6}*b+cde{2,4}', {'a', 'b', 'c', 'd', 'e'}),
+    (3, 'εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'}),
+    (4, 'STa*Bg{1,2}eε', {'ST', 'a', 'Bg', 'e'}),
+    (5, 'ab', {'a'}),
+    (6, '(a+b)*a(a+b){2}', {'a', 'b'}),
+]
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 1), (1, 4), (2, 1), (2, 4)])
+def test_compile_batch_keeps_order_and_errors(workers, chunk_size):
+    results = list(compile_batch(RECORDS, workers=workers, chunk_size=chunk_size))
+    assert [result.index for result in results] == [index for index, _, _ in RECORDS]
+    for result, (_, regex, alphabet) in zip(results, RECORDS):
+        try:
+            expected = compile_regex(regex, alphabet)
+        except Exception as e:
+            assert not result.ok() and result.error == str(e)
+        else:
+            assert result.ok() and result.dka == expected
+
+def test_compile_batch_reads_input_lazily():
+    consumed = 0
+    def records():
+        nonlocal consumed
+        for index in itertools.count():
+            consumed += 1
+            yield index, 'ab*', {'a', 'b'}
+    results = compile_batch(records(), workers=2, chunk_size=1)
+    first = list(itertools.islice(results, 3))
+    assert [result.index for result in first] == [0, 1, 2]
+    # najvise 2 * workers paketa unaprijed, plus paketi koji su vec vraceni
+    assert consumed <= 3 + 2 * 2
+    results.close()
+
+def test_compile_batch_invalid_arguments():
+    with pytest.raises(Exception, match='Nepoznata konstrukcija'):
+        list(compile_batch(RECORDS, construction='antimirov'))
+    with pytest.raises(Exception, match='Velicina paketa'):
+        list(compile_batch(RECORDS, chunk_size=0))
+
+def test_read_records():
+    lines = ['# komentar\n', 'ab\ta b\n', '\n', 'START(AB)*\tSTART AB\n', 'bez alfabeta\n']
+    assert list(read_records(lines)) == [
+        (2, 'ab', {'a', 'b'}),
+        (4, 'START(AB)*', {'START', 'AB'}),
+        (5, 'bez alfabeta', None),
+    ]
+
+def test_cli(tmp_path):
+    source = tmp_path / 'rules.txt'
+    source.write_text('(a+b)*abb\ta b\nab\ta\nbez alfabeta\n', encoding='utf-8')
+    target = tmp_path / 'out.jsonl'
+    assert main([str(source), '-o', str(target), '-j', '1', '--chunk-size', '2']) == 1
+    lines = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+    assert [line['line'] for line in lines] == [1, 2, 3]
+    assert lines[0]['states'] == 4
+    assert 'Ovaj karakter nije u alfabetu' in lines[1]['error']
+    assert 'Zapis nema alfabet' in lines[2]['error']
+
+if __name__ == "__main__":
+    pytest.main()
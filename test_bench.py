@@ -0,0 +1,32 @@
+import json
+import pytest
+from bench import FAMILIES, PHASES, run_benchmarks, main
+from lexer import Lexer
+from parse import Parser
+
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_families_are_valid_regexes(family):
+    build, sizes = FAMILIES[family]
+    regex, alphabet = build(sizes[0])
+    Parser(Lexer(regex, alphabet).lexer()).parse()
+
+def test_report_shape():
+    report = run_benchmarks(['sigma_star_suffix', 'multichar_alphabet'], [3], repeat=1)
+    assert [result['family'] for result in report['results']] == ['sigma_star_suffix', 'multichar_alphabet']
+    result = report['results'][0]
+    assert list(result['seconds']) == list(result['peak_bytes']) == PHASES
+    assert result['min_dfa_states'] == 2 ** 4
+    assert result['nfa_states'] > 0 and result['dfa_states'] >= result['min_dfa_states']
+
+def test_unknown_family():
+    with pytest.raises(Exception, match='Nepoznata familija'):
+        run_benchmarks(['nema'], [1])
+
+def test_cli_writes_json(tmp_path):
+    output = tmp_path / 'bench_output.txt'
+    main(['-f', 'nested_stars', '-n', '2', '-r', '1', '-o', str(output)])
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['results'][0]['n'] == 2
+
+if __name__ == "__main__":
+    pytest.main()
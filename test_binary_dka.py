@@ -0,0 +1,52 @@
+import pytest
+from binary_dka import MappedDFA, to_bytes, write_dfa, HEADER
+from compiled_dka import CompiledDFA, PAD
+from helpers import build_min_dka, words_over
+
+CASES = [
+    ('(a+b)*abb+b', {'a', 'b'}),
+    ('START(AB)*STOP', {'START', 'AB', 'STOP'}),
+    ('εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'}),
+    ('ε', {'a'}),
+]
+
+@pytest.mark.parametrize("regex, alphabet", CASES)
+def test_mapped_file_matches_compiled(tmp_path, regex, alphabet):
+    _, min_dka = build_min_dka(regex, alphabet)
+    compiled = CompiledDFA(min_dka, alphabet)
+    path = tmp_path / 'dka.bin'
+    write_dfa(min_dka, path, alphabet)
+    with MappedDFA(path) as mapped:
+        assert mapped.symbols == compiled.symbols
+        assert list(mapped.table) == list(compiled.table)
+        for word in list(words_over(alphabet, 5)) + ['x', 'ab' * 20]:
+            assert mapped.match(word) == compiled.match(word)
+
+def test_table_is_a_view_into_the_buffer():
+    _, min_dka = build_min_dka('(a+b)*abb', {'a', 'b'})
+    data = bytearray(to_bytes(min_dka))
+    mapped = MappedDFA(data)
+    assert mapped.table.obj is data
+    assert to_bytes(mapped) == bytes(data)
+
+def test_mapped_batch_matching():
+    pytest.importorskip('numpy')
+    _, min_dka = build_min_dka('(a+b)*abb+b', {'a', 'b'})
+    mapped = MappedDFA(to_bytes(min_dka))
+    rows = [[0, 1, 1], [1, PAD, PAD], [0, 0, PAD], [PAD, PAD, PAD]]
+    assert list(mapped.match_batch(rows)) == list(mapped.match_batch(rows, use_numpy=False)) == [True, True, False, False]
+
+def test_invalid_data():
+    _, min_dka = build_min_dka('ab', {'a', 'b'})
+    data = to_bytes(min_dka)
+    with pytest.raises(Exception, match='prekratak za zaglavlje'):
+        MappedDFA(data[:HEADER.size - 1])
+    with pytest.raises(Exception, match='nije u binarnom formatu'):
+        MappedDFA(b'XXXX' + data[4:])
+    with pytest.raises(Exception, match='Nepodrzana verzija'):
+        MappedDFA(data[:4] + b'\x63\x00' + data[6:])
+    with pytest.raises(Exception, match='prekratak za tabelu'):
+        MappedDFA(data[:-4])
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,74 @@
+import pytest
+from budget import Budget, BudgetExceeded
+from pipeline import compile_regex, CONSTRUCTIONS
+from lazy_dka import LazyDKA
+from dka import NKAtoDKAKonvertor, ASTtoNFA
+from derivatives import ASTtoDerivativeDKA
+from helpers import parse_regex
+
+@pytest.mark.parametrize("construction", CONSTRUCTIONS)
+def test_dfa_state_limit(construction):
+    with pytest.raises(BudgetExceeded) as error:
+        compile_regex('(a+b)*a(a+b){10}', {'a', 'b'}, construction, Budget(max_dfa_states=100))
+    assert error.value.resource == 'max_dfa_states'
+    assert error.value.phase == 'dfa'
+    assert error.value.progress['dfa_states'] == 101
+    assert 'Prekoracen budzet max_dfa_states=100' in str(error.value)
+
+@pytest.mark.parametrize("construction", ['thompson', 'glushkov'])
+def test_nfa_state_limit(construction):
+    with pytest.raises(BudgetExceeded) as error:
+        compile_regex('(ab){1000}', {'a', 'b'}, construction, Budget(max_nfa_states=500))
+    assert error.value.phase == 'nfa'
+    assert error.value.progress['nfa_states'] > 500
+
+def test_byte_limit():
+    with pytest.raises(BudgetExceeded) as error:
+        compile_regex('(a+b)*a(a+b){12}', {'a', 'b'}, budget=Budget(max_bytes=100_000))
+    assert error.value.resource == 'max_bytes'
+    assert error.value.phase == 'dfa'
+    assert error.value.progress['bytes'] > 100_000
+
+def test_deadline():
+    with pytest.raises(BudgetExceeded) as error:
+        compile_regex('a*b', {'a', 'b'}, budget=Budget(time_limit=-1))
+    assert error.value.resource == 'time_limit'
+    assert error.value.phase == 'nfa'
+    assert error.value.progress['seconds'] >= 0
+
+@pytest.mark.parametrize("construction", CONSTRUCTIONS)
+def test_generous_budget_does_not_change_result(construction):
+    budget = Budget(max_nfa_states=10_000, max_dfa_states=10_000, max_bytes=10**8, time_limit=60)
+    regex = 'εa{3,6}bdSTOPε'
+    alphabet = {'a', 'b', 'd', 'STOP'}
+    assert compile_regex(regex, alphabet, construction, budget) == compile_regex(regex, alphabet, construction)
+
+def test_glushkov_follow_pairs_are_budgeted():
+    regex = '(' + '+'.join(['a', 'b'] * 1000) + ')*'
+    with pytest.raises(BudgetExceeded) as error:
+        compile_regex(regex, {'a', 'b'}, 'glushkov', Budget(max_bytes=100_000))
+    assert error.value.phase == 'nfa'
+    # prekinuto dok se pravi follow skup (2000 * 2000 parova), a ne posle
+    assert error.value.progress['nfa_transitions'] < 20_000
+
+def test_derivative_is_budgeted():
+    words = ['abcd', 'bcda', 'cdab', 'dabc'] * 50
+    regex = '+'.join(word[:i] + word * (i + 1) for i, word in enumerate(words))
+    builder = ASTtoDerivativeDKA(parse_regex(regex, {'a', 'b', 'c', 'd'}))
+    builder.budget = Budget(max_bytes=builder.estimated_bytes() + 10 * 150)
+    with pytest.raises(BudgetExceeded) as error:
+        builder.construct()
+    assert error.value.resource == 'max_bytes'
+    # prekinuto unutar prvog izvoda, prije nego sto je dodato novo stanje DKA
+    assert 'terms' in error.value.progress and 'dfa_states' not in error.value.progress
+
+def test_fallback_to_lazy_matching():
+    nka = ASTtoNFA(parse_regex('(a+b)*a(a+b){14}', {'a', 'b'})).construct()
+    with pytest.raises(BudgetExceeded):
+        NKAtoDKAKonvertor(nka, Budget(max_dfa_states=1000))
+    lazy = LazyDKA(nka, max_states=64)
+    assert lazy.execute('b' + 'a' * 15)
+    assert not lazy.execute('b' * 15)
+
+if __name__ == "__main__":
+    pytest.main()
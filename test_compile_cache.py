@@ -0,0 +1,106 @@
+import json
+import os
+import pytest
+import compile_cache
+from compile_cache import CompileCache, cache_key
+from pipeline import compile_regex, CompilePipeline, CONSTRUCTIONS
+from budget import Budget, BudgetExceeded
+
+def test_key_is_normalized():
+    assert cache_key('ab', {'a', 'b'}) == cache_key('ab', ['b', 'a', 'ε'])
+    assert cache_key('ab', {'a', 'b'}) != cache_key('ab', {'a', 'b', 'c'})
+    assert cache_key('ab', {'a', 'b'}) != cache_key('ab', {'a', 'b'}, 'glushkov')
+    assert cache_key('ab', {'a', 'b'}) != cache_key('ba', {'a', 'b'})
+
+def test_key_covers_every_option():
+    options = [{}, {'construction': 'glushkov'}, {'simplify': True}, {'reduce_nfa': True}, {'classes': True},
+               {'simplify': True, 'reduce_nfa': True}]
+    keys = {cache_key('ab', {'a', 'b'}, **option) for option in options}
+    assert len(keys) == len(options)
+
+@pytest.mark.parametrize("construction", CONSTRUCTIONS)
+def test_options_are_passed_through(construction):
+    regex, alphabet = 'ε((a*)*){2,}(b+b){1}a{2,3}', {'a', 'b'}
+    cache = CompileCache()
+    for simplify in (False, True):
+        for reduce_nfa in (False, True):
+            expected = compile_regex(regex, alphabet, construction, simplify=simplify, reduce_nfa=reduce_nfa)
+            for _ in range(2):
+                assert cache.compile(regex, alphabet, construction, simplify=simplify, reduce_nfa=reduce_nfa) == expected
+    assert (cache.hits, cache.misses) == (4, 4)
+
+def test_budget_is_passed_through():
+    cache = CompileCache()
+    with pytest.raises(BudgetExceeded):
+        cache.compile('(a+b)*a(a+b){10}', {'a', 'b'}, budget=Budget(max_dfa_states=100))
+    assert len(cache) == 0
+
+def test_classes_are_cached(tmp_path):
+    alphabet = {'a', 'b', 'c', 'd'}
+    expected = CompilePipeline(simplify=True).compile_classes('(a+b+c)*d', alphabet)
+    CompileCache(directory=tmp_path).compile_classes('(a+b+c)*d', alphabet, simplify=True)
+    cache = CompileCache(directory=tmp_path)
+    assert cache.compile_classes('(a+b+c)*d', alphabet, simplify=True) == expected
+    assert cache.compile('(a+b+c)*d', alphabet, simplify=True) == compile_regex('(a+b+c)*d', alphabet, simplify=True)
+    assert (cache.disk_hits, cache.misses) == (1, 1)
+
+def test_hit_returns_equal_copy():
+    cache = CompileCache()
+    first = cache.compile('(a+b)*abb', {'a', 'b'})
+    first['startingState'] = 'izmijenjeno'
+    second = cache.compile('(a+b)*abb', {'a', 'b'})
+    assert second == compile_regex('(a+b)*abb', {'a', 'b'})
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_lru_evicts_by_entries():
+    cache = CompileCache(max_entries=2)
+    cache.compile('a', {'a', 'b'})
+    cache.compile('b', {'a', 'b'})
+    cache.compile('a', {'a', 'b'})
+    cache.compile('ab', {'a', 'b'})
+    assert cache_key('a', {'a', 'b'}) in cache
+    assert cache_key('b', {'a', 'b'}) not in cache
+    assert len(cache) == 2
+
+def test_lru_evicts_by_bytes():
+    size = len(json.dumps(compile_regex('a', {'a', 'b'})).encode('utf-8'))
+    cache = CompileCache(max_bytes=size)
+    cache.compile('a', {'a', 'b'})
+    assert cache.size == size
+    cache.compile('b', {'a', 'b'})
+    assert len(cache) == 1 and cache.size <= size
+    cache.compile('(a+b)*a(a+b){5}', {'a', 'b'})
+    assert cache_key('(a+b)*a(a+b){5}', {'a', 'b'}) not in cache
+
+def test_errors_are_not_cached():
+    cache = CompileCache()
+    for _ in range(2):
+        with pytest.raises(Exception, match='Ovaj karakter nije u alfabetu'):
+            cache.compile('ab', {'a'})
+    assert len(cache) == 0
+
+def test_disk_store(tmp_path):
+    expected = compile_regex('(a+b)*abb', {'a', 'b'})
+    CompileCache(directory=tmp_path).compile('(a+b)*abb', {'a', 'b'})
+    assert [name for name in os.listdir(tmp_path)] == [cache_key('(a+b)*abb', {'a', 'b'}) + '.json']
+    cache = CompileCache(directory=tmp_path)
+    assert cache.compile('(a+b)*abb', {'a', 'b'}) == expected
+    assert (cache.disk_hits, cache.misses) == (1, 0)
+
+def test_disk_ignores_stale_and_corrupt(tmp_path):
+    CompileCache(directory=tmp_path).compile('a*b', {'a', 'b'})
+    key = cache_key('a*b', {'a', 'b'})
+    path = tmp_path / (key + '.json')
+    artifact = json.loads(path.read_text(encoding='utf-8'))
+    artifact['version'] = compile_cache.CACHE_VERSION - 1
+    path.write_text(json.dumps(artifact), encoding='utf-8')
+    cache = CompileCache(directory=tmp_path)
+    assert cache.compile('a*b', {'a', 'b'}) == compile_regex('a*b', {'a', 'b'})
+    assert (cache.disk_hits, cache.misses) == (0, 1)
+    assert json.loads(path.read_text(encoding='utf-8'))['version'] == compile_cache.CACHE_VERSION
+
+    path.write_text('{"version": ', encoding='utf-8')
+    assert CompileCache(directory=tmp_path).get(key) is None
+
+if __name__ == "__main__":
+    pytest.main()
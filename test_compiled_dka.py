@@ -0,0 +1,92 @@
+import itertools
+import pytest
+from parse import *
+from dka import DKA
+from compiled_dka import CompiledDFA, PAD
+from helpers import build_min_dka
+
+@pytest.mark.parametrize("regex", ['(a+b)*abb', 'a{2,4}b*', '(ab+ba)*', '(ε+a)b'])
+def test_compiled_matches_execute(regex):
+    dka, min_dka = build_min_dka(regex, {'a', 'b'})
+    compiled = CompiledDFA(min_dka, {'a', 'b'})
+    for length in range(8):
+        for word in itertools.product('ab', repeat=length):
+            word = ''.join(word)
+            assert compiled.match(word) == dka.execute(word)
+            assert compiled.match_symbols(compiled.tokenize(word)) == dka.execute(word)
+
+def test_compiled_table_layout():
+    _, min_dka = build_min_dka('ab', {'a', 'b', 'c'})
+    compiled = CompiledDFA(min_dka, {'a', 'b', 'c'})
+    assert compiled.symbols == ['a', 'b', 'c']
+    assert compiled.state_count == 4
+    assert len(compiled.table) == 4 * 3
+    dead = compiled.dead_state
+    assert all(compiled.next_state(dead, symbol_id) == dead for symbol_id in range(3))
+    start = compiled.start_row // compiled.stride
+    assert compiled.next_state(start, compiled.symbol_ids['c']) == dead
+
+def test_compiled_multi_character_symbols():
+    alphabet = {'START', 'AB', 'STOP', 'A'}
+    _, min_dka = build_min_dka('START(AB+A)*STOP', alphabet)
+    compiled = CompiledDFA(min_dka, alphabet)
+    assert compiled.match('STARTSTOP') == True
+    assert compiled.match('STARTABAABSTOP') == True
+    assert compiled.match('STARTAB') == False
+    assert compiled.match('STARTXSTOP') == False
+    assert compiled.tokenize('STARTABA').tolist() == [compiled.symbol_ids[s] for s in ['START', 'AB', 'A']]
+    assert compiled.tokenize('STARX') is None
+
+def test_missing_transition_rejects():
+    dka = DKA({'a', 'b'}, {'q0', 'q1'}, 'q0', {'q1'}, {'q0': {'a': 'q1'}, 'q1': {}})
+    assert dka.execute('a') == True
+    assert dka.execute('ab') == False
+    assert dka.execute('b') == False
+    compiled = CompiledDFA(dka.to_dict())
+    assert compiled.match('ab') == False
+    assert compiled.match('c') == False
+
+def batch_inputs(compiled):
+    words = [''.join(word) for length in range(6) for word in itertools.product('ab', repeat=length)]
+    rows = [compiled.tokenize(word).tolist() for word in words]
+    width = max(len(row) for row in rows)
+    padded = [row + [PAD] * (width - len(row)) for row in rows]
+    return words, rows, padded
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_match_batch(use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    dka, min_dka = build_min_dka('(a+b)*abb+b', {'a', 'b'})
+    compiled = CompiledDFA(min_dka, {'a', 'b'})
+    words, rows, padded = batch_inputs(compiled)
+    expected = [dka.execute(word) for word in words]
+    assert list(compiled.match_batch(padded, use_numpy=use_numpy)) == expected
+
+    flat = [symbol_id for row in rows for symbol_id in row]
+    offsets = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(row))
+    assert list(compiled.match_ragged(flat, offsets, use_numpy=use_numpy)) == expected
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_match_batch_empty(use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    _, min_dka = build_min_dka('a', {'a'})
+    compiled = CompiledDFA(min_dka)
+    for result in [compiled.match_batch([], use_numpy=use_numpy),
+                   compiled.match_ragged([], [], use_numpy=use_numpy),
+                   compiled.match_ragged([], [0], use_numpy=use_numpy)]:
+        assert len(result) == 0
+        if use_numpy:
+            assert result.dtype == bool
+
+def test_match_batch_rejects_non_matrix():
+    np = pytest.importorskip('numpy')
+    _, min_dka = build_min_dka('a', {'a'})
+    with pytest.raises(Exception, match='dvodimenzionalni'):
+        CompiledDFA(min_dka).match_batch(np.zeros(3, dtype=int))
+
+if __name__ == '__main__':
+    pytest.main()
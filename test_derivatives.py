@@ -0,0 +1,72 @@
+import itertools
+import pytest
+from parse import *
+from dka import NKAtoDKAKonvertor, ASTtoNFA
+from min_dka import DKAMinimizer
+from derivatives import ASTtoDerivativeDKA, EMPTY, EPS
+from helpers import parse_regex
+
+@pytest.mark.parametrize("regex", [
+    'a', 'ε', 'ab+a', '(a+b)*abb', '(a*)*b', '(ε+a)(b+ε)', 'a{3}', 'a{0}b',
+    '(ab){1,3}', '(a+ε){2,4}b', 'a{0,}b', '(ab+b){2,}', '((a+b){2})*', 'a*b*a*',
+])
+def test_derivatives_match_subset_construction(regex):
+    ast = parse_regex(regex, {'a', 'b'})
+    derivative_dka = ASTtoDerivativeDKA(ast, {'a', 'b'})
+    dfa = derivative_dka.construct()
+    reference = NKAtoDKAKonvertor(ASTtoNFA(ast).construct())
+    for length in range(7):
+        for word in itertools.product('ab', repeat=length):
+            expected = reference.bitset_nka.is_terminating(subset_after(reference, word))
+            assert derivative_dka.execute(word) == expected
+            assert run(dfa, word) == expected
+
+def subset_after(converter, word):
+    bitset_nka = converter.bitset_nka
+    subset = bitset_nka.closure(1 << bitset_nka.start)
+    for symbol in word:
+        subset = bitset_nka.closure(bitset_nka.move(subset, symbol))
+    return subset
+
+def run(dfa, word):
+    state = dfa.starting_state
+    for symbol in word:
+        state = dfa.transition_function[state][symbol]
+    return state in dfa.accept_states
+
+def test_smart_constructors():
+    derivative_dka = ASTtoDerivativeDKA(parse_regex('a', {'a'}))
+    a = derivative_dka.symbol('a')
+    b = derivative_dka.symbol('b')
+    assert derivative_dka.alt([a, b]) == derivative_dka.alt([b, a, a, EMPTY])
+    assert derivative_dka.alt([a, derivative_dka.alt([b, a])]) == derivative_dka.alt([a, b])
+    assert derivative_dka.cat(EPS, a) == a
+    assert derivative_dka.cat(a, EMPTY) == EMPTY
+    assert derivative_dka.cat(derivative_dka.cat(a, b), a) == derivative_dka.cat(a, derivative_dka.cat(b, a))
+    assert derivative_dka.star(derivative_dka.star(a)) == derivative_dka.star(a)
+    assert derivative_dka.repeat(a, 0, None) == derivative_dka.star(a)
+    assert derivative_dka.repeat(a, 2, 0) == EPS
+
+def test_bounded_repeat_is_near_minimal():
+    ast = parse_regex('(ab+c){50,200}', {'a', 'b', 'c'})
+    dka = ASTtoDerivativeDKA(ast).construct().to_dict()
+    minimal = DKAMinimizer(dka).to_dict()
+    assert len(dka) == len(minimal)
+
+def test_lazy_execution_builds_only_visited_terms():
+    derivative_dka = ASTtoDerivativeDKA(parse_regex('(a+b)*a(a+b){20}', {'a', 'b'}))
+    assert derivative_dka.execute('a' + 'b' * 20) == True
+    assert derivative_dka.execute('b' * 30) == False
+    assert len(derivative_dka.terms) < 100
+
+def test_many_nullable_factors_without_recursion():
+    ast = parse_regex('a*' * 3000 + 'b', {'a', 'b'})
+    builder = ASTtoDerivativeDKA(ast)
+    dka = builder.construct()
+    expected = NKAtoDKAKonvertor(ASTtoNFA(ast).construct()).convert()
+    assert DKAMinimizer(dka.to_dict()).to_dict() == DKAMinimizer(expected.to_dict()).to_dict()
+    for word, expected in [('b', True), ('a' * 5000 + 'b', True), ('ab' + 'a', False), ('', False)]:
+        assert builder.execute(word) == expected
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,6 +1,6 @@
 import pytest
 from parse import *
-from dka import DKA, NKAtoDKAKonvertor, ASTtoNFA
+from dka import DKA, NKAtoDKAKonvertor, ASTtoNFA, BitsetNKA, bits_of
 
 def test_dka_execute():
     alphabet = {'a', 'b'}
@@ -59,5 +59,95 @@ def test_nka_move():
     assert move_states == frozenset({'4'}) or move_states == frozenset()
 
 
+def test_bits_of():
+    assert list(bits_of(0)) == []
+    assert list(bits_of(0b101001)) == [0, 3, 5]
+
+def test_bitset_nka_closure_and_move():
+    nka = {
+        'startingState': '0',
+        '0': {'isTerminatingState': False, 'epsilon': ['1', '2']},
+        '1': {'isTerminatingState': False, 'a': ['3']},
+        '2': {'isTerminatingState': False, 'epsilon': ['0'], 'b': ['3']},
+        '3': {'isTerminatingState': True},
+    }
+    bitset_nka = BitsetNKA(nka)
+    start = bitset_nka.closure(1 << bitset_nka.start)
+    assert bitset_nka.to_names(start) == frozenset({'0', '1', '2'})
+    assert bitset_nka.to_names(bitset_nka.move(start, 'a')) == frozenset({'3'})
+    assert bitset_nka.move_all(start) == {'a': 1 << 3, 'b': 1 << 3}
+    assert bitset_nka.is_terminating(1 << 3)
+    assert bitset_nka.alphabet == {'a', 'b'}
+
+def test_dka_states_are_interned_ids():
+    regex = '(a+b)*abb'
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct().to_dict()
+    converter = NKAtoDKAKonvertor(nka)
+    dfa = converter.convert()
+    assert converter.convert() is dfa
+    assert dfa.starting_state == 0
+    assert dfa.states == list(range(len(dfa.states)))
+    assert len(set(converter.subsets)) == len(converter.subsets)
+    assert dfa.dead_state is None
+    assert dfa.execute('aabb') == True
+    assert dfa.execute('abba') == False
+
+def test_dead_state_is_not_exported():
+    regex = 'ab'
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct().to_dict()
+    dfa = NKAtoDKAKonvertor(nka).convert()
+    assert dfa.dead_state is not None
+    assert dfa.execute('ba') == False
+    dka = dfa.to_dict()
+    assert len(dka) - 1 == 3
+    assert all('b' not in dka[state] for state in dka if state != 'startingState' and 'a' in dka[state])
+
+
+def naive_closure(nka, state):
+    closure = {state}
+    queue = [state]
+    while queue:
+        for next_state in nka[queue.pop()].get('epsilon', []):
+            if next_state not in closure:
+                closure.add(next_state)
+                queue.append(next_state)
+    return frozenset(closure)
+
+@pytest.mark.parametrize("regex", ['(a*)*', '((a+ε)*b*)*a{2,}', '(a+b)*a(a+b){3}', 'ε(ε*)*'])
+def test_closure_table_matches_bfs(regex):
+    rl = Lexer(regex, {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct().to_dict()
+    bitset_nka = BitsetNKA(nka)
+    for state in bitset_nka.names:
+        closure = bitset_nka.to_names(bitset_nka.closures[bitset_nka.index[state]])
+        assert closure == naive_closure(nka, state)
+
+def test_closure_cache():
+    nka = {
+        'startingState': '0',
+        '0': {'isTerminatingState': False, 'epsilon': ['1']},
+        '1': {'isTerminatingState': True, 'epsilon': ['0']},
+    }
+    bitset_nka = BitsetNKA(nka)
+    assert bitset_nka.closures == [0b11, 0b11]
+    assert bitset_nka.closure(0b01) == 0b11
+    assert bitset_nka.closure_cache == {0b01: 0b11}
+
+
+def test_converter_accepts_compact_nka():
+    rl = Lexer('(a+b)*a{2,3}', {'a', 'b'})
+    AST = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(AST).construct()
+    from_compact = NKAtoDKAKonvertor(nka).convert()
+    from_dict = NKAtoDKAKonvertor(nka.to_dict()).convert()
+    assert from_compact.transition_function == from_dict.transition_function
+    assert from_compact.accept_states == from_dict.accept_states
+
+
 if __name__ == '__main__':
     pytest.main()
\ No newline at end of file
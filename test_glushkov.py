@@ -0,0 +1,53 @@
+import itertools
+import pytest
+from parse import *
+from nka import ASTtoNFA
+from dka import NKAtoDKAKonvertor, BitsetNKA
+from glushkov import ASTtoGlushkovNFA
+from helpers import parse_regex
+
+def accepts(bitset_nka, word):
+    subset = bitset_nka.closure(1 << bitset_nka.start)
+    for symbol in word:
+        subset = bitset_nka.closure(bitset_nka.move(subset, symbol))
+    return bitset_nka.is_terminating(subset)
+
+@pytest.mark.parametrize("regex", [
+    'a', 'ε', 'ab+a', '(a+b)*abb', '(a*)*b', '(ε+a)(b+ε)', 'a{3}', 'a{0}b',
+    '(ab){1,3}', '(a+ε){2,4}b', 'a{0,}b', '(ab+b){2,}', '((a+b){2})*', 'a*b*a*',
+])
+def test_glushkov_matches_thompson(regex):
+    ast = parse_regex(regex, {'a', 'b'})
+    thompson = BitsetNKA(ASTtoNFA(ast).construct())
+    glushkov = BitsetNKA(ASTtoGlushkovNFA(ast).construct())
+    for length in range(7):
+        for word in itertools.product('ab', repeat=length):
+            assert accepts(glushkov, word) == accepts(thompson, word)
+
+def test_glushkov_is_epsilon_free():
+    ast = parse_regex('(a+b)*a(ab){2,3}', {'a', 'b'})
+    nka = ASTtoGlushkovNFA(ast).construct()
+    # Jedno stanje po poziciji plus pocetno stanje
+    assert nka.num_states == 1 + 3 + 6
+    assert all(symbol is not None for state in range(nka.num_states) for symbol, _ in nka.transitions(state))
+    bitset_nka = BitsetNKA(nka)
+    assert bitset_nka.epsilon_free
+    assert bitset_nka.closure(0b110) == 0b110
+    assert bitset_nka.closure_cache == {}
+
+def test_glushkov_accept_states():
+    nka = ASTtoGlushkovNFA(parse_regex('a*', {'a'})).construct()
+    assert nka.end_state is None
+    assert nka.accept_states == {0, 1}
+    nka_dict = nka.to_dict()
+    assert nka_dict['0'] == {'isTerminatingState': True, 'a': ['1']}
+    assert nka_dict['1'] == {'isTerminatingState': True, 'a': ['1']}
+
+def test_glushkov_dka_conversion():
+    ast = parse_regex('(a+b)*abb', {'a', 'b'})
+    dfa = NKAtoDKAKonvertor(ASTtoGlushkovNFA(ast).construct()).convert()
+    assert dfa.execute('babb') == True
+    assert dfa.execute('abba') == False
+
+if __name__ == "__main__":
+    pytest.main()
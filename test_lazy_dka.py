@@ -0,0 +1,42 @@
+import pytest
+from parse import *
+from dka import NKAtoDKAKonvertor
+from lazy_dka import LazyDKA
+from helpers import build_nka, words_over
+
+@pytest.mark.parametrize("regex", ['(a+b)*abb', 'a{2,4}b*', '(ab+ba)*', '(ε+a)b', '(a+b)*a(a+b){3}'])
+def test_lazy_matches_full_dka(regex):
+    nka = build_nka(regex, {'a', 'b'})
+    dfa = NKAtoDKAKonvertor(nka.to_dict()).convert()
+    lazy_dka = LazyDKA(nka)
+    for word in words_over({'a', 'b'}, 7):
+        assert lazy_dka.execute(word) == dfa.execute(word)
+
+def test_lazy_exponential_pattern():
+    lazy_dka = LazyDKA(build_nka('(a+b)*a(a+b){20}', {'a', 'b'}))
+    assert lazy_dka.execute('a' + 'b' * 20) == True
+    assert lazy_dka.execute('b' * 21) == False
+    assert len(lazy_dka.subsets) < 100
+
+def test_lazy_flush_and_fallback():
+    nka = build_nka('(a+b)*a(a+b){5}', {'a', 'b'})
+    dfa = NKAtoDKAKonvertor(nka.to_dict()).convert()
+    lazy_dka = LazyDKA(nka, max_states=4, max_flushes=2)
+    for word in words_over({'a', 'b'}, 9):
+        assert lazy_dka.execute(word) == dfa.execute(word)
+    assert lazy_dka.flush_count > 0
+    assert lazy_dka.fallback_count > 0
+    assert len(lazy_dka.subsets) <= 4
+
+def test_lazy_multi_character_symbols():
+    lazy_dka = LazyDKA(build_nka('START(AB)*', {'START', 'AB'}))
+    assert lazy_dka.execute(['START', 'AB', 'AB']) == True
+    assert lazy_dka.execute(['AB']) == False
+    assert lazy_dka.execute('x') == False
+
+def test_lazy_invalid_cache_size():
+    with pytest.raises(Exception, match='bar jedno stanje'):
+        LazyDKA(build_nka('a', {'a'}), max_states=0)
+
+if __name__ == '__main__':
+    pytest.main()
@@ -1,5 +1,5 @@
 import pytest
-from lexer import TokenType, Token, Lexer, checkCocatenation
+from lexer import TokenType, Token, Lexer, checkCocatenation, AlphabetTrie, compile_alphabet
 
 # Testovi za TokenType.getTokenType
 @pytest.mark.parametrize("input_char, expected_type", [
@@ -93,6 +93,46 @@ def test_lexer_complex():
     ]
     assert [(token.token_type, token.content) for token in tokenStream] == expected
 
+# Testovi za AlphabetTrie
+@pytest.mark.parametrize("text, pos, expected_end", [
+    ('abcd', 0, 4),
+    ('abc', 0, 2),
+    ('abx', 0, 2),
+    ('xab', 0, -1),
+    ('xab', 1, 3),
+    ('STOPSTART', 4, 9),
+    ('ε', 0, 1),
+])
+def test_trie_longest_match(text, pos, expected_end):
+    trie = AlphabetTrie({'a', 'ab', 'abcd', 'STOP', 'START'})
+    assert trie.longest_match(text, pos) == expected_end
+
+@pytest.mark.parametrize("text, pos, expected", [
+    ('abcd', 0, (4, False)),
+    ('abc', 0, (2, True)),
+    ('ab', 0, (2, True)),
+    ('abx', 0, (2, False)),
+    ('STA', 0, (-1, True)),
+    ('STOP', 0, (4, False)),
+])
+def test_trie_longest_match_partial(text, pos, expected):
+    trie = AlphabetTrie({'a', 'ab', 'abcd', 'STOP', 'START'})
+    assert trie.longest_match_partial(text, pos) == expected
+
+def test_lexer_does_not_mutate_alphabet():
+    alphabet = {'a', 'b'}
+    Lexer('a+b', alphabet).lexer()
+    assert alphabet == {'a', 'b'}
+
+def test_lexer_shares_trie():
+    trie = AlphabetTrie({'ab', 'abcd', 'c'})
+    first = Lexer('abc', trie)
+    second = Lexer('abcdc', trie)
+    assert first.trie is second.trie
+    assert compile_alphabet(frozenset({'a'})) is Lexer('a', {'a'}).trie
+    assert [token.content for token in first.lexer()] == ['ab', 'c']
+    assert [token.content for token in second.lexer()] == ['abcd', 'c']
+
 # Pokretanje testova
 if __name__ == "__main__":
     pytest.main()
@@ -2,6 +2,7 @@ import pytest
 from parse import *
 from dka import DKA, NKAtoDKAKonvertor, ASTtoNFA
 from min_dka import DKAMinimizer
+from helpers import build_dka
 
 def test_make_partition():
     regex = 'abc'
@@ -36,5 +37,54 @@ def test_minimize_dfa():
              minimized_dka['2']['a'] == '1' and minimized_dka['1']['b'] == '0' and
              minimized_dka['1']['isTerminatingState'] == True and minimized_dka['0']['isTerminatingState'] == True) 
     
+@pytest.mark.parametrize("regex, alphabet", [
+    ('abc', {'a', 'b', 'c'}),
+    ('ab+a', {'a', 'b'}),
+    ('(a+b)*abb', {'a', 'b'}),
+    ('(a+b)*a(a+b){3}', {'a', 'b'}),
+    ('a{2,6}*b+cde{2,4}', {'a', 'b', 'c', 'd', 'e'}),
+    ('ε1A+(AB{1,2})*AABABA2ε', {'A', 'AB', '1', '2'}),
+    ('(0+1)*0{2,}', {'0', '1'}),
+])
+def test_hopcroft_matches_moore(regex, alphabet):
+    dka = build_dka(regex, alphabet).to_dict()
+    hopcroft = DKAMinimizer(dka)
+    moore = DKAMinimizer(dka, strategy='moore')
+    assert {frozenset(group) for group in hopcroft.partition} == {frozenset(group) for group in moore.partition}
+    assert len(hopcroft.to_dict()) == len(moore.to_dict())
+
+def test_hopcroft_minimal_state_count():
+    # (a+b)*a(a+b){3} zahtijeva 2^4 stanja u minimalnom DKA
+    dka = build_dka('(a+b)*a(a+b){3}', {'a', 'b'}).to_dict()
+    minDKA = DKAMinimizer(dka).to_dict()
+    assert len(minDKA) - 1 == 16
+
+@pytest.mark.parametrize("strategy", ['hopcroft', 'moore'])
+def test_tags_refine_partition(strategy):
+    # 1 i 2 se razlikuju samo po oznaci, pa ne smiju biti spojeni
+    dka = {
+        'startingState': '0',
+        '0': {'isTerminatingState': False, 'a': '1', 'b': '2'},
+        '1': {'isTerminatingState': True},
+        '2': {'isTerminatingState': True},
+    }
+    assert len(DKAMinimizer(dka, strategy).partition) == 2
+    minimizer = DKAMinimizer(dka, strategy, tags={'1': 0b01, '2': 0b10})
+    assert len(minimizer.partition) == 3
+    min_dka = minimizer.to_dict()
+    tags = minimizer.to_tags()
+    start = min_dka['startingState']
+    assert tags[start] == 0
+    assert {tags[min_dka[start]['a']], tags[min_dka[start]['b']]} == {0b01, 0b10}
+
+def test_to_tags_without_tags():
+    with pytest.raises(Exception, match='bez oznaka|sa oznakama'):
+        DKAMinimizer({'startingState': '0', '0': {'isTerminatingState': True}}).to_tags()
+
+def test_unknown_strategy():
+    dka = build_dka('ab', {'a', 'b'}).to_dict()
+    with pytest.raises(Exception, match='Nepoznata strategija minimizacije'):
+        DKAMinimizer(dka, strategy='brzozowski')
+
 if __name__ == '__main__':
     pytest.main()
\ No newline at end of file
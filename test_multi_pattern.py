@@ -0,0 +1,34 @@
+import pytest
+from multi_pattern import MultiPatternDFA
+from compiled_dka import CompiledDFA
+from pipeline import compile_regex
+from helpers import words_over
+
+@pytest.mark.parametrize("patterns, alphabet", [
+    (['(a+b)*abb', 'a*b*', '(a+b){3}', 'baa*', 'ε'], {'a', 'b'}),
+    (['START(AB)*STOP', 'START(AB){2}STOP', 'AB*'], {'START', 'AB', 'STOP'}),
+    (['a{2,4}', 'a*', '(aa)*'], {'a'}),
+])
+def test_one_pass_reports_every_pattern(patterns, alphabet):
+    multi = MultiPatternDFA(patterns, alphabet)
+    single = [CompiledDFA(compile_regex(pattern, alphabet), alphabet) for pattern in patterns]
+    for word in list(words_over(alphabet, 5)) + ['x']:
+        expected = [i for i, compiled in enumerate(single) if compiled.match(word)]
+        assert multi.matches(word) == expected, word
+
+def test_same_language_shares_states():
+    multi = MultiPatternDFA(['a+b', 'b+a'], {'a', 'b'})
+    assert len(multi.dka) - 1 == len(compile_regex('a+b', {'a', 'b'})) - 1
+    assert multi.match_mask('a') == multi.match_mask('b') == 0b11
+
+def test_tagged_hopcroft_matches_moore():
+    patterns = ['(a+b)*abb', '(a+b)*ab', 'a*', 'b(a+b)*']
+    hopcroft = MultiPatternDFA(patterns, {'a', 'b'})
+    moore = MultiPatternDFA(patterns, {'a', 'b'}, 'moore')
+    assert len(hopcroft.dka) == len(moore.dka)
+    assert sorted(hopcroft.tags.values()) == sorted(moore.tags.values())
+    for word in words_over({'a', 'b'}, 6):
+        assert hopcroft.match_mask(word) == moore.match_mask(word)
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,7 +1,9 @@
 import pytest
 from lexer import Lexer
 from parse import Parser
-from nka import NKA, ASTtoNFA
+from array import array
+from nka import NKA, ASTtoNFA, EPSILON
+from dka import NKAtoDKAKonvertor
 
 def test_literal_character_ast_node():
     regex = 'a'
@@ -64,11 +66,11 @@ def test_repeat_exactly_ast_node():
     ast = parser.parse()
     nka = ASTtoNFA(ast).construct().to_dict()
     assert nka['startingState'] == '0'
-    assert nka['0']['epsilon'] == ['1']
-    assert nka['1']['a'] == ['3']
+    assert nka['0']['epsilon'] == ['2']
+    assert nka['2']['a'] == ['3']
     assert nka['3']['epsilon'] == ['4']
-    assert nka['4']['a'] == ['2']
-    assert nka['2']['isTerminatingState']
+    assert nka['4']['a'] == ['1']
+    assert nka['1']['isTerminatingState']
 
 def test_repeat_between_ast_node():
     regex = 'a{2,3}'
@@ -78,14 +80,14 @@ def test_repeat_between_ast_node():
     ast = parser.parse()
     nka = ASTtoNFA(ast).construct().to_dict()
     assert nka['startingState'] == '0'
-    assert nka['0']['epsilon'] == ['1']
-    assert nka['1']['a'] == ['3']
+    assert nka['0']['epsilon'] == ['2']
+    assert nka['2']['a'] == ['3']
     assert nka['3']['epsilon'] == ['4']
     assert nka['4']['a'] == ['5']
-    assert ( nka['5']['epsilon'] == ['2', '6'] or nka['5']['epsilon'] == ['6', '2'] )
+    assert ( nka['5']['epsilon'] == ['1', '6'] or nka['5']['epsilon'] == ['6', '1'] )
     assert nka['6']['a'] == ['7']
-    assert nka['7']['epsilon'] == ['2']
-    assert nka['2']['isTerminatingState']
+    assert nka['7']['epsilon'] == ['1']
+    assert nka['1']['isTerminatingState']
 
 def test_repeat_min_ast_node():
     regex = 'a{2,}'
@@ -96,12 +98,88 @@ def test_repeat_min_ast_node():
     nka = ASTtoNFA(ast).construct().to_dict()
     nka = ASTtoNFA(ast).construct().to_dict()
     assert nka['startingState'] == '0'
-    assert nka['0']['epsilon'] == ['1']
-    assert nka['1']['a'] == ['3']
+    assert nka['0']['epsilon'] == ['2']
+    assert nka['2']['a'] == ['3']
     assert nka['3']['epsilon'] == ['4']
     assert nka['4']['a'] == ['5']
-    assert ( nka['5']['epsilon'] == ['2', '4'] or nka['5']['epsilon'] == ['4', '2'] )
-    assert nka['2']['isTerminatingState']
+    assert ( nka['5']['epsilon'] == ['1', '4'] or nka['5']['epsilon'] == ['4', '1'] )
+    assert nka['1']['isTerminatingState']
+
+def test_compact_representation():
+    regex = 'a+b'
+    rl = Lexer(regex, {'a','b'})
+    ast = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(ast).construct()
+    assert nka.num_states == 6
+    assert nka.symbols == ['a', 'b']
+    assert isinstance(nka.offsets, array) and isinstance(nka.targets, array)
+    assert nka.offsets.tolist() == [0, 2, 2, 3, 4, 5, 6]
+    assert nka.labels.tolist() == [EPSILON, EPSILON, 0, 1, EPSILON, EPSILON]
+    assert list(nka.transitions(0)) == [(None, 2), (None, 3)]
+    assert list(nka.transitions(2)) == [('a', 4)]
+
+def test_long_sequence_state_count():
+    regex = 'ab' * 150
+    rl = Lexer(regex, {'a','b'})
+    ast = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(ast).construct()
+    # Dva stanja po literalu, kao u Thompsonovoj konstrukciji
+    assert nka.num_states == 2 * len(regex)
+    assert len(nka.targets) == 2 * len(regex) - 1
+
+class CountingASTtoNFA(ASTtoNFA):
+    visits = 0
+
+    def expand(self, stack, node, start_state, end_state):
+        CountingASTtoNFA.visits += 1
+        super().expand(stack, node, start_state, end_state)
+
+def test_repeat_compiles_child_once():
+    regex = '(ab+c){40,60}'
+    rl = Lexer(regex, {'a', 'b', 'c'})
+    ast = Parser(rl.lexer()).parse()
+    CountingASTtoNFA.visits = 0
+    nka = CountingASTtoNFA(ast).construct()
+    # Repeat + Or + Seq + tri literala
+    assert CountingASTtoNFA.visits == 6
+    assert nka.num_states == 2 + 60 * 8
+
+def test_equal_repeats_share_fragment():
+    regex = '(ab+c){3}d(ab+c){2,4}'
+    rl = Lexer(regex, {'a', 'b', 'c', 'd'})
+    ast = Parser(rl.lexer()).parse()
+    CountingASTtoNFA.visits = 0
+    nka = CountingASTtoNFA(ast).construct()
+    # Seq + dva ponavljanja + d, a podstablo (ab+c) se obilazi samo jednom: Or + Seq + tri literala
+    assert CountingASTtoNFA.visits == 4 + 5
+    dka = NKAtoDKAKonvertor(nka).convert()
+    for word, expected in [('ababcdcc', True), ('abcabdcccc', True), ('cccdc', False), ('cccdccccc', False)]:
+        assert dka.execute(word) == expected
+
+def test_nested_repeat_renumbering():
+    regex = '((ab){2}+c){2,3}'
+    rl = Lexer(regex, {'a', 'b', 'c'})
+    ast = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(ast).construct()
+    targets = set(nka.targets)
+    assert targets == set(range(1, nka.num_states))
+
+def test_repeat_min_zero_is_star():
+    regex = 'a{0,}'
+    rl = Lexer(regex, {'a'})
+    ast = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(ast).construct().to_dict()
+    assert nka['0']['epsilon'] == ['2', '1']
+    assert nka['2']['a'] == ['3']
+    assert nka['3']['epsilon'] == ['0', '1']
+
+def test_deep_and_wide_regex_without_recursion():
+    depth = 3000
+    regex = '(' * depth + 'a+b' + ')*' * depth + '+'.join(['ab'] * 3000)
+    rl = Lexer(regex, {'a', 'b'})
+    ast = Parser(rl.lexer()).parse()
+    nka = ASTtoNFA(ast).construct()
+    assert nka.num_states > 2 * depth
 
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
@@ -1,5 +1,7 @@
+import copy
+import pickle
 import pytest
-from parse import Parser, LiteralNode, SeqNode, StarNode, OrNode, RepeatBetweenNode, RepeatExactlyNode, RepeatMinNode
+from parse import Parser, INode, LiteralNode, SeqNode, StarNode, OrNode, RepeatBetweenNode, RepeatExactlyNode, RepeatMinNode, print_ast
 from lexer import Lexer
 
 def test_literal_character_node():
@@ -50,7 +52,7 @@ def test_repeat_exactly_node():
     assert isinstance(ast, RepeatExactlyNode)
     assert isinstance(ast.left, LiteralNode)
     assert ast.left.char == 'a'
-    assert ast.num == '2'
+    assert ast.num == 2
 
 def test_repeat_between_node():
     regex = Lexer('a{2,3}', {'a'})
@@ -60,8 +62,8 @@ def test_repeat_between_node():
     assert isinstance(ast, RepeatBetweenNode)
     assert isinstance(ast.left, LiteralNode)
     assert ast.left.char == 'a'
-    assert ast.low == '2'
-    assert ast.high == '3'
+    assert ast.low == 2
+    assert ast.high == 3
 
 def test_repeat_min_node():
     regex = Lexer('a{2,}', {'a'})
@@ -71,7 +73,7 @@ def test_repeat_min_node():
     assert isinstance(ast, RepeatMinNode)
     assert isinstance(ast.left, LiteralNode)
     assert ast.left.char == 'a'
-    assert ast.min == '2'
+    assert ast.min == 2
 
 def test_complex_regex():
     regex = Lexer('a+(b*){2,3}c', {'a', 'b', 'c'})
@@ -89,6 +91,104 @@ def test_complex_regex():
     assert isinstance(ast.right.right, LiteralNode)
     assert ast.right.right.char == 'c'
 
+def test_nary_nodes():
+    tokens = Lexer('abc+d+(ef)g', {'a', 'b', 'c', 'd', 'e', 'f', 'g'}).lexer()
+    ast = Parser(tokens).parse()
+    assert isinstance(ast, OrNode)
+    assert len(ast.children) == 3
+    assert [child.char for child in ast.children[0].children] == ['a', 'b', 'c']
+    assert ast.children[1].char == 'd'
+    group, last = ast.children[2].children
+    assert isinstance(group, SeqNode) and [child.char for child in group.children] == ['e', 'f']
+    assert last.char == 'g'
+    # Binarni pogled: desna strana je ostatak liste
+    assert isinstance(ast.right, OrNode)
+    assert ast.right.left.char == 'd'
+
+def test_many_alternatives_and_long_sequence():
+    alternatives = '+'.join(['ab'] * 5000)
+    ast = Parser(Lexer(alternatives, {'a', 'b'}).lexer()).parse()
+    assert isinstance(ast, OrNode) and len(ast.children) == 5000
+    ast = Parser(Lexer('a' * 20000, {'a'}).lexer()).parse()
+    assert isinstance(ast, SeqNode) and len(ast.children) == 20000
+
+def test_deep_nesting(capsys):
+    depth = 5000
+    regex = '(' * depth + 'a' + ')*' * depth
+    ast = Parser(Lexer(regex, {'a'}).lexer()).parse()
+    for _ in range(depth):
+        assert isinstance(ast, StarNode)
+        ast = ast.left
+    assert ast.char == 'a'
+    print_ast(Parser(Lexer(regex, {'a'}).lexer()).parse())
+    assert capsys.readouterr().out.count('STAR') == depth
+
+@pytest.mark.parametrize("regex, message", [
+    ('', 'Greska u parsiranju'),
+    ('a+', 'Greska u parsiranju'),
+    ('()', 'Greska u parsiranju'),
+    ('(a', 'Ocekivan token \\)'),
+    ('(a**)', 'Ocekivan token \\)'),
+    ('a)', 'Neocekivan token'),
+    ('a**', 'Neocekivan token'),
+    ('*a', 'Greska u parsiranju'),
+    ('a+*', 'Greska u parsiranju'),
+    ('{2}', 'Greska u parsiranju'),
+    ('(*a)', 'Greska u parsiranju'),
+    ('a(', 'Greska u parsiranju'),
+    ('(a)(', 'Greska u parsiranju'),
+])
+def test_parse_errors(regex, message):
+    tokens = Lexer(regex, {'a'}).lexer()
+    with pytest.raises(Exception, match=message):
+        Parser(tokens).parse()
+
+def test_equal_subtrees_are_shared():
+    ast = Parser(Lexer('(ab+c)*d(ab+c)*', {'a', 'b', 'c', 'd'}).lexer()).parse()
+    first, _, last = ast.children
+    assert first is last
+    other = Parser(Lexer('(ab+c)*', {'a', 'b', 'c'}).lexer()).parse()
+    assert other is first
+    assert hash(other) == first.hash
+
+def test_nodes_are_immutable():
+    node = SeqNode(LiteralNode('a'), LiteralNode('b'))
+    assert node.children == (LiteralNode('a'), LiteralNode('b'))
+    assert isinstance(node.children, tuple)
+    with pytest.raises(Exception, match='nepromjenljivi'):
+        node.children = ()
+    with pytest.raises(Exception, match='nepromjenljivi'):
+        del node.children
+
+def test_repeated_subexpressions_share_memory():
+    regex = '+'.join(['(a+b)*abb'] * 1000)
+    ast = Parser(Lexer(regex, {'a', 'b'}).lexer()).parse()
+    assert len(ast.children) == 1000
+    assert len({id(child) for child in ast.children}) == 1
+
+def test_interned_nodes_are_released():
+    node = RepeatBetweenNode(LiteralNode('zz_released'), 2, 5)
+    count = INode.interned_count()
+    del node
+    assert INode.interned_count() == count - 2
+
+def test_repeat_counts_are_normalized():
+    a = LiteralNode('a')
+    assert RepeatExactlyNode(a, '2') is RepeatExactlyNode(a, '02') is RepeatExactlyNode(a, 2)
+    assert RepeatBetweenNode(a, '2', '03') is RepeatBetweenNode(a, 2, 3)
+    assert RepeatMinNode(a, '02').min == 2
+    assert Parser(Lexer('a{02}', {'a'}).lexer()).parse() is Parser(Lexer('a{2}', {'a'}).lexer()).parse()
+
+def test_pickle_and_copy_keep_interning():
+    ast = Parser(Lexer('(ab+c)*d{2,3}(ab+c)*e{02}', {'a', 'b', 'c', 'd', 'e'}).lexer()).parse()
+    assert pickle.loads(pickle.dumps(ast)) is ast
+    assert copy.deepcopy(ast) is ast
+    assert copy.copy(ast) is ast
+    data = pickle.dumps(ast)
+    del ast
+    restored = pickle.loads(data)
+    assert restored is Parser(Lexer('(ab+c)*d{2,3}(ab+c)*e{2}', {'a', 'b', 'c', 'd', 'e'}).lexer()).parse()
+    assert restored.children[0] is restored.children[2]
 
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
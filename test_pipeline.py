@@ -0,0 +1,74 @@
+import pytest
+import tracemalloc
+import pipeline
+from pipeline import compile_regex, CONSTRUCTIONS, CompilePipeline, EventCollector, PipelineHook, count_nodes
+from lexer import Lexer
+from parse import Parser
+from helpers import build_dka, symbol_words
+
+@pytest.mark.parametrize("regex, alphabet", [
+    ('(a+b)*a(a+b){2}', {'a', 'b'}),
+    ('εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'}),
+    ('ε1A+(AB{1,2})*AABABA2ε', {'A', 'AB', '1', '2'}),
+])
+def test_constructions_give_same_minimal_dka(regex, alphabet):
+    sizes = {len(compile_regex(regex, alphabet, construction)) for construction in CONSTRUCTIONS}
+    assert len(sizes) == 1
+    dkas = [build_dka(regex, alphabet, construction) for construction in CONSTRUCTIONS]
+    accepted = 0
+    for word in symbol_words(alphabet, 7):
+        results = {dka.execute(word) for dka in dkas}
+        assert len(results) == 1, word
+        accepted += results.pop()
+    assert accepted > 0
+
+def test_unknown_construction():
+    with pytest.raises(Exception, match='Nepoznata konstrukcija'):
+        compile_regex('a', {'a'}, 'antimirov')
+
+def test_invalid_regex():
+    with pytest.raises(Exception, match='Ovaj karakter nije u alfabetu'):
+        compile_regex('ab', {'a'})
+
+@pytest.mark.parametrize("construction, phases", [
+    ('thompson', ['lex', 'parse', 'nfa', 'dfa', 'minimize']),
+    ('glushkov', ['lex', 'parse', 'nfa', 'dfa', 'minimize']),
+    ('derivatives', ['lex', 'parse', 'dfa', 'minimize']),
+])
+def test_hook_receives_phase_events(construction, phases):
+    collector = EventCollector()
+    minDKA = CompilePipeline(construction, [collector]).compile('(a+b)*a(a+b){2}', {'a', 'b'})
+    assert minDKA == compile_regex('(a+b)*a(a+b){2}', {'a', 'b'}, construction)
+    assert [event.phase for event in collector.events] == phases
+    counts = {}
+    for event in collector.events:
+        assert event.wall_time >= 0 and event.cpu_time >= 0 and event.peak_bytes is None
+        counts.update(event.counts)
+    assert counts['tokens'] == 15
+    assert counts['ast_nodes'] == 10
+    assert counts['min_dfa_states'] == 8
+    assert counts['partition_rounds'] > 0
+
+def test_memory_tracing():
+    was_tracing = tracemalloc.is_tracing()
+    compile_pipeline = CompilePipeline()
+    compile_pipeline.add_hook(PipelineHook())
+    compile_pipeline.add_hook(EventCollector(trace_memory=True))
+    compile_pipeline.compile('(a+b)*abb', {'a', 'b'})
+    events = compile_pipeline.hooks[1].events
+    assert all(event.peak_bytes > 0 for event in events)
+    assert events[-1].to_dict()['phase'] == 'minimize'
+    assert tracemalloc.is_tracing() == was_tracing
+
+def test_no_hooks_skips_instrumentation(monkeypatch):
+    def fail():
+        raise AssertionError('mjerenje bez hook-ova')
+    monkeypatch.setattr(pipeline.time, 'perf_counter', fail)
+    monkeypatch.setattr(pipeline, 'count_nodes', fail)
+    assert compile_regex('ab', {'a', 'b'}) == compile_regex('ab', {'a', 'b'}, 'glushkov')
+
+def test_count_nodes():
+    assert count_nodes(Parser(Lexer('a(b+c)*d', {'a', 'b', 'c', 'd'}).lexer()).parse()) == 7
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,103 @@
+import pytest
+from parse import Lexer, Parser
+from nka import EPSILON
+from dka import NKAtoDKAKonvertor
+from glushkov import ASTtoGlushkovNFA
+from reduce_nka import NKAReducer, reduce_nka
+from min_dka import DKAMinimizer
+from pipeline import CompilePipeline, EventCollector, compile_regex
+from helpers import build_nka, symbol_words
+
+def reachable(nka):
+    seen = {nka.start_state}
+    stack = [nka.start_state]
+    while stack:
+        for _, target in nka.transitions(stack.pop()):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+@pytest.mark.parametrize("regex, alphabet", [
+    ('ab+cb', {'a', 'b', 'c'}),
+    ('(a+b)*a(a+b){3}', {'a', 'b'}),
+    ('εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'}),
+    ('ε1A+(AB{1,2})*AABABA2ε', {'A', 'AB', '1', '2'}),
+    ('((a*)*b){2,}+ε', {'a', 'b'}),
+    ('ε', {'a'}),
+])
+def test_reduced_nfa_accepts_same_language(regex, alphabet):
+    nka = build_nka(regex, alphabet)
+    reduced, stats = reduce_nka(nka)
+    assert EPSILON not in reduced.labels
+    assert reduced.num_states <= nka.num_states
+    assert reachable(reduced) == set(range(reduced.num_states))
+    assert stats['states_after'] == reduced.num_states
+    original = NKAtoDKAKonvertor(nka).convert()
+    converted = NKAtoDKAKonvertor(reduced).convert()
+    accepted = 0
+    for word in symbol_words(alphabet, 7):
+        assert original.execute(word) == converted.execute(word), word
+        accepted += converted.execute(word)
+    assert accepted > 0
+
+def test_merges_states_with_same_behaviour():
+    reduced, stats = reduce_nka(build_nka('ab+cb', {'a', 'b', 'c'}))
+    assert reduced.num_states == 3
+    assert sorted(reduced.transitions(0)) == [('a', 1), ('c', 1)]
+    assert list(reduced.transitions(1)) == [('b', 2)]
+    assert reduced.accept_states == {2}
+    assert stats['merged_states'] == 2
+
+def test_every_state_is_coaccessible():
+    reduced, _ = reduce_nka(build_nka('(a+b)*a(a+b){4}+ba*', {'a', 'b'}))
+    reversed_edges = {}
+    for state in range(reduced.num_states):
+        for _, target in reduced.transitions(state):
+            reversed_edges.setdefault(target, set()).add(state)
+    useful = set(reduced.accept_states)
+    stack = list(useful)
+    while stack:
+        for source in reversed_edges.get(stack.pop(), ()):
+            if source not in useful:
+                useful.add(source)
+                stack.append(source)
+    assert useful == set(range(reduced.num_states))
+
+def test_glushkov_nfa_is_reduced():
+    ast = Parser(Lexer('(a+b)*a(a+b){2}', {'a', 'b'}).lexer()).parse()
+    nka = ASTtoGlushkovNFA(ast).construct()
+    reducer = NKAReducer(nka)
+    reduced = reducer.reduce()
+    assert reducer.stats['epsilon_transitions'] == 0
+    assert reduced.num_states <= nka.num_states
+
+def test_smaller_intermediate_dfa():
+    regex = '(a+b)*a(a+b){6}'
+    nka = build_nka(regex, {'a', 'b'})
+    reduced, stats = reduce_nka(nka)
+    assert stats['transitions_after'] < stats['transitions_before']
+    dka = NKAtoDKAKonvertor(reduced).convert()
+    assert len(dka.states) <= len(NKAtoDKAKonvertor(nka).convert().states)
+    assert DKAMinimizer(dka.to_dict()).to_dict() == compile_regex(regex, {'a', 'b'})
+
+@pytest.mark.parametrize("construction", ['thompson', 'glushkov'])
+@pytest.mark.parametrize("regex, alphabet", [
+    ('(a+b)*a(a+b){2}', {'a', 'b'}),
+    ('εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'}),
+    ('ε1A+(AB{1,2})*AABABA2ε', {'A', 'AB', '1', '2'}),
+])
+def test_pipeline_reduce_phase(construction, regex, alphabet):
+    collector = EventCollector()
+    minDKA = CompilePipeline(construction, [collector], reduce_nfa=True).compile(regex, alphabet)
+    assert [event.phase for event in collector.events] == ['lex', 'parse', 'nfa', 'reduce', 'dfa', 'minimize']
+    assert collector.events[3].counts['nfa_states'] <= collector.events[2].counts['nfa_states']
+    assert minDKA == compile_regex(regex, alphabet, construction)
+
+def test_derivatives_skip_reduce_phase():
+    collector = EventCollector()
+    CompilePipeline('derivatives', [collector], reduce_nfa=True).compile('ab*', {'a', 'b'})
+    assert 'reduce' not in [event.phase for event in collector.events]
+
+if __name__ == "__main__":
+    pytest.main()
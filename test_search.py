@@ -0,0 +1,73 @@
+import random
+import pytest
+from search import Searcher, UNKNOWN
+
+# Referentna (kvadratna) pretraga: na svakom tokenu probaj sve krajeve
+def brute_force(searcher, text):
+    ids, bounds = searcher.tokenize(text)
+    matches = []
+    pos = 0
+    while pos <= len(ids):
+        found = None
+        for start in range(pos, len(ids) + 1):
+            ends = [end for end in range(start, len(ids) + 1)
+                    if UNKNOWN not in ids[start:end] and searcher.forward.match_symbols(ids[start:end])]
+            if ends:
+                found = start, max(ends)
+                break
+        if found is None:
+            break
+        matches.append((bounds[found[0]], bounds[found[1]]))
+        pos = found[1] if found[1] > found[0] else found[0] + 1
+    return matches
+
+@pytest.mark.parametrize("regex, alphabet, text, expected", [
+    ('ab*c+ba', {'a', 'b', 'c'}, 'xxabbbc ac abcba ba', [(2, 7), (8, 10), (11, 14), (14, 16), (17, 19)]),
+    ('a*', {'a', 'b'}, 'baab', [(0, 0), (1, 3), (3, 3), (4, 4)]),
+    ('abc+b', {'a', 'b', 'c'}, 'abc', [(0, 3)]),
+    ('a{2}', {'a'}, 'aaaaa', [(0, 2), (2, 4)]),
+    ('START(AB)*STOP', {'START', 'AB', 'STOP'}, '..STARTABSTOP STARTSTOP', [(2, 13), (14, 23)]),
+    ('ab', {'a', 'b'}, 'cccc', []),
+])
+def test_find_all(regex, alphabet, text, expected):
+    searcher = Searcher(regex, alphabet)
+    assert searcher.find_all(text) == expected
+    assert searcher.search(text) == (expected[0] if expected else None)
+
+@pytest.mark.parametrize("regex, alphabet", [
+    ('(a+b)*abb', {'a', 'b'}),
+    ('a(b+c)*a+bb', {'a', 'b', 'c'}),
+    ('(ab+ε)c{1,3}', {'a', 'b', 'c'}),
+    ('(A+AB)C*', {'A', 'AB', 'C'}),
+])
+def test_matches_brute_force(regex, alphabet):
+    searcher = Searcher(regex, alphabet)
+    rng = random.Random(17)
+    chars = sorted(set(''.join(alphabet))) + ['x']
+    for _ in range(200):
+        text = ''.join(rng.choice(chars) for _ in range(rng.randint(0, 14)))
+        assert searcher.find_all(text) == brute_force(searcher, text), text
+
+class CountingSearcher(Searcher):
+    reads = 0
+
+    # Token se cita samo kada provjera uspije
+    def can_extend(self, forward_row, backward_row):
+        result = super().can_extend(forward_row, backward_row)
+        CountingSearcher.reads += result
+        return result
+
+@pytest.mark.parametrize("regex, text, expected", [
+    ('a+a*b', 'a' * 5000, [(i, i + 1) for i in range(5000)]),
+    ('ab*c+b', 'a' + 'b' * 5000, [(i, i + 1) for i in range(1, 5001)]),
+    ('(a+b)*c', 'ab' * 2500, []),
+])
+def test_forward_pass_is_linear(regex, text, expected):
+    searcher = CountingSearcher(regex, {'a', 'b', 'c'})
+    CountingSearcher.reads = 0
+    assert searcher.find_all(text) == expected
+    # svaki token se cita najvise u pogotku i jednom iza njega
+    assert CountingSearcher.reads <= 2 * len(text) + 1
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,117 @@
+import random
+import pytest
+from parse import SeqNode, StarNode, LiteralNode, OrNode, RepeatExactlyNode, RepeatBetweenNode, RepeatMinNode
+from simplify import ASTSimplifier, simplify_ast, distinct_nodes, EPSILON
+from nka import ASTtoNFA
+from pipeline import CompilePipeline, EventCollector, compile_regex
+from compiled_dka import CompiledDFA
+from helpers import parse_regex, words_over
+
+def same_language(regex, minDKA, alphabet, max_length=6):
+    expected = CompiledDFA(compile_regex(regex, alphabet), alphabet)
+    actual = CompiledDFA(minDKA, alphabet)
+    return all(expected.match(word) == actual.match(word) for word in words_over(alphabet, max_length))
+
+@pytest.mark.parametrize("regex, expected", [
+    ('εaε', LiteralNode('a')),
+    ('εε', EPSILON),
+    ('(a*)*', StarNode(LiteralNode('a'))),
+    ('(a*){2,}', StarNode(LiteralNode('a'))),
+    ('(a*){3}', StarNode(LiteralNode('a'))),
+    ('a+b+a', OrNode(LiteralNode('a'), LiteralNode('b'))),
+    ('a+a', LiteralNode('a')),
+    ('a{0}b', LiteralNode('b')),
+    ('a{0,0}', EPSILON),
+    ('a{1}', LiteralNode('a')),
+    ('a{1,1}', LiteralNode('a')),
+    ('a{3,3}', RepeatExactlyNode(LiteralNode('a'), 3)),
+    ('a{0,}', StarNode(LiteralNode('a'))),
+    ('ε{2,5}', EPSILON),
+    ('ε*', EPSILON),
+    ('(ε+a)*', StarNode(LiteralNode('a'))),
+    ('(a{1,})*', StarNode(LiteralNode('a'))),
+    ('(a{0,4})*', StarNode(LiteralNode('a'))),
+    ('ε+b*', StarNode(LiteralNode('b'))),
+    ('(a{2}){3}', RepeatExactlyNode(LiteralNode('a'), 6)),
+    ('(a{2,3}){2}', RepeatBetweenNode(LiteralNode('a'), 4, 6)),
+    ('(a{2,}){3}', RepeatMinNode(LiteralNode('a'), 6)),
+    ('(a{2,}){3,}', RepeatMinNode(LiteralNode('a'), 6)),
+])
+def test_rules(regex, expected):
+    simplified, _ = simplify_ast(parse_regex(regex, {'a', 'b'}))
+    assert simplified is expected
+
+@pytest.mark.parametrize("regex", ['ab*', '(a+b)*a(a+b){2}', '(a{2}){3,}', '(a{2,3}){2,}', 'ε+a', '(a{2,3}){2,4}'])
+def test_irreducible(regex):
+    ast = parse_regex(regex, {'a', 'b'})
+    simplified, report = simplify_ast(ast)
+    assert simplified is ast
+    assert report['rewrites'] == 0 and report['rounds'] == 1
+
+def test_report():
+    ast = parse_regex('εa{3,6}bdSTOPε', {'a', 'b', 'd', 'STOP'})
+    simplifier = ASTSimplifier(ast)
+    simplified = simplifier.simplify()
+    report = simplifier.report(simplified)
+    assert report['rules'] == {'seq_epsilon': 1}
+    assert report['rewrites'] == 1
+    assert report['nodes_before'] == 7 and report['nodes_after'] == 6
+    assert distinct_nodes(simplified) == 6
+
+def test_fixpoint_needs_rule_chains():
+    simplified, report = simplify_ast(parse_regex('((ε+(a*)*){1}){2,}', {'a'}))
+    assert simplified is StarNode(LiteralNode('a'))
+    assert report['rewrites'] >= 4
+    assert simplify_ast(simplified)[1]['rewrites'] == 0
+
+def test_smaller_nfa():
+    regex = 'ε((a*)*){2,}(b+b+ε){1}ε'
+    ast = parse_regex(regex, {'a', 'b'})
+    simplified, _ = simplify_ast(ast)
+    assert ASTtoNFA(simplified).construct().num_states < ASTtoNFA(ast).construct().num_states
+
+def test_deep_ast():
+    depth = 5000
+    ast = parse_regex('(' * depth + 'a' + ')*' * depth, {'a'})
+    simplified, report = simplify_ast(ast)
+    assert simplified is StarNode(LiteralNode('a'))
+    assert report['rules'] == {'star_star': depth - 1}
+
+def random_regex(rng, depth):
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice(['a', 'b', 'ε'])
+    kind = rng.randrange(6)
+    inner = random_regex(rng, depth - 1)
+    if kind == 0:
+        return f'({inner}{random_regex(rng, depth - 1)})'
+    if kind == 1:
+        return f'({inner}+{random_regex(rng, depth - 1)})'
+    if kind == 2:
+        return f'({inner})*'
+    if kind == 3:
+        return f'({inner}){{{rng.randrange(4)}}}'
+    if kind == 4:
+        low = rng.randrange(3)
+        return f'({inner}){{{low},{low + rng.randrange(3)}}}'
+    return f'({inner}){{{rng.randrange(3)},}}'
+
+def test_random_patterns_keep_language():
+    rng = random.Random(24)
+    alphabet = {'a', 'b'}
+    for _ in range(150):
+        regex = random_regex(rng, 4)
+        simplified = CompilePipeline(simplify=True).compile(regex, alphabet)
+        assert same_language(regex, simplified, alphabet), regex
+
+def test_pipeline_simplify_phase():
+    collector = EventCollector()
+    pipeline = CompilePipeline(hooks=[collector], simplify=True)
+    minDKA = pipeline.compile('ε((a*)*){2,}b+b', {'a', 'b'})
+    phases = [event.phase for event in collector.events]
+    assert phases == ['lex', 'parse', 'simplify', 'nfa', 'dfa', 'minimize']
+    event = collector.events[2]
+    assert event.counts['rewrites'] > 0 and event.counts['ast_nodes'] < collector.events[1].counts['ast_nodes']
+    assert minDKA == compile_regex('ε((a*)*){2,}b+b', {'a', 'b'})
+
+if __name__ == "__main__":
+    pytest.main()
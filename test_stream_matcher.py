@@ -0,0 +1,77 @@
+import itertools
+import pickle
+import pytest
+from stream_matcher import StreamMatcher
+from compiled_dka import CompiledDFA
+from binary_dka import MappedDFA, to_bytes
+from helpers import build_min_dka, words_over
+
+CASES = [
+    ('(a+b)*abb+b', {'a', 'b'}),
+    ('START(AB)*STOP+ST', {'START', 'AB', 'STOP', 'ST'}),
+    ('(A+AB+ABC)*C', {'A', 'AB', 'ABC', 'C'}),
+]
+
+def feed_all(matcher, chunks):
+    matcher.reset()
+    for chunk in chunks:
+        matcher.feed(chunk)
+    return matcher.is_accepting()
+
+@pytest.mark.parametrize("regex, alphabet", CASES)
+def test_every_split_matches_whole_input(regex, alphabet):
+    _, min_dka = build_min_dka(regex, alphabet)
+    compiled = CompiledDFA(min_dka, alphabet)
+    matcher = StreamMatcher(min_dka, alphabet)
+    for word in list(words_over(alphabet, 4)) + ['STARTABSTO', 'STARTX', 'ABCAB']:
+        expected = compiled.match(word)
+        for i, j in itertools.combinations_with_replacement(range(len(word) + 1), 2):
+            assert feed_all(matcher, [word[:i], word[i:j], word[j:]]) == expected, (word, i, j)
+        assert feed_all(matcher, list(word)) == expected
+
+def test_pending_prefix_of_longer_symbol():
+    alphabet = {'START', 'AB', 'STOP', 'ST'}
+    _, min_dka = build_min_dka('START(AB)*STOP+ST', alphabet)
+    matcher = StreamMatcher(min_dka, alphabet)
+    matcher.feed('S')
+    matcher.feed('T')
+    assert matcher.pending == 'ST'
+    assert matcher.is_accepting()
+    assert matcher.pending == 'ST'
+    matcher.feed('ART')
+    assert matcher.pending == '' and not matcher.is_accepting()
+    matcher.feed('STOP')
+    assert matcher.is_accepting() and matcher.consumed == 9
+
+def test_snapshot_and_restore():
+    alphabet = {'START', 'AB', 'STOP'}
+    _, min_dka = build_min_dka('START(AB)*STOP', alphabet)
+    matcher = StreamMatcher(min_dka, alphabet)
+    matcher.feed('STARTA')
+    snapshot = pickle.loads(pickle.dumps(matcher.snapshot()))
+    matcher.feed('BSTOP')
+    assert matcher.is_accepting()
+
+    other = StreamMatcher(min_dka, alphabet)
+    other.restore(snapshot)
+    other.feed('BABSTO')
+    assert not other.is_accepting()
+    other.feed('P')
+    assert other.is_accepting()
+    with pytest.raises(Exception, match='Nepostojece stanje'):
+        other.restore((99, '', 0))
+
+def test_dead_state_and_mapped_dfa():
+    _, min_dka = build_min_dka('(a+b)*abb', {'a', 'b'})
+    matcher = StreamMatcher(MappedDFA(to_bytes(min_dka)))
+    matcher.feed('abx')
+    assert matcher.is_dead() and not matcher.is_accepting()
+    matcher.feed('abb')
+    assert matcher.is_dead()
+    matcher.reset()
+    matcher.feed('ab')
+    matcher.feed('b')
+    assert matcher.is_accepting()
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,66 @@
+import itertools
+import pytest
+from symbol_classes import literal_sets, symbol_classes, compress_ast
+from pipeline import CompilePipeline, EventCollector, compile_regex, CONSTRUCTIONS
+from compiled_dka import CompiledDFA
+from binary_dka import MappedDFA, to_bytes
+from helpers import parse_regex
+
+def test_literal_sets():
+    ast = parse_regex('(a+b+cd)*a+ε', {'a', 'b', 'c', 'd'})
+    assert sorted(map(sorted, literal_sets(ast))) == [['a'], ['a', 'b'], ['c'], ['d']]
+
+@pytest.mark.parametrize("regex, alphabet, expected", [
+    ('(a+b+c)*d', {'a', 'b', 'c', 'd', 'e', 'f'}, [['a', 'b', 'c'], ['d'], ['e', 'f']]),
+    ('(a+b)c+a', {'a', 'b', 'c'}, [['a'], ['b'], ['c']]),
+    ('ε', {'a', 'b'}, [['a', 'b']]),
+    ('(START+STOP)AB*', {'START', 'STOP', 'AB', 'X'}, [['AB'], ['START', 'STOP'], ['X']]),
+])
+def test_symbol_classes(regex, alphabet, expected):
+    class_of = symbol_classes(parse_regex(regex, alphabet), alphabet)
+    assert set(class_of) == alphabet
+    classes = {}
+    for symbol, representative in class_of.items():
+        classes.setdefault(representative, []).append(symbol)
+    assert sorted(sorted(members) for members in classes.values()) == expected
+    assert all(representative == min(classes[representative]) for representative in classes)
+
+def test_compress_ast_merges_union_branches():
+    alphabet = {f'S{i}' for i in range(50)}
+    ast = parse_regex('(' + '+'.join(sorted(alphabet)) + ')*S7', alphabet)
+    compressed = compress_ast(ast, symbol_classes(ast, alphabet))
+    star = compressed.children[0]
+    assert [child.char for child in star.left.children] == ['S0', 'S7']
+
+@pytest.mark.parametrize("construction", CONSTRUCTIONS)
+@pytest.mark.parametrize("regex, alphabet", [
+    ('(a+b+c)*a(a+b+c){2}', {'a', 'b', 'c', 'd'}),
+    ('(a+b)*c+(b+c)d*', {'a', 'b', 'c', 'd'}),
+    ('(START+STOP+AB)*STOP', {'START', 'STOP', 'AB', 'X'}),
+    ('a{2,3}+ε', {'a', 'b'}),
+])
+def test_classes_match_full_alphabet(construction, regex, alphabet):
+    pipeline = CompilePipeline(construction)
+    class_dka, class_of = pipeline.compile_classes(regex, alphabet)
+    compressed = CompiledDFA(class_dka, symbol_classes=class_of)
+    full = CompiledDFA(compile_regex(regex, alphabet, construction), alphabet)
+    assert compressed.stride <= full.stride
+    mapped = MappedDFA(to_bytes(compressed))
+    for length in range(5):
+        for word in itertools.product(sorted(alphabet), repeat=length):
+            text = ''.join(word)
+            assert compressed.match(text) == full.match(text) == mapped.match(text), text
+
+def test_large_alphabet_compresses():
+    alphabet = {f'S{i}' for i in range(2000)}
+    regex = '(' + '+'.join(sorted(alphabet)) + ')*S1999S5'
+    collector = EventCollector()
+    class_dka, class_of = CompilePipeline(hooks=[collector]).compile_classes(regex, alphabet)
+    assert [event.phase for event in collector.events][:3] == ['lex', 'parse', 'classes']
+    assert collector.events[2].counts == {'symbols': 2000, 'classes': 3}
+    compiled = CompiledDFA(class_dka, symbol_classes=class_of)
+    assert compiled.stride == 3
+    assert compiled.match('S0S1999S5') and not compiled.match('S0S5S1999')
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,8 +1,4 @@
-import min_dka
-from lexer import Lexer
-from parse import Parser
-from nka import ASTtoNFA
-from dka import NKAtoDKAKonvertor
+from compile_cache import cached_compile_regex
 
 def main():
     regex = input('Unesite regularni izraz: ')
@@ -12,13 +8,7 @@ def main():
     try:
         throwException = False
         regex = regex
-        rl = Lexer(regex, alphabet)
-        tokenStream = rl.lexer()
-        pR = Parser(tokenStream)
-        AST = pR.parse()
-        nka = ASTtoNFA(AST).construct().to_dict()
-        converter = NKAtoDKAKonvertor(nka)
-        dka = converter.convert().to_dict()
+        minDKA = cached_compile_regex(regex, alphabet)
     except Exception as e:
         print(f'{e} {regex} nije validan.')
         throwException = True